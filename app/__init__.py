@@ -1,19 +1,32 @@
-from flask import Flask, jsonify, request
-import jwt
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from flask import Flask, g, jsonify, request
 from .config import Config
-from .repositories.wordle_repository import WordleRepository
-from .repositories.user_repository import UserRepository
+from .repositories.backends import create_repositories
 from .services.wordle_service import WordleService
+from .models.word_dictionary import WordDictionary
+from .models.solver import WordleSolver
+from .models.daily import DailySchedule
 from .services.user_service import UserService
+from .services.stats_service import StatsService
 from .routes.wordle_routes import create_routes
 from .routes.user_routes import create_user_routes
-import boto3
-from pathlib import Path
+from .routes.stats_routes import create_stats_routes
+from .routes.metrics_routes import create_metrics_routes
 from flask_cors import CORS
-from functools import wraps
-from .utils.middleware import validate_and_decode_jwt
+from .utils.metrics import Metrics
+from .utils.json_provider import json_provider_class
+from .utils.middleware import TokenAuthenticator
+from .utils.password_hasher import PasswordHasher
+from .utils.profiler import RequestProfiler
+from .utils.startup import StartupTimer
+
+_IMPORT_FINISHED = time.perf_counter()
 
 def create_app(config_class=Config):
+    timer = StartupTimer()
+
     # Create a Flask application
     app = Flask(__name__)
 
@@ -22,25 +35,69 @@ def create_app(config_class=Config):
     
     # Apply configuration settings from your config.py or environment
     app.config.from_object(config_class)
+    app.json = json_provider_class(app.config['JSON_PROVIDER'])(app)
+    lazy = app.config['LAZY_STARTUP']
+    metrics = Metrics(app.config['METRICS_ENABLED'])
+    app.extensions['metrics'] = metrics
+    timer.mark('flask')
 
+    # Initialize the storage backend (DynamoDB, or in-memory / SQLite for local development and load testing)
+    wordle_repository, user_repository, stats_repository, storage = create_repositories(app.config, metrics)
+    app.extensions.update(storage)
+    timer.mark('storage')
 
-    # Initialize database connection or other services
-    dynamodb = boto3.resource('dynamodb', region_name=app.config['DYNAMODB_REGION'])
-    wordle_table = dynamodb.Table(app.config['DYNAMODB_WORDLE_TABLE'])
-    user_table = dynamodb.Table(app.config['DYNAMODB_USER_TABLE'])
+    # Load and index the word list once, preferring the prebuilt memory-mappable artifact over parsing the text file
+    # unless the artifact is stale
+    word_dictionary = WordDictionary.load(app.config['WORDS_PATH'], app.config['WORDS_BINARY_PATH'])
+    timer.mark('dictionary')
 
-    words_path = Path(__file__).parent.parent / 'resources' / 'words.txt'
+    # Memory-map any pattern matrices that have already been built for the hint solver (lazy mode maps them on first hint)
+    solver = WordleSolver(word_dictionary, app.config['PATTERN_MATRIX_DIR'])
+    if not lazy:
+        solver.preload()
+    timer.mark('solver')
 
-    # Load the word list
-    with open(words_path, 'r') as f:
-        word_list = f.read().splitlines()
+    # Shuffle each length's words into the daily puzzle schedule (lazy mode builds a length's schedule on first use)
+    daily_schedule = DailySchedule(word_dictionary, app.config['DAILY_SEED'], app.config['DAILY_EPOCH'], app.config['DAILY_DAYS'])
+    if not lazy:
+        daily_schedule.preload()
+    timer.mark('daily')
 
-    wordle_repository = WordleRepository(wordle_table)
-    user_repository = UserRepository(user_table)
-    
-    app.extensions['dynamodb'] = dynamodb
-    app.config['wordle_service'] = WordleService(wordle_repository, word_list)
-    app.config['user_service'] = UserService(user_repository)
+    app.config['stats_service'] = StatsService(stats_repository, app.config['LEADERBOARD_SIZE'])
+    app.config['wordle_service'] = WordleService(
+        wordle_repository, word_dictionary, solver, metrics, daily_schedule, app.config['stats_service'], app.config['COMPACT_STORAGE'],
+        app.config['WORD_ARCHIVE_DIR']
+    )
+    password_hasher = PasswordHasher(app.config['BCRYPT_ROUNDS'], app.config['PASSWORD_POOL_SIZE'], app.config['PASSWORD_QUEUE_SIZE'], app.config['PASSWORD_TIMEOUT'])
+    app.config['user_service'] = UserService(user_repository, password_hasher, app.config['SECRET_KEY'], app.config['JWT_EXPIRATION_SECONDS'])
+
+    authenticator = TokenAuthenticator(app.config['SECRET_KEY'], app.config['JWT_CACHE_SIZE'], app.config['JWT_CACHE_TTL'])
+    app.extensions['authenticator'] = authenticator
+    timer.mark('services')
+
+    # Request metrics and sampled profiling, registered before authentication so that rejected requests are measured too
+    profiler = RequestProfiler(
+        app.config['PROFILE_SAMPLE_RATE'], app.config['PROFILE_HEADER'], app.config['PROFILE_TOKEN'], app.config['PROFILE_DIR'], app.logger
+    )
+
+    @app.before_request
+    def start_request_metrics():
+        g.request_started = time.perf_counter()
+        g.request_stats = metrics.begin_request()
+        if profiler.enabled:
+            g.profile = profiler.start(request.headers)
+
+    @app.after_request
+    def record_request_metrics(response):
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.end_request(g.pop('request_stats', None), endpoint, request.method, response.status_code, time.perf_counter() - g.request_started)
+        return response
+
+    @app.teardown_request
+    def finish_profile(exception=None):
+        profile = g.pop('profile', None)
+        if profile:
+            profiler.finish(profile, f"{request.method} {request.url_rule.rule if request.url_rule else request.path}")
 
     # JWT validation middleware
     @app.before_request
@@ -49,13 +106,13 @@ def create_app(config_class=Config):
         if request.method == "OPTIONS":
             return app.response_class(status=200)
         
-        if request.endpoint not in ['login_user', 'register_user']:
+        if request.endpoint not in ['login_user', 'register_user', 'metrics']:
             token = request.headers.get('Authorization', None)
             if token:
                 token = token.replace('Bearer ', '', 1)
-                user_id = validate_and_decode_jwt(token, app.config['SECRET_KEY'])
+                user_id = authenticator.authenticate(token)
                 if user_id:
-                    request.user_id = user_id
+                    g.user_id = user_id
                 else:
                     return jsonify({"message": "Invalid or expired token"}), 401
             else:
@@ -64,5 +121,13 @@ def create_app(config_class=Config):
 
     create_routes(app)
     create_user_routes(app)
+    create_stats_routes(app)
+    if app.config['METRICS_ENABLED'] and app.config['METRICS_TOKEN']:
+        create_metrics_routes(app)
+    timer.mark('routes')
+
+    # startup-phase breakdown in milliseconds; 'imports' is the time taken to import the app package
+    app.extensions['startup_timings'] = {'imports': round((_IMPORT_FINISHED - _IMPORT_STARTED) * 1000, 3), **timer.phases}
+    app.logger.info("startup timings (ms): %s", app.extensions['startup_timings'])
 
     return app
\ No newline at end of file
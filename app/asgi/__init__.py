@@ -0,0 +1,37 @@
+"""Async (ASGI) serving of the API.
+
+The WSGI app ties a worker thread to each request for as long as it waits on DynamoDB or bcrypt, so concurrency is
+capped by the worker count. The ASGI app serves the same routes with async handlers, which await the same services on
+an I/O executor (hints on a CPU executor), so the event loop keeps accepting and answering requests while storage and
+bcrypt calls are in flight. Serve it with any ASGI server, e.g.
+
+    uvicorn --factory app.asgi:create_asgi_app
+
+and compare it with the WSGI app using python -m app.bench.asgi.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import create_app
+from ..config import Config
+from .framework import ASGIApp
+from .routes import create_async_routes
+from .services import AsyncStatsService, AsyncUserService, AsyncWordleService
+
+
+def create_asgi_app(config_class=Config):
+    """Build the ASGI app. It is built on create_app, so both serving paths share the configuration, storage, word
+    dictionary, services, authentication and metrics."""
+    flask_app = create_app(config_class)
+    config = flask_app.config
+    io_executor = ThreadPoolExecutor(config['ASGI_IO_WORKERS'], thread_name_prefix='asgi-io')
+    cpu_executor = ThreadPoolExecutor(config['ASGI_CPU_WORKERS'], thread_name_prefix='asgi-cpu')
+
+    async_wordle_service = AsyncWordleService(config['wordle_service'], io_executor, cpu_executor)
+    async_user_service = AsyncUserService(config['user_service'], io_executor)
+    async_stats_service = AsyncStatsService(config['stats_service'], io_executor)
+
+    asgi = ASGIApp(config, flask_app.json, flask_app.extensions['authenticator'], flask_app.extensions['metrics'], flask_app.logger)
+    create_async_routes(asgi, config, async_wordle_service, async_user_service, async_stats_service)
+    asgi.on_shutdown(io_executor.shutdown)
+    asgi.on_shutdown(cpu_executor.shutdown)
+    return asgi
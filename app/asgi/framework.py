@@ -0,0 +1,160 @@
+"""The ASGI app's web layer, built on Starlette: JSON responses through the app's JSON provider, token authentication,
+CORS and request metrics, matching what Flask and its hooks in app/__init__.py provide to the WSGI app."""
+import contextlib
+import re
+import time
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
+from starlette.routing import Route
+
+
+async def json_body(request):
+    """Return the decoded JSON body ({} if there is none). Raises HTTPException(400) if it isn't a JSON object."""
+    body = await request.body()
+    if not body:
+        return {}
+    try:
+        body = request.app.state.json_provider.loads(body)
+    except ValueError:
+        raise HTTPException(400, "Request body is not valid JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(400, "Request body must be a JSON object")
+    return body
+
+
+def required(body, name):
+    """Return a required field of a JSON body. Raises HTTPException(400) if it is missing."""
+    if name not in body:
+        raise HTTPException(400, f"Missing field {name!r}")
+    return body[name]
+
+
+def if_none_match(request, etag):
+    """Return whether the If-None-Match header matches the entity tag (weak comparison)."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    tags = (tag.strip() for tag in header.split(','))
+    return any(tag == '*' or tag.removeprefix('W/').strip('"') == etag for tag in tags)
+
+
+class RequestMetrics:
+    """ASGI middleware recording each HTTP request in the metrics, labelled with its route's rule."""
+    def __init__(self, app, metrics, rules):
+        self.app = app
+        self.metrics = metrics
+        self.rules = rules
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        stats = self.metrics.begin_request()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # routing sets the matched endpoint on the scope
+            rule = self.rules.get(scope.get('endpoint'), 'unmatched')
+            self.metrics.end_request(stats, rule, scope['method'], status, time.perf_counter() - started)
+
+
+class ASGIApp:
+    """Routes HTTP requests to async handlers. Handlers take the Request and the rule's parameters, and return a
+    Response, or a JSON-serializable object (optionally with a status: `return obj, 404`). Every route requires a valid
+    bearer token unless registered with auth=False; the caller's user_id is set on request.state."""
+    def __init__(self, config, json_provider, authenticator, metrics, logger):
+        self.config = config
+        self.json_provider = json_provider
+        self.authenticator = authenticator
+        self.metrics = metrics
+        self.logger = logger
+        self.rules = {}
+        self.shutdown_callbacks = []
+        self.app = Starlette(
+            middleware=[
+                Middleware(RequestMetrics, metrics=metrics, rules=self.rules),
+                Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['GET', 'POST', 'OPTIONS'], allow_headers=['*']),
+            ],
+            exception_handlers={HTTPException: self._http_error},
+            lifespan=self._lifespan,
+        )
+        self.app.state.json_provider = json_provider
+
+    def route(self, rule, methods=('GET',), auth=True):
+        """Register a handler for a rule in Flask's syntax (/wordle/<game_id>), which also labels its metrics."""
+        path = re.sub(r'<(\w+)>', r'{\1}', rule)
+
+        def register(handler):
+            endpoint = self._endpoint(handler, auth)
+            self.rules[endpoint] = rule
+            self.app.router.routes.append(Route(path, endpoint, methods=list(methods)))
+            return handler
+        return register
+
+    def error_handler(self, exc_class):
+        """Register a handler for an exception raised by any route. It takes the request and the exception, and returns
+        what a route would."""
+        def register(handler):
+            async def handle(request, exc):
+                return self._response(await handler(request, exc))
+            self.app.add_exception_handler(exc_class, handle)
+            return handler
+        return register
+
+    def on_shutdown(self, callback):
+        self.shutdown_callbacks.append(callback)
+
+    def json_response(self, obj, status=200, headers=None):
+        return Response(self.json_provider.dumps_bytes(obj) + b'\n', status, headers, media_type='application/json')
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def _lifespan(self, app):
+        yield
+        for callback in self.shutdown_callbacks:
+            callback()
+
+    def _endpoint(self, handler, auth):
+        async def endpoint(request):
+            if auth:
+                token = request.headers.get('authorization')
+                if not token:
+                    return self.json_response({"message": "Missing authentication token"}, 401)
+                request.state.user_id = self.authenticator.authenticate(token.replace('Bearer ', '', 1))
+                if not request.state.user_id:
+                    return self.json_response({"message": "Invalid or expired token"}, 401)
+
+            try:
+                return self._response(await handler(request, **request.path_params))
+            except Exception as e:
+                # HTTPException and the exceptions given to error_handler are answered by their handlers
+                if type(e) in self.app.exception_handlers:
+                    raise
+                self.logger.exception("Unexpected error handling %s %s", request.method, request.url.path)
+                return self.json_response({"message": "An unexpected error occurred"}, 500)
+        return endpoint
+
+    def _response(self, result):
+        if isinstance(result, Response):
+            return result
+        if isinstance(result, tuple):
+            return self.json_response(*result)
+        return self.json_response(result)
+
+    async def _http_error(self, request, exc):
+        return self.json_response({"message": exc.detail}, exc.status_code, exc.headers)
@@ -0,0 +1,177 @@
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+
+from ..errors import GameOverError, GuessAlreadyMadeError, GuessConflictError, HardModeViolationError, InvalidGuessError, ServiceUnavailableError, UnreadableGameError
+from ..models.wordle_models import Wordle
+from ..utils.middleware import token_matches
+from .framework import if_none_match, json_body, required
+
+GUESS_ERRORS = {
+    GameOverError: "Game is over",
+    GuessAlreadyMadeError: "Guess already made",
+    HardModeViolationError: "Hard mode violation",
+    InvalidGuessError: "Invalid guess",
+}
+
+
+def create_async_routes(asgi, config, wordle_service, user_service, stats_service):
+    """Register the API's routes on the ASGI app, with the same paths, parameters and responses as the Flask routes.
+    The batch endpoints and ndjson history streaming are only served by the WSGI app."""
+    metrics = asgi.metrics
+
+    def service_unavailable():
+        return asgi.json_response({"message": "Server is busy, please try again"}, 503, {'Retry-After': '1'})
+
+    def game_response(wordle):
+        with metrics.section('serialization'):
+            return asgi.json_response(wordle.view())
+
+    @asgi.error_handler(UnreadableGameError)
+    async def unreadable_game(request, e):
+        asgi.logger.warning("Could not read a game: %s", e)
+        return {"message": "Game was stored with a word list that is no longer available"}, 410
+
+    def letter_count_of(value):
+        lengths = wordle_service.word_dictionary.lengths()
+        if value not in lengths:
+            raise HTTPException(400, f"letter_count must be one of {lengths}")
+        return value
+
+    @asgi.route('/register', methods=['POST'], auth=False)
+    async def register_user(request):
+        body = await json_body(request)
+        try:
+            return await user_service.create_user(required(body, 'username'), required(body, 'password'))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+        except ServiceUnavailableError:
+            return service_unavailable()
+
+    @asgi.route('/login', methods=['POST'], auth=False)
+    async def login_user(request):
+        body = await json_body(request)
+        try:
+            user = await user_service.login_user(required(body, 'username'), required(body, 'password'))
+        except ServiceUnavailableError:
+            return service_unavailable()
+        if user:
+            return user
+        return {"message": "Invalid username or password"}, 400
+
+    @asgi.route('/user/<user_id>')
+    async def get_user(request, user_id):
+        user = await user_service.get_user_by_user_id(user_id)
+        if user:
+            return user.view()
+        return {"message": "User not found"}, 404
+
+    @asgi.route('/wordle', methods=['POST'])
+    async def create_game(request):
+        body = await json_body(request)
+        letter_count = letter_count_of(required(body, 'letter_count'))
+        wordle = await wordle_service.generate_wordle(request.state.user_id, letter_count, body.get('hard_mode', False))
+        return {"game_id": wordle.game_id}
+
+    @asgi.route('/wordle/daily', methods=['POST'])
+    async def create_daily_game(request):
+        body = await json_body(request)
+        letter_count = letter_count_of(body.get('letter_count', config['DAILY_LETTER_COUNT']))
+        try:
+            wordle = await wordle_service.generate_daily_wordle(request.state.user_id, letter_count, body.get('hard_mode', False))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+        return {"game_id": wordle.game_id, "puzzle_id": wordle.puzzle_id}
+
+    @asgi.route('/wordle/<game_id>')
+    async def get_game(request, game_id):
+        compact = request.query_params.get('format') == 'compact'
+        item = await wordle_service.get_wordle_item(game_id, request.state.user_id)
+        if not item:
+            return {"message": "Game not found"}, 404
+
+        # the two formats are different representations, so they get different tags
+        etag = Wordle.etag(item) + ('-compact' if compact else '')
+        headers = {'ETag': f'"{etag}"', 'Cache-Control': 'private, no-cache'}
+        if if_none_match(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        wordle = Wordle.from_dict(item)
+        with metrics.section('serialization'):
+            return asgi.json_response(wordle.compact_format() if compact else wordle.view(), headers=headers)
+
+    @asgi.route('/wordle/<game_id>/guess', methods=['POST'])
+    async def make_guess(request, game_id):
+        guess = required(await json_body(request), 'guess')
+        try:
+            wordle = await wordle_service.make_guess(game_id, request.state.user_id, guess)
+        except tuple(GUESS_ERRORS) as e:
+            return {"message": GUESS_ERRORS[type(e)]}, 400
+        except GuessConflictError:
+            return {"message": "Game was updated by another request"}, 409
+        if not wordle:
+            return {"message": "Game not found"}, 404
+        return game_response(wordle)
+
+    @asgi.route('/wordle/<game_id>/hint')
+    async def get_hint(request, game_id):
+        try:
+            hint = await wordle_service.get_hint(game_id, request.state.user_id)
+        except GameOverError:
+            return {"message": "Game is over"}, 400
+        if not hint:
+            return {"message": "Game not found"}, 404
+        return hint
+
+    @asgi.route('/wordle/<game_id>/surrender', methods=['POST'])
+    async def surrender_game(request, game_id):
+        try:
+            wordle = await wordle_service.surrender_game(game_id, request.state.user_id)
+        except GameOverError:
+            return {"message": "Game is over"}, 400
+        except GuessConflictError:
+            return {"message": "Game was updated by another request"}, 409
+        if not wordle:
+            return {"message": "Game not found"}, 404
+        return game_response(wordle)
+
+    @asgi.route('/wordle')
+    async def get_user_wordles(request):
+        """?limit=&cursor= returns a single page: {"items": [...], "next_cursor": "..." | null}. Without either, all
+        games are returned as a list."""
+        limit = request.query_params.get('limit')
+        if limit is not None:
+            if not limit.isdigit() or not 1 <= int(limit) <= config['HISTORY_MAX_PAGE_SIZE']:
+                return {"message": f"limit must be between 1 and {config['HISTORY_MAX_PAGE_SIZE']}"}, 400
+            limit = int(limit)
+
+        if limit is not None or 'cursor' in request.query_params:
+            try:
+                wordles, next_cursor = await wordle_service.get_user_wordles_page(request.state.user_id, limit or config['HISTORY_PAGE_SIZE'], request.query_params.get('cursor'))
+            except ValueError as e:
+                return {"message": str(e)}, 400
+            with metrics.section('serialization'):
+                return asgi.json_response({"items": [wordle.view() for wordle in wordles], "next_cursor": next_cursor})
+
+        wordles = await wordle_service.get_user_wordles(request.state.user_id)
+        with metrics.section('serialization'):
+            return asgi.json_response([wordle.view() for wordle in wordles])
+
+    @asgi.route('/stats')
+    async def get_stats(request):
+        return await stats_service.get_stats(request.state.user_id)
+
+    @asgi.route('/leaderboard')
+    async def get_leaderboard(request):
+        letter_count = request.query_params.get('letter_count', '')
+        if not letter_count.isdigit() or int(letter_count) not in wordle_service.word_dictionary.lengths():
+            return {"message": "letter_count must be a word length in the dictionary"}, 400
+        return {"letter_count": int(letter_count), "entries": await stats_service.get_leaderboard(int(letter_count))}
+
+    if config['METRICS_ENABLED'] and config['METRICS_TOKEN']:
+        @asgi.route('/metrics', auth=False)
+        async def metrics_route(request):
+            if not token_matches(request.headers.get('authorization'), f"Bearer {config['METRICS_TOKEN']}"):
+                return {"message": "Invalid or missing metrics token"}, 401
+            return Response(metrics.render(), media_type='text/plain; version=0.0.4')
+
+    return asgi
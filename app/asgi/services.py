@@ -0,0 +1,78 @@
+"""Async wrappers of WordleService, UserService and StatsService for the ASGI app.
+
+Each awaits the synchronous service built by create_app on an executor, so both serving paths run the same code. An
+operation blocks a worker thread of the I/O executor while it waits on storage or bcrypt, and the event loop serves
+other requests meanwhile. Hints run on the CPU executor, whose size bounds the solver work in flight."""
+import asyncio
+import contextvars
+import functools
+
+
+def run_in_executor(executor, fn, *args, **kwargs):
+    """Run fn on the executor in a copy of the caller's context, so work done there (e.g. DynamoDB calls) is still
+    attributed to the current request in the metrics."""
+    context = contextvars.copy_context()
+    return asyncio.get_running_loop().run_in_executor(executor, functools.partial(context.run, fn, *args, **kwargs))
+
+
+class AsyncWordleService:
+    def __init__(self, service, io_executor, cpu_executor):
+        self.service = service
+        self.io_executor = io_executor
+        self.cpu_executor = cpu_executor
+
+    @property
+    def word_dictionary(self):
+        return self.service.word_dictionary
+
+    async def generate_wordle(self, user_id, letter_count, hard_mode):
+        return await run_in_executor(self.io_executor, self.service.generate_wordle, user_id, letter_count, hard_mode)
+
+    async def generate_daily_wordle(self, user_id, letter_count, hard_mode):
+        return await run_in_executor(self.io_executor, self.service.generate_daily_wordle, user_id, letter_count, hard_mode)
+
+    async def get_wordle_item(self, game_id, user_id):
+        return await run_in_executor(self.io_executor, self.service.get_wordle_item, game_id, user_id)
+
+    async def make_guess(self, game_id, user_id, guess):
+        return await run_in_executor(self.io_executor, self.service.make_guess, game_id, user_id, guess)
+
+    async def surrender_game(self, game_id, user_id):
+        return await run_in_executor(self.io_executor, self.service.surrender_game, game_id, user_id)
+
+    async def get_hint(self, game_id, user_id):
+        # the solver's matrix work releases the GIL, so hints don't hold up the event loop
+        return await run_in_executor(self.cpu_executor, self.service.get_hint, game_id, user_id)
+
+    async def get_user_wordles(self, user_id):
+        return await run_in_executor(self.io_executor, self.service.get_user_wordles, user_id)
+
+    async def get_user_wordles_page(self, user_id, limit, cursor=None):
+        return await run_in_executor(self.io_executor, self.service.get_user_wordles_page, user_id, limit, cursor)
+
+
+class AsyncUserService:
+    def __init__(self, service, io_executor):
+        self.service = service
+        self.io_executor = io_executor
+
+    async def create_user(self, username, password):
+        return await run_in_executor(self.io_executor, self.service.create_user, username, password)
+
+    async def login_user(self, username, password):
+        return await run_in_executor(self.io_executor, self.service.login_user, username, password)
+
+    async def get_user_by_user_id(self, user_id):
+        return await run_in_executor(self.io_executor, self.service.get_user_by_user_id, user_id)
+
+
+class AsyncStatsService:
+    def __init__(self, service, io_executor):
+        self.service = service
+        self.io_executor = io_executor
+
+    async def get_stats(self, user_id):
+        return await run_in_executor(self.io_executor, self.service.get_stats, user_id)
+
+    async def get_leaderboard(self, letter_count):
+        return await run_in_executor(self.io_executor, self.service.get_leaderboard, letter_count)
@@ -0,0 +1,50 @@
+import json
+import math
+import time
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of the samples using the nearest-rank method."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    """Summarize latency samples given in seconds as microsecond statistics."""
+    if not samples:
+        return {"calls": 0}
+    return {
+        "calls": len(samples),
+        "mean_us": sum(samples) / len(samples) * 1e6,
+        "p50_us": percentile(samples, 50) * 1e6,
+        "p99_us": percentile(samples, 99) * 1e6,
+    }
+
+
+class Timer:
+    """Collects the duration of each call made through `timed`, grouped by name."""
+    def __init__(self):
+        self.samples = {}
+
+    def timed(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter() - start)
+
+    def merge(self, samples):
+        for name, values in samples.items():
+            self.samples.setdefault(name, []).extend(values)
+
+
+def write_results(results, output):
+    """Print the results as JSON, and also write them to `output` if given."""
+    text = json.dumps(results, indent=2)
+    print(text)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
@@ -0,0 +1,127 @@
+"""Offline game simulation benchmark.
+
+Plays every solution of a word length against a guessing strategy in a multiprocessing pool and reports throughput,
+solver quality and per-call latencies of the scoring, validation and serialization paths:
+
+    python -m app.bench --length 5 --strategy entropy --processes 4 --output bench_5.json
+"""
+import argparse
+import multiprocessing
+import random
+import time
+
+from . import Timer, summarize, write_results
+from ..config import Config
+from ..models import scoring
+from ..models.solver import WordleSolver
+from ..models.word_dictionary import WordDictionary
+from ..models.wordle_models import Wordle, WordleHelper
+
+STRATEGIES = ('entropy', 'random', 'first')
+
+_state = {}
+
+
+def _init_worker(words_path, matrix_dir, strategy, hard_mode, cold_cache, seed):
+    dictionary = WordDictionary.from_file(words_path)
+    _state.update(
+        dictionary=dictionary,
+        solver=WordleSolver(dictionary, matrix_dir),
+        strategy=strategy,
+        hard_mode=hard_mode,
+        cold_cache=cold_cache,
+        rng=random.Random(seed),
+    )
+
+
+def _next_guess(wordle, timer):
+    strategy = _state['strategy']
+    if strategy == 'entropy':
+        return timer.timed('solver', _state['solver'].suggest, wordle.constraints, wordle.hard_mode)[0]
+
+    candidates = timer.timed('solver', wordle.constraints.candidates, _state['dictionary'])
+    if strategy == 'random':
+        return _state['rng'].choice(candidates)
+    return candidates[0]
+
+
+def _play(solutions):
+    dictionary = _state['dictionary']
+    timer = Timer()
+    results = []
+
+    for solution in solutions:
+        wordle = Wordle(None, None, solution, [], False, False, _state['hard_mode'])
+        while not wordle.is_game_over():
+            guess = _next_guess(wordle, timer)
+            timer.timed('validation', WordleHelper.make_guess, dictionary, wordle, guess)
+            if _state['cold_cache']:
+                scoring.clear_cache()
+            timer.timed('scoring', wordle.get_formatted_guesses)
+            timer.timed('serialization', wordle.return_format)
+        results.append((wordle.solved, len(wordle.guesses)))
+
+    return results, timer.samples
+
+
+def run(length, strategy, processes, hard_mode=False, limit=None, cold_cache=False, seed=0, chunk_size=16):
+    dictionary = WordDictionary.from_file(Config.WORDS_PATH)
+    solutions = list(dictionary.words_of_length(length))
+    if limit:
+        solutions = solutions[:limit]
+
+    if strategy == 'entropy':
+        # build the matrix once up front rather than racing to build it in every worker
+        WordleSolver(dictionary, Config.PATTERN_MATRIX_DIR).matrix(length)
+
+    chunks = [solutions[i:i + chunk_size] for i in range(0, len(solutions), chunk_size)]
+    init_args = (Config.WORDS_PATH, Config.PATTERN_MATRIX_DIR, strategy, hard_mode, cold_cache, seed)
+
+    timer = Timer()
+    games = []
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=init_args) as pool:
+        for results, samples in pool.imap_unordered(_play, chunks):
+            games.extend(results)
+            timer.merge(samples)
+    elapsed = time.perf_counter() - start
+
+    solved = [guesses for won, guesses in games if won]
+    distribution = {}
+    for guesses in solved:
+        distribution[guesses] = distribution.get(guesses, 0) + 1
+
+    return {
+        "length": length,
+        "strategy": strategy,
+        "hard_mode": hard_mode,
+        "processes": processes,
+        "cold_cache": cold_cache,
+        "games": len(games),
+        "elapsed_seconds": elapsed,
+        "games_per_second": len(games) / elapsed if elapsed else None,
+        "solved_rate": len(solved) / len(games) if games else None,
+        "average_guesses": sum(solved) / len(solved) if solved else None,
+        "guess_distribution": {str(k): v for k, v in sorted(distribution.items())},
+        "latency": {name: summarize(values) for name, values in sorted(timer.samples.items())},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.bench', description='Simulate games for every solution of a word length.')
+    parser.add_argument('--length', type=int, default=5, help='word length to simulate (default: 5)')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='entropy', help='how the next guess is chosen (default: entropy)')
+    parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count(), help='worker processes (default: CPU count)')
+    parser.add_argument('--hard-mode', action='store_true', help='play every game in hard mode')
+    parser.add_argument('--limit', type=int, help='only play the first N solutions')
+    parser.add_argument('--cold-cache', action='store_true', help='clear the pattern cache before each scoring call')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random strategy')
+    parser.add_argument('--output', help='also write the JSON results to this file')
+    args = parser.parse_args(argv)
+
+    results = run(args.length, args.strategy, args.processes, args.hard_mode, args.limit, args.cold_cache, args.seed)
+    write_results(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
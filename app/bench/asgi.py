@@ -0,0 +1,111 @@
+"""WSGI vs ASGI throughput benchmark.
+
+Runs the HTTP scenarios of app.bench.http against the WSGI app, limited to a fixed number of worker threads as a
+threaded WSGI server would be, and against the ASGI app on a single event loop with its I/O executor
+(Config.ASGI_IO_WORKERS). Both use the in-memory backend with a simulated storage round trip (Config.MEMORY_LATENCY),
+which is what blocks a WSGI worker and what the ASGI app overlaps. Requests go through in-process transports (no sockets), so only the serving model differs:
+
+    python -m app.bench.asgi --users 200 --concurrency 64 --workers 8 --latency 0.005 --output bench_asgi.json
+"""
+import argparse
+import asyncio
+import json
+import threading
+
+from . import write_results
+from .http import BenchConfig, ClientTransport, run_scenarios
+
+
+class WorkerPoolTransport:
+    """The Flask test client, with at most `workers` requests being handled at once; the rest wait for a worker."""
+    def __init__(self, app, workers):
+        self.client = ClientTransport(app)
+        self.workers = threading.BoundedSemaphore(workers)
+
+    def request(self, method, path, body=None, token=None):
+        with self.workers:
+            return self.client.request(method, path, body, token)
+
+
+class ASGITransport:
+    """Calls the ASGI app directly on an event loop running in a background thread. Client threads submit requests to
+    the loop and wait for their responses."""
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def request(self, method, path, body=None, token=None):
+        return asyncio.run_coroutine_threadsafe(self._request(method, path, body, token), self.loop).result()
+
+    async def _request(self, method, path, body, token):
+        path, _, query = path.partition('?')
+        headers = [(b'content-type', b'application/json')]
+        if token:
+            headers.append((b'authorization', f'Bearer {token}'.encode('latin-1')))
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query.encode('latin-1'), 'headers': headers}
+        request_body = json.dumps(body).encode('utf-8') if body is not None else b''
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': request_body, 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await self.app(scope, receive, send)
+        status = messages[0]['status']
+        content_type = dict(messages[0]['headers']).get(b'content-type', b'')
+        if not content_type.startswith(b'application/json'):
+            return status, None
+        return status, json.loads(messages[1]['body'])
+
+
+def run(users, concurrency, workers, latency, letter_count=5, seed=0):
+    from .. import create_app
+    from ..asgi import create_asgi_app
+
+    class Config(BenchConfig):
+        MEMORY_LATENCY = latency
+        # let every user's login wait for bcrypt instead of being turned away with 503
+        PASSWORD_QUEUE_SIZE = concurrency
+
+    results = {"users": users, "concurrency": concurrency, "workers": workers, "latency_seconds": latency, "letter_count": letter_count}
+
+    app = create_app(Config)
+    words = list(app.config['wordle_service'].word_dictionary.words_of_length(letter_count))
+    results['wsgi'] = run_scenarios(WorkerPoolTransport(app, workers), words, users, concurrency, letter_count, seed)
+
+    with ASGITransport(create_asgi_app(Config)) as transport:
+        results['asgi'] = run_scenarios(transport, words, users, concurrency, letter_count, seed)
+
+    if results['wsgi']['rps']:
+        results['asgi_speedup'] = results['asgi']['rps'] / results['wsgi']['rps']
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.bench.asgi', description='Compare WSGI and ASGI throughput under storage latency.')
+    parser.add_argument('--users', type=int, default=200, help='virtual users, each playing one scenario (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=64, help='users running at the same time (default: 64)')
+    parser.add_argument('--workers', type=int, default=8, help='WSGI worker threads (default: 8)')
+    parser.add_argument('--latency', type=float, default=0.005, help='simulated storage round trip in seconds (default: 0.005)')
+    parser.add_argument('--length', type=int, default=5, help='word length of the games (default: 5)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the guesses')
+    parser.add_argument('--output', help='also write the JSON results to this file')
+    args = parser.parse_args(argv)
+
+    write_results(run(args.users, args.concurrency, args.workers, args.latency, args.length, args.seed), args.output)
+
+
+if __name__ == '__main__':
+    main()
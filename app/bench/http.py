@@ -0,0 +1,248 @@
+"""End-to-end HTTP load and regression benchmark.
+
+Drives the real app from create_app, backed by the in-memory storage backend, with concurrent virtual users. Each user
+registers, logs in, plays a game to the end (up to six guesses), fetches it and their history, then starts a second
+game and surrenders it. The scenarios run through Flask's WSGI test client and/or a threaded werkzeug server on a local
+port, and requests/sec and latency percentiles are reported per route:
+
+    python -m app.bench.http --users 200 --concurrency 8 --output bench_http.json
+
+Passing --baseline compares the run against an earlier --output file and exits with status 1 if any route's p50/p99
+latency grew, or its throughput dropped, by more than --tolerance.
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from . import Timer, percentile, summarize, write_results
+from ..config import Config
+
+TRANSPORTS = ('client', 'server')
+# each scenario request is recorded under its route's method and URL rule
+REGISTER = 'POST /register'
+LOGIN = 'POST /login'
+GET_USER = 'GET /user/<user_id>'
+CREATE_GAME = 'POST /wordle'
+GUESS = 'POST /wordle/<game_id>/guess'
+GET_GAME = 'GET /wordle/<game_id>'
+HISTORY = 'GET /wordle'
+SURRENDER = 'POST /wordle/<game_id>/surrender'
+
+
+class BenchConfig(Config):
+    STORAGE_BACKEND = 'memory'
+    # the cheapest bcrypt cost, so the benchmark measures the app rather than the hash
+    BCRYPT_ROUNDS = 4
+    LAZY_STARTUP = False
+
+
+class ClientTransport:
+    """Sends requests through the Flask test client (no sockets); one client per worker thread."""
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method, path, body=None, token=None):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        response = client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+
+class ServerTransport:
+    """Serves the app from a threaded werkzeug server on a free local port and sends requests over HTTP."""
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.local = threading.local()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.thread.join()
+
+    def request(self, method, path, body=None, token=None):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port)
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = connection.getresponse()
+        data = response.read()
+        if response.headers.get_content_type() != 'application/json':
+            return response.status, None
+        return response.status, json.loads(data)
+
+
+class Scenario:
+    """One virtual user's session. Every request is timed under its route; responses with an unexpected status count as
+    errors."""
+    def __init__(self, transport, words, timer, errors, rng):
+        self.transport = transport
+        self.words = words
+        self.timer = timer
+        self.errors = errors
+        self.rng = rng
+
+    def call(self, route, method, path, body=None, token=None, expected=(200,)):
+        status, data = self.timer.timed(route, self.transport.request, method, path, body, token)
+        if status not in expected:
+            self.errors[route] = self.errors.get(route, 0) + 1
+            return None
+        return data
+
+    def run(self, username, letter_count):
+        credentials = {'username': username, 'password': 'bench-password'}
+        if not self.call(REGISTER, 'POST', '/register', credentials):
+            return
+        login = self.call(LOGIN, 'POST', '/login', credentials)
+        if not login:
+            return
+        token = login['token']
+        self.call(GET_USER, 'GET', f"/user/{login['user_id']}", token=token)
+
+        game = self.call(CREATE_GAME, 'POST', '/wordle', {'letter_count': letter_count}, token)
+        if not game:
+            return
+        for guess in self.rng.sample(self.words, 6):
+            state = self.call(GUESS, 'POST', f"/wordle/{game['game_id']}/guess", {'guess': guess}, token)
+            if not state or state['game_over']:
+                break
+        self.call(GET_GAME, 'GET', f"/wordle/{game['game_id']}", token=token)
+        self.call(HISTORY, 'GET', '/wordle?limit=10', token=token)
+
+        game = self.call(CREATE_GAME, 'POST', '/wordle', {'letter_count': letter_count}, token)
+        if game:
+            self.call(SURRENDER, 'POST', f"/wordle/{game['game_id']}/surrender", token=token)
+
+
+def _run_users(transport, words, letter_count, usernames, seed):
+    timer = Timer()
+    errors = {}
+    scenario = Scenario(transport, words, timer, errors, random.Random(seed))
+    for username in usernames:
+        scenario.run(username, letter_count)
+    return timer.samples, errors
+
+
+def run_transport(app, transport_name, users, concurrency, letter_count, seed=0):
+    words = list(app.config['wordle_service'].word_dictionary.words_of_length(letter_count))
+    if transport_name == 'server':
+        context = ServerTransport(app)
+    else:
+        context = contextlib.nullcontext(ClientTransport(app))
+
+    with context as transport:
+        return run_scenarios(transport, words, users, concurrency, letter_count, seed)
+
+
+def run_scenarios(transport, words, users, concurrency, letter_count, seed=0):
+    """Run `users` scenarios through the transport, `concurrency` at a time, and summarize the requests per route."""
+    prefix = f'bench-{uuid.uuid4().hex[:8]}'
+    batches = [[f'{prefix}-{i}' for i in range(worker, users, concurrency)] for worker in range(concurrency)]
+
+    timer = Timer()
+    errors = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for samples, batch_errors in pool.map(_run_users, [transport] * concurrency, [words] * concurrency,
+                                              [letter_count] * concurrency, batches, range(seed, seed + concurrency)):
+            timer.merge(samples)
+            for route, count in batch_errors.items():
+                errors[route] = errors.get(route, 0) + count
+    elapsed = time.perf_counter() - start
+
+    routes = {}
+    for route, samples in sorted(timer.samples.items()):
+        routes[route] = {
+            **summarize(samples),
+            "p95_us": percentile(samples, 95) * 1e6,
+            "rps": len(samples) / elapsed,
+            "errors": errors.get(route, 0),
+        }
+    total = sum(len(samples) for samples in timer.samples.values())
+    return {
+        "elapsed_seconds": elapsed,
+        "requests": total,
+        "rps": total / elapsed if elapsed else None,
+        "errors": sum(errors.values()),
+        "routes": routes,
+    }
+
+
+def run(transports, users, concurrency, letter_count=5, seed=0):
+    from .. import create_app
+
+    app = create_app(BenchConfig)
+    results = {"users": users, "concurrency": concurrency, "letter_count": letter_count}
+    for name in transports:
+        results[name] = run_transport(app, name, users, concurrency, letter_count, seed)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a description of every route that regressed by more than `tolerance` (a fraction) against the baseline.
+    Routes or transports missing from either run are skipped; any failed request is a regression."""
+    regressions = []
+    for transport in TRANSPORTS:
+        if transport not in results:
+            continue
+        if results[transport]['errors']:
+            regressions.append(f"{transport}: {results[transport]['errors']} requests failed")
+        for route, current in results[transport]['routes'].items():
+            previous = baseline.get(transport, {}).get('routes', {}).get(route)
+            if not previous:
+                continue
+            for metric in ('p50_us', 'p99_us'):
+                if current[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append(f"{transport} {route}: {metric} {current[metric]:.0f} > baseline {previous[metric]:.0f}")
+            if current['rps'] < previous['rps'] * (1 - tolerance):
+                regressions.append(f"{transport} {route}: rps {current['rps']:.1f} < baseline {previous['rps']:.1f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.bench.http', description='Load-test the HTTP API with concurrent game sessions.')
+    parser.add_argument('--transport', choices=TRANSPORTS + ('both',), default='both', help='WSGI test client, local server or both (default: both)')
+    parser.add_argument('--users', type=int, default=100, help='virtual users, each playing one scenario (default: 100)')
+    parser.add_argument('--concurrency', type=int, default=8, help='users running at the same time (default: 8)')
+    parser.add_argument('--length', type=int, default=5, help='word length of the games (default: 5)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the guesses')
+    parser.add_argument('--output', help='also write the JSON results to this file')
+    parser.add_argument('--baseline', help='results file from an earlier run to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown against the baseline, as a fraction (default: 0.25)')
+    args = parser.parse_args(argv)
+
+    transports = TRANSPORTS if args.transport == 'both' else (args.transport,)
+    results = run(transports, args.users, args.concurrency, args.length, args.seed)
+    write_results(results, args.output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
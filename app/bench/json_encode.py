@@ -0,0 +1,100 @@
+"""JSON encoding micro-benchmark for game history responses.
+
+Builds histories of 10, 1,000 and 10,000 played games and measures the time and peak memory to turn them into a JSON
+response body with each provider (stdlib json, orjson) and representation (return_format() dicts, view() dataclasses).
+Building the representation is included in the measurement, since avoiding the intermediate dicts is the point:
+
+    python -m app.bench.json_encode --repeat 5 --output bench_json.json
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from flask import Flask
+
+from . import write_results
+from ..config import Config
+from ..models.word_dictionary import WordDictionary
+from ..models.wordle_models import Wordle, WordleHelper
+from ..utils.json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+
+SIZES = (10, 1000, 10000)
+REPRESENTATIONS = {
+    'dicts': Wordle.return_format,
+    'views': Wordle.view,
+}
+
+
+def _games(dictionary, count, length, seed):
+    rng = random.Random(seed)
+    words = dictionary.words_of_length(length)
+    games = []
+    for i in range(count):
+        wordle = WordleHelper.generate_wordle(f'game-{i}', 'bench-user', dictionary, length, False)
+        for guess in rng.sample(words, rng.randint(0, length + 1)):
+            if wordle.is_game_over():
+                break
+            if guess not in wordle.guesses:
+                WordleHelper.make_guess(dictionary, wordle, guess)
+        games.append(wordle)
+    return games
+
+
+def _encode(provider, represent, games):
+    return provider.dumps([represent(wordle) for wordle in games])
+
+
+def _measure(provider, represent, games, repeat):
+    _encode(provider, represent, games)  # warm the scoring cache and the shared view objects
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = _encode(provider, represent, games)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    _encode(provider, represent, games)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "best_ms": min(timings) * 1000,
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "peak_kib": peak / 1024,
+        "bytes": len(body.encode('utf-8')),
+    }
+
+
+def run(sizes=SIZES, repeat=5, length=5, seed=0):
+    app = Flask(__name__)
+    providers = {'stdlib': StdlibJSONProvider(app)}
+    if orjson is not None:
+        providers['orjson'] = OrjsonProvider(app)
+
+    dictionary = WordDictionary.from_file(Config.WORDS_PATH)
+    results = {"repeat": repeat, "length": length, "sizes": {}}
+    for size in sizes:
+        games = _games(dictionary, size, length, seed)
+        results["sizes"][str(size)] = {
+            f"{provider_name}/{representation}": _measure(provider, represent, games, repeat)
+            for provider_name, provider in providers.items()
+            for representation, represent in REPRESENTATIONS.items()
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.bench.json_encode', description='Compare JSON encoding of game histories.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='history sizes in games (default: 10 1000 10000)')
+    parser.add_argument('--repeat', type=int, default=5, help='timed encodes per case (default: 5)')
+    parser.add_argument('--length', type=int, default=5, help='word length of the games (default: 5)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generated games')
+    parser.add_argument('--output', help='also write the JSON results to this file')
+    args = parser.parse_args(argv)
+
+    write_results(run(args.sizes, args.repeat, args.length, args.seed), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""DynamoDB repository backend benchmark.
+
+Compares the per-call cost of the boto3 Table resource backend (WordleRepository) with the low-level client backend
+(WordleClientRepository) for the game operations on the hot path. Both run against botocore's Stubber, so no network
+is involved and the numbers isolate client-side work: parameter validation, (un)marshalling and response parsing.
+
+    python -m app.bench.repository --iterations 2000 --output bench_repository.json
+"""
+import argparse
+
+from . import Timer, summarize, write_results
+from ..config import Config
+from ..models.word_dictionary import WordDictionary
+from ..models.wordle_models import WordleHelper
+from ..repositories.dynamodb import botocore_config_options
+from ..repositories.wordle_client_repository import WordleClientRepository
+from ..repositories.wordle_marshaller import marshal_wordle
+from ..repositories.wordle_repository import WordleRepository
+
+TABLE_NAME = 'Wordle'
+
+
+def _sample_wordle():
+    dictionary = WordDictionary.from_file(Config.WORDS_PATH)
+    wordle = WordleHelper.generate_wordle('bench-game', 'bench-user', dictionary, 5, False)
+    for guess in dictionary.words_of_length(5)[:3]:
+        if guess != wordle.solution:
+            WordleHelper.make_guess(dictionary, wordle, guess)
+    return wordle
+
+
+def _stubbed(client, iterations, item):
+    from botocore.stub import Stubber
+
+    stubber = Stubber(client)
+    for _ in range(iterations):
+        stubber.add_response('put_item', {})
+    for _ in range(iterations):
+        stubber.add_response('get_item', {'Item': marshal_wordle(item)})
+    for _ in range(iterations):
+        stubber.add_response('update_item', {})
+    return stubber
+
+
+def _run(repository, stubber, wordle, iterations):
+    item = wordle.to_dict()
+    timer = Timer()
+    with stubber:
+        for _ in range(iterations):
+            timer.timed('create_wordle', repository.create_wordle, item)
+        for _ in range(iterations):
+            timer.timed('get_wordle', repository.get_wordle, wordle.game_id, wordle.user_id)
+        for _ in range(iterations):
+            timer.timed('commit_guess', repository.commit_guess, wordle)
+    return {name: summarize(samples) for name, samples in timer.samples.items()}
+
+
+def run(iterations):
+    import boto3
+    from botocore.config import Config as BotocoreConfig
+
+    app_config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    client_kwargs = {
+        'region_name': Config.DYNAMODB_REGION,
+        'aws_access_key_id': 'bench',
+        'aws_secret_access_key': 'bench',
+        'config': BotocoreConfig(**botocore_config_options(app_config)),
+    }
+    wordle = _sample_wordle()
+    item = wordle.to_dict()
+
+    table = boto3.resource('dynamodb', **client_kwargs).Table(TABLE_NAME)
+    resource_results = _run(WordleRepository(table), _stubbed(table.meta.client, iterations, item), wordle, iterations)
+
+    client = boto3.client('dynamodb', **client_kwargs)
+    client_results = _run(WordleClientRepository(client, TABLE_NAME), _stubbed(client, iterations, item), wordle, iterations)
+
+    return {
+        "iterations": iterations,
+        "resource": resource_results,
+        "client": client_results,
+        "speedup": {
+            name: resource_results[name]['mean_us'] / client_results[name]['mean_us']
+            for name in resource_results
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.bench.repository', description='Compare the resource and client DynamoDB backends against a local stub.')
+    parser.add_argument('--iterations', type=int, default=1000, help='calls per operation (default: 1000)')
+    parser.add_argument('--output', help='also write the JSON results to this file')
+    args = parser.parse_args(argv)
+
+    write_results(run(args.iterations), args.output)
+
+
+if __name__ == '__main__':
+    main()
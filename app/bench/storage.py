@@ -0,0 +1,98 @@
+"""Stored game format benchmark: per-field items vs the compact binary encoding (Config.COMPACT_STORAGE).
+
+Plays games to every guess count and reports, for each format, the DynamoDB item size with the read and write capacity
+units it costs, and the time to turn a Wordle into a DynamoDB item and back (to_dict + marshal, unmarshal + from_dict):
+
+    python -m app.bench.storage --length 5 --repeat 200 --output bench_storage.json
+"""
+import argparse
+import math
+import random
+import time
+
+from . import write_results
+from ..config import Config
+from ..models.game_codec import GameCodec
+from ..models.word_dictionary import WordDictionary
+from ..models.wordle_models import Wordle, WordleHelper
+from ..repositories.wordle_marshaller import marshal_wordle, unmarshal_wordle
+
+
+def attribute_size(attr):
+    """Approximate DynamoDB's size of a marshalled attribute value, following its published sizing rules."""
+    (kind, value), = attr.items()
+    if kind in ('S', 'B'):
+        return len(value.encode('utf-8')) if kind == 'S' else len(value)
+    if kind == 'N':
+        return len(value.lstrip('-').replace('.', '').strip('0')) // 2 + 1
+    if kind in ('BOOL', 'NULL'):
+        return 1
+    if kind == 'L':
+        return 3 + sum(1 + attribute_size(item) for item in value)
+    return 3 + sum(1 + len(name.encode('utf-8')) + attribute_size(item) for name, item in value.items())
+
+
+def item_size(attrs):
+    return sum(len(name.encode('utf-8')) + attribute_size(attr) for name, attr in attrs.items())
+
+
+def _games(dictionary, length, seed):
+    """One game in progress at each guess count, from none to the last guess before the game is lost."""
+    rng = random.Random(seed)
+    words = dictionary.words_of_length(length)
+    games = []
+    for guess_count in range(length + 1):
+        wordle = WordleHelper.generate_wordle(f'game-{guess_count}', 'bench-user', dictionary, length, False)
+        wordle.created_at = '2024-01-01T00:00:00+00:00'
+        for guess in rng.sample([word for word in words if word != wordle.solution], guess_count):
+            WordleHelper.make_guess(dictionary, wordle, guess)
+        games.append(wordle)
+    return games
+
+
+def _time(func, wordle, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(wordle)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(length=5, repeat=200, seed=0):
+    dictionary = WordDictionary.from_file(Config.WORDS_PATH)
+    codec = GameCodec(dictionary)
+    formats = {
+        'fields': (lambda wordle: wordle.to_dict(), lambda item: item),
+        'compact': (codec.encode_item, codec.decode_item),
+    }
+
+    results = {"length": length, "repeat": repeat, "guess_counts": {}}
+    for wordle in _games(dictionary, length, seed):
+        case = {}
+        for name, (encode, decode) in formats.items():
+            attrs = marshal_wordle(encode(wordle))
+            size = item_size(attrs)
+            case[name] = {
+                "item_bytes": size,
+                "write_units": math.ceil(size / 1024),
+                "read_units": math.ceil(size / 4096),
+                "encode_us": _time(lambda wordle: marshal_wordle(encode(wordle)), wordle, repeat),
+                "decode_us": _time(lambda attrs: Wordle.from_dict(decode(unmarshal_wordle(attrs))), attrs, repeat),
+            }
+        case["size_ratio"] = case['compact']['item_bytes'] / case['fields']['item_bytes']
+        results["guess_counts"][str(len(wordle.guesses))] = case
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.bench.storage', description='Compare the stored game formats.')
+    parser.add_argument('--length', type=int, default=5, help='word length of the games (default: 5)')
+    parser.add_argument('--repeat', type=int, default=200, help='timed conversions per case (default: 200)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the guesses')
+    parser.add_argument('--output', help='also write the JSON results to this file')
+    args = parser.parse_args(argv)
+
+    write_results(run(args.length, args.repeat, args.seed), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Build the prebuilt resources loaded at startup.
+
+    python -m app.build dictionary           # resources/words.txt -> resources/words.bin and resources/word_archive
+    python -m app.build patterns [LENGTH...] # hint solver pattern matrices (all lengths by default)
+"""
+import argparse
+
+from .config import Config
+from .models.game_codec import archive_word_lists
+from .models.solver import WordleSolver
+from .models.word_dictionary import WordDictionary, source_digest
+
+
+def build_dictionary(source, target, archive_dir):
+    dictionary = WordDictionary.from_file(source)
+    dictionary.to_binary(target, source_digest(source))
+    print(f"wrote {len(dictionary)} words to {target}")
+    for path in archive_word_lists(dictionary, archive_dir):
+        print(f"archived {path}")
+
+
+def build_patterns(words_path, matrix_dir, lengths):
+    dictionary = WordDictionary.from_file(words_path)
+    solver = WordleSolver(dictionary, matrix_dir)
+    for length in lengths or dictionary.lengths():
+        solver.build(length)
+        print(f"built {solver.matrix_path(length)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.build', description='Build the prebuilt resources loaded at startup.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    dictionary = commands.add_parser('dictionary', help='build the memory-mappable word dictionary')
+    dictionary.add_argument('--source', default=Config.WORDS_PATH)
+    dictionary.add_argument('--target', default=Config.WORDS_BINARY_PATH)
+    dictionary.add_argument('--archive', default=Config.WORD_ARCHIVE_DIR, help='directory of the word lists games were encoded against')
+
+    patterns = commands.add_parser('patterns', help='build the hint solver pattern matrices')
+    patterns.add_argument('lengths', nargs='*', type=int)
+
+    args = parser.parse_args(argv)
+    if args.command == 'dictionary':
+        build_dictionary(args.source, args.target, args.archive)
+    else:
+        build_patterns(Config.WORDS_PATH, Config.PATTERN_MATRIX_DIR, args.lengths)
+
+
+if __name__ == '__main__':
+    main()
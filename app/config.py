@@ -1,6 +1,117 @@
-# dynamo
+from datetime import date
+from pathlib import Path
+
+RESOURCES_DIR = Path(__file__).parent.parent / 'resources'
+
 class Config:
+    # where games and users are stored: 'dynamodb', or 'memory' / 'sqlite' for local development and load testing
+    STORAGE_BACKEND = 'dynamodb'
+    # SQLite database file for the 'sqlite' backend (':memory:' for a private, per-process database)
+    SQLITE_PATH = ':memory:'
+    # simulated round trip in seconds added to every 'memory' backend call, to load test as if against a remote store
+    MEMORY_LATENCY = 0.0
+
+    # dynamo
     DYNAMODB_REGION = 'us-east-1'
+    # 'resource' uses the boto3 Table interface for games; 'client' uses the low-level client with a precompiled
+    # marshaller for the game item shape
+    DYNAMODB_WORDLE_BACKEND = 'resource'
+    # botocore settings shared by the DynamoDB resource and client
+    DYNAMODB_MAX_POOL_CONNECTIONS = 50
+    DYNAMODB_TCP_KEEPALIVE = True
+    DYNAMODB_CONNECT_TIMEOUT = 2
+    DYNAMODB_READ_TIMEOUT = 5
+    DYNAMODB_RETRY_MODE = 'adaptive'
+    DYNAMODB_MAX_ATTEMPTS = 3
     DYNAMODB_WORDLE_TABLE = 'Wordle'
+    # global secondary index on the Wordle table: user_id (partition key), created_at (sort key). Games stored before
+    # created_at was recorded are only in it once given one, by `python -m app.migrate created-at` or their next write
+    DYNAMODB_WORDLE_USER_INDEX = 'user_id-created_at-index'
+    # keyed by username, with a global secondary index on user_id. A table from before users were keyed by username is
+    # copied into one with `python -m app.migrate users --target <table>`, which then replaces it here
     DYNAMODB_USER_TABLE = 'UserTokens'
-    SECRET_KEY = 'secret'
\ No newline at end of file
+    DYNAMODB_USER_ID_INDEX = 'user_id-index'
+    # keyed by stats_id: 'user#<user_id>' items hold a user's statistics, 'leaderboard#<letter_count>' items a leaderboard
+    DYNAMODB_STATS_TABLE = 'WordleStats'
+    SECRET_KEY = 'secret'
+
+    # issued tokens expire after this many seconds; verified tokens are cached until then (at most JWT_CACHE_TTL)
+    JWT_EXPIRATION_SECONDS = 24 * 60 * 60
+    JWT_CACHE_SIZE = 4096
+    JWT_CACHE_TTL = 300
+
+    # password hashing runs on a bounded worker pool; requests beyond the queue are rejected with 503.
+    # Changing BCRYPT_ROUNDS rehashes each user's password on their next login
+    BCRYPT_ROUNDS = 12
+    PASSWORD_POOL_SIZE = 4
+    PASSWORD_QUEUE_SIZE = 16
+    PASSWORD_TIMEOUT = 10
+
+    # users looked up by user_id are cached for a short time
+    USER_CACHE_SIZE = 1024
+    USER_CACHE_TTL = 300
+
+    # optional write-through cache of active games in front of the Wordle table. Writes are still conditional on the
+    # game's version, so a stale entry (e.g. the game was updated through another worker) is detected and evicted
+    GAME_CACHE_ENABLED = False
+    GAME_CACHE_SIZE = 4096
+    GAME_CACHE_TTL = 300
+
+    # store each game's state as one binary attribute (word indices, flags and a format version) instead of one
+    # attribute per field. Both formats are always read; games stored per field are converted by their next write
+    COMPACT_STORAGE = False
+
+    # most games a single POST /wordle/batch or POST /wordle/batch-get may create or fetch
+    BATCH_CREATE_MAX = 50
+    BATCH_GET_MAX = 100
+
+    # game history pagination
+    HISTORY_PAGE_SIZE = 50
+    HISTORY_MAX_PAGE_SIZE = 100
+
+    # entries kept in each letter count's leaderboard
+    LEADERBOARD_SIZE = 10
+
+    # JSON encoding of responses: 'orjson', 'stdlib', or 'auto' to use orjson when it is installed
+    JSON_PROVIDER = 'auto'
+
+    # request latency, DynamoDB usage and section timings, in the Prometheus text format at /metrics. /metrics is only
+    # served when METRICS_TOKEN is set, to requests with `Authorization: Bearer <METRICS_TOKEN>`
+    METRICS_ENABLED = True
+    METRICS_TOKEN = None
+    # profile a fraction of requests with cProfile, and any request whose PROFILE_HEADER (e.g. 'X-Profile') is
+    # PROFILE_TOKEN; profiling on request is off unless both are set. Profiles are written to PROFILE_DIR as .prof
+    # files, or logged when it isn't set
+    PROFILE_SAMPLE_RATE = 0.0
+    PROFILE_HEADER = None
+    PROFILE_TOKEN = None
+    PROFILE_DIR = None
+
+    # daily puzzles: every player gets the same word per (date, letter count), from a schedule seeded by DAILY_SEED
+    # and starting at DAILY_EPOCH. Changing the seed or the dictionary reshuffles every day's puzzle, but games already
+    # started keep the solution they were created with
+    DAILY_SEED = 'wordle-daily'
+    DAILY_EPOCH = date(2024, 1, 1)
+    DAILY_DAYS = 3660
+    DAILY_LETTER_COUNT = 5
+
+    # async serving (app/asgi): threads that run the services' operations, which block on storage and bcrypt (sized like
+    # the DynamoDB connection pool), and threads for hints
+    ASGI_IO_WORKERS = 50
+    ASGI_CPU_WORKERS = 4
+
+    # serverless-friendly startup: create the DynamoDB resource on first use, map solver matrices on first hint and
+    # build each length's daily schedule on first use
+    LAZY_STARTUP = True
+
+    # words and solver
+    WORDS_PATH = RESOURCES_DIR / 'words.txt'
+    # prebuilt, memory-mappable dictionary used instead of WORDS_PATH when it was built from the current WORDS_PATH
+    # (python -m app.build dictionary)
+    WORDS_BINARY_PATH = RESOURCES_DIR / 'words.bin'
+    # every word list compact games have been encoded against, keyed by fingerprint, so that they stay readable after
+    # words.txt changes (python -m app.build dictionary adds the current lists)
+    WORD_ARCHIVE_DIR = RESOURCES_DIR / 'word_archive'
+    # guess x solution pattern matrices for the hint solver, prebuilt and shipped (python -m app.build patterns); a missing
+    # or stale matrix is built in memory on first use
+    PATTERN_MATRIX_DIR = RESOURCES_DIR / 'patterns'
\ No newline at end of file
@@ -9,3 +9,12 @@ class HardModeViolationError(Exception):
 
 class InvalidGuessError(Exception):
     pass
+
+class GuessConflictError(Exception):
+    pass
+
+class ServiceUnavailableError(Exception):
+    pass
+
+class UnreadableGameError(Exception):
+    pass
@@ -0,0 +1,117 @@
+"""One-off migrations of the DynamoDB tables of an existing deployment.
+
+    python -m app.migrate created-at                # give games stored before created_at was recorded a created_at
+    python -m app.migrate users --target TABLE      # copy the users into a new table keyed by username
+"""
+import argparse
+
+from .config import Config
+from .models.wordle_models import LEGACY_CREATED_AT
+from .repositories.dynamodb import is_conditional_check_failure
+
+
+def backfill_created_at(table):
+    """Set created_at to LEGACY_CREATED_AT on every game without one, so that the user_id / created_at index, which
+    only holds items with a created_at, lists them. Each write is conditional on the game still having no created_at,
+    so running this while the app is serving (or more than once) is safe. Returns the number of games updated."""
+    from boto3.dynamodb.conditions import Attr
+
+    updated = 0
+    scan_kwargs = {'FilterExpression': Attr('created_at').not_exists(), 'ProjectionExpression': 'game_id'}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            try:
+                table.update_item(
+                    Key={'game_id': item['game_id']},
+                    UpdateExpression='SET created_at = :created_at',
+                    ConditionExpression='attribute_exists(game_id) AND attribute_not_exists(created_at)',
+                    ExpressionAttributeValues={':created_at': LEGACY_CREATED_AT}
+                )
+                updated += 1
+            except Exception as e:
+                # committed (and so given a created_at) since the scan read it
+                if not is_conditional_check_failure(e):
+                    raise
+        if 'LastEvaluatedKey' not in response:
+            return updated
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def user_table_definition(table_name, user_id_index):
+    """The create_table arguments of the user table UserRepository expects: keyed by username, with a global secondary
+    index on user_id."""
+    return {
+        'TableName': table_name,
+        'KeySchema': [{'AttributeName': 'username', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [
+            {'AttributeName': 'username', 'AttributeType': 'S'},
+            {'AttributeName': 'user_id', 'AttributeType': 'S'}
+        ],
+        'GlobalSecondaryIndexes': [{
+            'IndexName': user_id_index,
+            'KeySchema': [{'AttributeName': 'user_id', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        'BillingMode': 'PAY_PER_REQUEST'
+    }
+
+
+def copy_users(source, target):
+    """Copy every user from `source`, a user table with any key schema (tables created before users were keyed by
+    username are keyed by user_id), into `target`, one keyed by username. A user whose username is already in the
+    target is not overwritten, so the copy can be re-run, and duplicate usernames (possible in the old table, where
+    uniqueness was only checked by a scan) keep the first user copied. Returns the user_ids that were not copied."""
+    skipped = []
+    scan_kwargs = {}
+    while True:
+        response = source.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            try:
+                target.put_item(Item=item, ConditionExpression='attribute_not_exists(username)')
+            except Exception as e:
+                if not is_conditional_check_failure(e):
+                    raise
+                skipped.append(item['user_id'])
+        if 'LastEvaluatedKey' not in response:
+            return skipped
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def migrate_users(dynamodb, source_name, target_name, user_id_index):
+    """Create the target table if it doesn't exist yet and copy the users of the source table into it."""
+    existing = dynamodb.meta.client.list_tables()['TableNames']
+    if target_name not in existing:
+        dynamodb.create_table(**user_table_definition(target_name, user_id_index)).wait_until_exists()
+        print(f"created {target_name}")
+    return copy_users(dynamodb.Table(source_name), dynamodb.Table(target_name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.migrate', description='Migrate the DynamoDB tables of an existing deployment.')
+    parser.add_argument('--region', default=Config.DYNAMODB_REGION)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    created_at = commands.add_parser('created-at', help='give games stored before created_at was recorded a created_at')
+    created_at.add_argument('--table', default=Config.DYNAMODB_WORDLE_TABLE)
+
+    users = commands.add_parser('users', help='copy the users into a new table keyed by username, creating it if needed')
+    users.add_argument('--source', default=Config.DYNAMODB_USER_TABLE)
+    users.add_argument('--target', required=True, help='set DYNAMODB_USER_TABLE to this table once the copy is done')
+    users.add_argument('--user-id-index', default=Config.DYNAMODB_USER_ID_INDEX)
+
+    args = parser.parse_args(argv)
+    import boto3
+    dynamodb = boto3.resource('dynamodb', region_name=args.region)
+    if args.command == 'created-at':
+        updated = backfill_created_at(dynamodb.Table(args.table))
+        print(f"set created_at on {updated} games in {args.table}")
+    else:
+        skipped = migrate_users(dynamodb, args.source, args.target, args.user_id_index)
+        print(f"copied the users of {args.source} into {args.target}")
+        for user_id in skipped:
+            print(f"not copied, username already taken: user {user_id}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+from collections import Counter
+
+import numpy as np
+
+from .scoring import ABSENT, CORRECT, decode_pattern, letter_code
+
+
+class GuessConstraints:
+    """The GuessConstraints accumulate what a game's feedback has revealed about the solution.
+
+    greens: the letter known to be at each position (or None)
+    banned: letters known not to be at each position (yellows and absent letters where they were guessed)
+    min_counts: the fewest times a letter must appear, from its green and yellow marks within a single guess
+    max_counts: the most times a letter may appear, known once a guess marks one of its copies as absent
+
+    Checking a guess against the constraints costs O(letter_count), however long the game's history is."""
+    def __init__(self, length):
+        self.length = length
+        self.greens = [None] * length
+        self.banned = [set() for _ in range(length)]
+        self.min_counts = {}
+        self.max_counts = {}
+
+    def __repr__(self):
+        return f"GuessConstraints(greens={self.greens}, min_counts={self.min_counts}, max_counts={self.max_counts})"
+
+    @classmethod
+    def from_guesses(cls, length, guesses, codes):
+        constraints = cls(length)
+        for guess, code in zip(guesses, codes):
+            constraints.update(guess, code)
+        return constraints
+
+    def update(self, guess, code):
+        """Fold a scored guess into the constraints."""
+        marks = decode_pattern(code, len(guess))
+        marked = Counter(letter for letter, mark in zip(guess, marks) if mark != ABSENT)
+
+        for i, (letter, mark) in enumerate(zip(guess, marks)):
+            if mark == CORRECT:
+                self.greens[i] = letter
+            else:
+                self.banned[i].add(letter)
+            if mark == ABSENT:
+                self.max_counts[letter] = marked[letter]
+
+        for letter, count in marked.items():
+            if count > self.min_counts.get(letter, 0):
+                self.min_counts[letter] = count
+
+    def allows(self, guess):
+        """Return True if the guess is consistent with every piece of feedback seen so far."""
+        for i, letter in enumerate(guess):
+            if self.greens[i] is not None and letter != self.greens[i]:
+                return False
+            if letter in self.banned[i]:
+                return False
+
+        counts = Counter(guess)
+        for letter, count in self.min_counts.items():
+            if counts[letter] < count:
+                return False
+        for letter, count in self.max_counts.items():
+            if counts[letter] > count:
+                return False
+        return True
+
+    def candidate_mask(self, dictionary):
+        """Return a boolean mask over `dictionary.words_of_length(length)` marking the words that are still consistent."""
+        words = dictionary.encoded_words(self.length)
+        mask = np.ones(len(words), dtype=bool)
+
+        for i in range(self.length):
+            if self.greens[i] is not None:
+                mask &= words[:, i] == letter_code(self.greens[i])
+            if self.banned[i]:
+                mask &= ~np.isin(words[:, i], [letter_code(letter) for letter in self.banned[i]])
+
+        for letter in self.min_counts.keys() | self.max_counts.keys():
+            counts = (words == letter_code(letter)).sum(axis=1)
+            mask &= counts >= self.min_counts.get(letter, 0)
+            if letter in self.max_counts:
+                mask &= counts <= self.max_counts[letter]
+
+        return mask
+
+    def candidates(self, dictionary):
+        words = dictionary.words_of_length(self.length)
+        return [words[i] for i in np.flatnonzero(self.candidate_mask(dictionary))]
+
+    def count_candidates(self, dictionary):
+        return int(self.candidate_mask(dictionary).sum())
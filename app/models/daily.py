@@ -0,0 +1,63 @@
+import random
+from array import array
+from datetime import date, datetime, timezone
+
+
+class DailySchedule:
+    """Maps (date, letter count) to the day's puzzle through a seeded permutation of each length's words.
+
+    For every word length the schedule is a table of word indices, one per day from `epoch`. It walks a fresh seeded
+    shuffle of the length's words per cycle, so no word repeats until every word of that length has been used. The table
+    depends only on the seed and the dictionary, so every process computes the same schedule. Changing either one
+    reshuffles the whole schedule, past days included.
+
+    A puzzle id looks like '2026-10-18-5' (date and letter count). The schedule only picks the word when a game is
+    created; games store their solution next to the puzzle id, so a reshuffle never changes a game already started."""
+    def __init__(self, dictionary, seed, epoch=date(2024, 1, 1), days=3660):
+        self.dictionary = dictionary
+        self.seed = seed
+        self.epoch = epoch
+        self.days = days
+        self._tables = {}
+
+    def preload(self):
+        for length in self.dictionary.lengths():
+            self._table(length)
+
+    def _table(self, length):
+        table = self._tables.get(length)
+        if table is None:
+            count = len(self.dictionary.words_of_length(length))
+            table = array('I')
+            cycle = 0
+            while count and len(table) < self.days:
+                rng = random.Random(f'{self.seed}:{length}:{cycle}')
+                table.extend(rng.sample(range(count), min(count, self.days - len(table))))
+                cycle += 1
+            self._tables[length] = table
+        return table
+
+    def today(self, now=None):
+        return (now or datetime.now(timezone.utc)).date()
+
+    def puzzle_id(self, day, length):
+        """Return the id of the puzzle for the given day and word length. Raises ValueError outside the schedule."""
+        if not 0 <= (day - self.epoch).days < self.days:
+            raise ValueError(f"No daily puzzle is scheduled for {day.isoformat()}")
+        if not self._table(length):
+            raise ValueError(f"There are no words with {length} letters")
+        return f"{day.isoformat()}-{length}"
+
+    def solution(self, puzzle_id):
+        """Return the solution of a puzzle id from puzzle_id(). Raises ValueError for an unknown id."""
+        try:
+            day, length = puzzle_id.rsplit('-', 1)
+            offset = (date.fromisoformat(day) - self.epoch).days
+            length = int(length)
+        except (AttributeError, ValueError):
+            raise ValueError(f"Invalid puzzle id {puzzle_id!r}")
+
+        table = self._table(length)
+        if not 0 <= offset < len(table):
+            raise ValueError(f"Invalid puzzle id {puzzle_id!r}")
+        return self.dictionary.word_at(length, table[offset])
@@ -0,0 +1,187 @@
+"""Compact binary encoding of stored games (Config.COMPACT_STORAGE).
+
+A compact item keeps only the attributes that keys, indexes and conditional writes need (game_id, user_id, created_at,
+version, and puzzle_id for daily games) and packs the rest of the game into a single binary attribute, `game`:
+
+    byte 0      format version (FORMAT_VERSION)
+    byte 1      flags: SOLVED, SURRENDERED, HARD_MODE, NO_SOLUTION
+    byte 2      letter count
+    byte 3      guess count
+    bytes 4-7   fingerprint (CRC-32) of the dictionary's words of that length
+    bytes 8-19  the letter bank's used, present and in-position masks, little-endian uint32 each
+    then        the solution (unless NO_SOLUTION) and each guess as a little-endian uint16 index into the dictionary,
+                or with WORDS set, as their letters (letter count bytes each)
+
+NO_SOLUTION marks daily games written before they kept their solution; the schedule supplies it. Version 1 stored only
+the low 16 bits of the fingerprint (bytes 4-5, masks in bytes 6-17); such a game is decoded against the one known word
+list with those bits, and is unreadable if more than one has them.
+
+Word indices are only meaningful against the word list they were encoded with. `python -m app.build dictionary`
+archives each length's list under its fingerprint (archive_word_lists), and a game whose fingerprint isn't the current
+dictionary's is decoded against the archived list; its next commit re-encodes it against the current one. A game with a
+word the current dictionary can't index (e.g. one dropped from the list) is stored with WORDS. A game whose list isn't
+archived raises UnreadableGameError rather than being read as the wrong words.
+
+Items written before this format (separate attributes per field) still decode unchanged, and are rewritten in the
+compact format by their next commit (see LEGACY_FIELDS)."""
+import struct
+import zlib
+from pathlib import Path
+
+from ..errors import UnreadableGameError
+
+FORMAT_VERSION = 2
+
+SOLVED = 1
+SURRENDERED = 2
+HARD_MODE = 4
+NO_SOLUTION = 8
+WORDS = 16
+
+# attributes of the per-field item format that a compact write replaces with `game`
+LEGACY_FIELDS = ('solution', 'guesses', 'solved', 'surrendered', 'hard_mode', 'letters_used', 'letters_present', 'letters_in_position')
+
+_HEADER = struct.Struct('<BBBBIIII')
+_HEADER_V1 = struct.Struct('<BBBBHIII')
+_MAX_INDEX = 0xFFFF
+
+
+def fingerprint(words):
+    """Return the fingerprint of a length's sorted word list, as stored in the games encoded against it."""
+    return zlib.crc32('\n'.join(words).encode('utf-8'))
+
+
+def archive_path(directory, length, fingerprint):
+    return Path(directory) / f'{length}-{fingerprint:08x}.txt'
+
+
+def archived_fingerprints(directory, length):
+    """Return the fingerprints of the word lists of a length in the archive."""
+    return [int(path.stem.split('-')[1], 16) for path in Path(directory).glob(f'{length}-*.txt')]
+
+
+def archive_word_lists(dictionary, directory):
+    """Save each of the dictionary's word lists in the archive under its fingerprint, unless it is there already, so
+    games encoded against them can still be decoded after the word list changes. Returns the paths written."""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    written = []
+    for length in dictionary.lengths():
+        words = dictionary.words_of_length(length)
+        path = archive_path(directory, length, fingerprint(words))
+        if not path.exists():
+            path.write_text('\n'.join(words) + '\n', encoding='utf-8')
+            written.append(path)
+    return written
+
+
+def compact_item(wordle, game):
+    """Return the stored item for a game whose state is encoded as `game`."""
+    item = {"game_id": wordle.game_id, "user_id": wordle.user_id, "version": wordle.version, "game": game}
+    if wordle.created_at is not None:
+        item["created_at"] = wordle.created_at
+    if wordle.puzzle_id is not None:
+        item["puzzle_id"] = wordle.puzzle_id
+    return item
+
+
+class GameCodec:
+    """Encodes games against a WordDictionary, and decodes compact items back into the per-field item format, using
+    the word lists archived in `archive_dir` for games encoded against an earlier word list."""
+    def __init__(self, dictionary, archive_dir=None):
+        self.dictionary = dictionary
+        self.archive_dir = archive_dir
+        self._fingerprints = {}
+        self._archived = {}
+        self._archived_fingerprints = {}
+        self._decoders = {1: self._decode_v1, 2: self._decode_v2}
+
+    def encode(self, wordle):
+        length = len(wordle.solution)
+        flags = (SOLVED if wordle.solved else 0) | (SURRENDERED if wordle.surrendered else 0) | (HARD_MODE if wordle.hard_mode else 0)
+        words = (wordle.solution, *wordle.guesses)
+        indices = [self.dictionary.index_of(word) for word in words]
+        if None in indices or max(indices) > _MAX_INDEX:
+            flags |= WORDS
+            body = ''.join(words).encode('ascii')
+        else:
+            body = struct.pack(f'<{len(indices)}H', *indices)
+        bank = wordle.letter_bank
+        header = _HEADER.pack(FORMAT_VERSION, flags, length, len(wordle.guesses), self._fingerprint(length), bank.used, bank.present, bank.in_position)
+        return header + body
+
+    def encode_item(self, wordle):
+        return compact_item(wordle, self.encode(wordle))
+
+    def decode_item(self, item):
+        """Return the item in the per-field format. Items that aren't compact are returned as they are. The `game`
+        attribute is kept, so callers can tell that the game is stored compactly."""
+        if not item or 'game' not in item:
+            return item
+        # boto3's Table resource returns binary attributes wrapped in a Binary
+        game = bytes(getattr(item['game'], 'value', item['game']))
+        decode = self._decoders.get(game[0]) if game else None
+        if decode is None:
+            raise UnreadableGameError(f"Unknown game format version {game[0] if game else None} in game {item.get('game_id')}")
+        return {**item, **decode(game, item.get('game_id'))}
+
+    def _decode_v1(self, game, game_id):
+        return self._decode(game, game_id, _HEADER_V1, self._word_list_v1)
+
+    def _decode_v2(self, game, game_id):
+        return self._decode(game, game_id, _HEADER, self._word_list)
+
+    def _decode(self, game, game_id, header, word_list_of):
+        _, flags, length, guess_count, game_fingerprint, used, present, in_position = header.unpack_from(game)
+        if flags & WORDS:
+            letters = game[header.size:].decode('ascii')
+            words = [letters[start:start + length] for start in range(0, len(letters), length)]
+        else:
+            word_list = word_list_of(length, game_fingerprint, game_id)
+            words = [word_list[index] for index in struct.unpack_from(f'<{(len(game) - header.size) // 2}H', game, header.size)]
+
+        fields = {
+            "solved": bool(flags & SOLVED),
+            "surrendered": bool(flags & SURRENDERED),
+            "hard_mode": bool(flags & HARD_MODE),
+            "guesses": words[-guess_count:] if guess_count else [],
+            "letters_used": used,
+            "letters_present": present,
+            "letters_in_position": in_position,
+        }
+        if not flags & NO_SOLUTION:
+            fields["solution"] = words[0]
+        return fields
+
+    def _word_list(self, length, game_fingerprint, game_id):
+        """Return the word list a game was encoded against: the dictionary's, or the archived list with its fingerprint."""
+        if game_fingerprint == self._fingerprint(length):
+            return self.dictionary.words_of_length(length)
+        words = self._archived.get((length, game_fingerprint))
+        if words is None:
+            path = self.archive_dir and archive_path(self.archive_dir, length, game_fingerprint)
+            if not path or not path.exists():
+                raise UnreadableGameError(f"Game {game_id} was encoded against a word list that isn't archived")
+            words = tuple(path.read_text(encoding='utf-8').split())
+            self._archived[(length, game_fingerprint)] = words
+        return words
+
+    def _word_list_v1(self, length, short_fingerprint, game_id):
+        """Return the word list a version 1 game was encoded against, from the low 16 bits of its fingerprint."""
+        candidates = {self._fingerprint(length)}
+        if self.archive_dir:
+            if length not in self._archived_fingerprints:
+                self._archived_fingerprints[length] = archived_fingerprints(self.archive_dir, length)
+            candidates.update(self._archived_fingerprints[length])
+        candidates = [candidate for candidate in candidates if candidate & 0xFFFF == short_fingerprint]
+        if len(candidates) > 1:
+            raise UnreadableGameError(f"Game {game_id} was encoded against one of several word lists with the same fingerprint")
+        if not candidates:
+            raise UnreadableGameError(f"Game {game_id} was encoded against a word list that isn't archived")
+        return self._word_list(length, candidates[0], game_id)
+
+    def _fingerprint(self, length):
+        current = self._fingerprints.get(length)
+        if current is None:
+            current = fingerprint(self.dictionary.words_of_length(length))
+            self._fingerprints[length] = current
+        return current
@@ -0,0 +1,60 @@
+from .scoring import ABSENT, ALPHABET, CORRECT, decode_pattern
+
+_BITS = {letter: 1 << i for i, letter in enumerate(ALPHABET)}
+
+
+class LetterBank:
+    """The LetterBank tracks the state of each letter across a game's guesses as three 26-bit masks (bit 0 is 'a').
+
+    used: the letter appeared in a guess
+    present: the letter appeared in a guess and is in the solution
+    in_position: the letter was guessed in its correct position at least once"""
+    def __init__(self, used=0, present=0, in_position=0):
+        self.used = int(used)
+        self.present = int(present)
+        self.in_position = int(in_position)
+
+    def __repr__(self):
+        return f"LetterBank(used={self.used:#x}, present={self.present:#x}, in_position={self.in_position:#x})"
+
+    def __eq__(self, other):
+        return isinstance(other, LetterBank) and self.to_dict() == other.to_dict()
+
+    @classmethod
+    def from_guesses(cls, guesses, codes):
+        bank = cls()
+        for guess, code in zip(guesses, codes):
+            bank.update(guess, code)
+        return bank
+
+    def update(self, guess, code):
+        """Fold a scored guess into the masks."""
+        for letter, mark in zip(guess, decode_pattern(code, len(guess))):
+            bit = _BITS.get(letter)
+            if bit is None:
+                continue
+            self.used |= bit
+            if mark != ABSENT:
+                self.present |= bit
+            if mark == CORRECT:
+                self.in_position |= bit
+
+    def to_dict(self):
+        return {
+            "letters_used": self.used,
+            "letters_present": self.present,
+            "letters_in_position": self.in_position
+        }
+
+    def format(self):
+        """Expand the masks into the per-letter list returned by the API."""
+        alphabet = []
+        for letter, bit in _BITS.items():
+            used = bool(self.used & bit)
+            alphabet.append({
+                "letter": letter,
+                "used": used,
+                "in_position": bool(self.in_position & bit),
+                "in_solution": bool(self.present & bit) if used else None
+            })
+        return alphabet
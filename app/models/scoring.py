@@ -0,0 +1,169 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Feedback marks for a single letter. A pattern packs one mark per position into a base-3 integer, with position 0 as
+# the least significant digit, e.g. "crane" against "caper" scores [2, 1, 1, 0, 1] -> 2 + 3 + 9 + 81 = 95.
+ABSENT = 0
+PRESENT = 1
+CORRECT = 2
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# Map every byte to a small letter code: a-z -> 0..25, anything else (e.g. '-') -> its own code after that.
+_CODES = np.full(256, len(ALPHABET) + 1, dtype=np.uint8)
+_CODES[np.frombuffer(ALPHABET.encode('ascii'), dtype=np.uint8)] = np.arange(len(ALPHABET), dtype=np.uint8)
+_CODES[ord('-')] = len(ALPHABET)
+_NUM_CODES = len(ALPHABET) + 2
+
+CACHE_SIZE = 65536
+
+
+def encode_words(words, length=None):
+    """Encode words of equal length as a (len(words), length) uint8 array of letter codes."""
+    words = list(words)
+    if length is None:
+        length = len(words[0]) if words else 0
+    raw = np.frombuffer(''.join(words).encode('ascii', 'replace'), dtype=np.uint8)
+    return _CODES[raw].reshape(len(words), length)
+
+
+def letter_code(letter):
+    return int(encode_words([letter], 1)[0, 0])
+
+
+def pattern_dtype(length):
+    """Return the smallest unsigned dtype that can hold every pattern code for words of the given length."""
+    if length <= 5:
+        return np.uint8
+    if length <= 10:
+        return np.uint16
+    if length <= 20:
+        return np.uint32
+    return np.uint64
+
+
+def score_patterns(solution, guesses):
+    """Score many guesses against one solution in a single vectorized pass.
+
+    `solution` is a word or an encoded (length,) array and `guesses` a list of words or an encoded (n, length) array.
+    Returns an int64 array holding the base-3 pattern code of each guess."""
+    if isinstance(solution, str):
+        solution = encode_words([solution])[0]
+    if not isinstance(guesses, np.ndarray):
+        guesses = encode_words(guesses, len(solution))
+
+    count, length = guesses.shape
+    rows = np.arange(count)
+    correct = guesses == solution
+
+    # letters of the solution that were not matched exactly are still available for PRESENT marks
+    available = np.zeros((count, _NUM_CODES), dtype=np.int8)
+    for i in range(length):
+        available[:, solution[i]] += ~correct[:, i]
+
+    present = np.zeros_like(correct)
+    for i in range(length):
+        letters = guesses[:, i]
+        hit = ~correct[:, i] & (available[rows, letters] > 0)
+        present[:, i] = hit
+        available[rows[hit], letters[hit]] -= 1
+
+    marks = correct.astype(np.int64) * CORRECT + present
+    return marks @ (3 ** np.arange(length, dtype=np.int64))
+
+
+def pattern_matrix(guesses, solutions):
+    """Return the (len(guesses), len(solutions)) matrix of pattern codes for every guess/solution pair."""
+    if not isinstance(guesses, np.ndarray):
+        guesses = encode_words(guesses)
+    if not isinstance(solutions, np.ndarray):
+        solutions = encode_words(solutions)
+
+    matrix = np.empty((len(guesses), len(solutions)), dtype=pattern_dtype(guesses.shape[1]))
+    for j, solution in enumerate(solutions):
+        matrix[:, j] = score_patterns(solution, guesses)
+    return matrix
+
+
+def decode_pattern(code, length):
+    """Split a pattern code back into its per-position marks."""
+    marks = []
+    for _ in range(length):
+        code, mark = divmod(code, 3)
+        marks.append(mark)
+    return marks
+
+
+def pattern_string(code, length):
+    """Render a pattern code as one digit per position, in guess order: 0 absent, 1 present, 2 correct."""
+    return ''.join(str(mark) for mark in decode_pattern(code, length))
+
+
+def encode_pattern(marks):
+    code = 0
+    for mark in reversed(marks):
+        code = code * 3 + mark
+    return code
+
+
+class _PatternCache:
+    """A bounded LRU cache of pattern codes keyed on (solution, guess)."""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            code = self._entries.get(key)
+            if code is not None:
+                self._entries.move_to_end(key)
+            return code
+
+    def put(self, key, code):
+        with self._lock:
+            self._entries[key] = code
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = _PatternCache(CACHE_SIZE)
+
+
+def feedback_codes(solution, guesses):
+    """Return the pattern code of each guess against the solution.
+
+    Codes are looked up in the shared LRU cache first and all misses are scored together in one vectorized pass."""
+    codes = [_cache.get((solution, guess)) for guess in guesses]
+    misses = [i for i, code in enumerate(codes) if code is None]
+
+    if misses:
+        scored = score_patterns(solution, [guesses[i] for i in misses])
+        for i, code in zip(misses, scored.tolist()):
+            codes[i] = code
+            _cache.put((solution, guesses[i]), code)
+
+    return codes
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def feedback_code(solution, guess):
+    return feedback_codes(solution, [guess])[0]
+
+
+def format_feedback(guess, code):
+    """Expand a pattern code into the per-letter dicts used by the API."""
+    return [
+        {"letter": letter, "in_solution": mark != ABSENT, "correct_position": mark == CORRECT}
+        for letter, mark in zip(guess, decode_pattern(code, len(guess)))
+    ]
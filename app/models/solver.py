@@ -0,0 +1,116 @@
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .scoring import pattern_matrix
+
+logger = logging.getLogger(__name__)
+
+
+class WordleSolver:
+    """The WordleSolver suggests the guess with the highest expected information gain.
+
+    For each word length it uses a guess x solution matrix of feedback pattern codes over the dictionary's per-length word
+    index. Matrices are built ahead of time (python -m app.build patterns) and shipped as .npy files in `matrix_dir`,
+    which are memory-mapped read-only so worker processes on the same host share a single copy through the page cache.
+    A missing or stale matrix is built in memory on first use and kept for the life of the process; the package
+    directory may be read-only, so nothing is written at request time."""
+    def __init__(self, dictionary, matrix_dir):
+        self.dictionary = dictionary
+        self.matrix_dir = Path(matrix_dir)
+        self._matrices = {}
+        self._openers = {}
+        self._locks = {}
+
+    def matrix_path(self, length):
+        return self.matrix_dir / f'patterns_{length}.npy'
+
+    def preload(self):
+        """Memory-map every matrix that has already been built. Missing matrices are built in memory on first use."""
+        for length in self.dictionary.lengths():
+            if self.matrix_path(length).exists():
+                self.matrix(length)
+
+    def build(self, length):
+        """Compute the matrix for a word length and write it to disk."""
+        matrix = self.compute(length)
+
+        self.matrix_dir.mkdir(parents=True, exist_ok=True)
+        path = self.matrix_path(length)
+        tmp_path = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npy')
+        np.save(tmp_path, matrix)
+        os.replace(tmp_path, path)
+
+    def compute(self, length):
+        words = self.dictionary.encoded_words(length)
+        return pattern_matrix(words, words)
+
+    def matrix(self, length):
+        matrix = self._matrices.get(length)
+        if matrix is not None:
+            return matrix
+
+        # one lock per length, so building a missing matrix doesn't hold up hints for other lengths
+        with self._locks.setdefault(length, threading.Lock()):
+            matrix = self._matrices.get(length)
+            if matrix is None:
+                count = len(self.dictionary.words_of_length(length))
+                path = self.matrix_path(length)
+                if path.exists():
+                    matrix = np.load(path, mmap_mode='r')
+                # a matrix built from a different word list is stale
+                if matrix is None or matrix.shape != (count, count):
+                    logger.warning("Pattern matrix %s is missing or stale; building it in memory (run python -m app.build patterns)", path)
+                    matrix = self.compute(length)
+                self._matrices[length] = matrix
+        return matrix
+
+    def suggest(self, constraints, hard_mode=False):
+        """Return (guess, expected_bits, candidates_remaining) for the position described by the constraints.
+
+        In hard mode only guesses that are still consistent with the feedback are considered. Returns None if no word
+        in the dictionary is consistent with the feedback."""
+        length = constraints.length
+        words = self.dictionary.words_of_length(length)
+        candidates = np.flatnonzero(constraints.candidate_mask(self.dictionary))
+
+        if len(candidates) == 0:
+            return None
+        if len(candidates) <= 2:
+            return words[candidates[0]], float(len(candidates) - 1), len(candidates)
+
+        # the opening move only depends on the word length
+        opening = len(candidates) == len(words)
+        if opening and length in self._openers:
+            return self._openers[length]
+
+        guesses = candidates if hard_mode else np.arange(len(words))
+        patterns = np.asarray(self.matrix(length)[np.ix_(guesses, candidates)])
+        entropy = _row_entropy(patterns)
+
+        # prefer guesses that could win outright when the information gain is close
+        score = entropy + np.isin(guesses, candidates) / len(candidates)
+        best = int(np.argmax(score))
+        suggestion = (words[guesses[best]], float(entropy[best]), len(candidates))
+
+        if opening:
+            self._openers[length] = suggestion
+        return suggestion
+
+
+def _row_entropy(patterns):
+    """Return the Shannon entropy (in bits) of the pattern distribution in each row."""
+    rows, cols = patterns.shape
+    patterns = np.sort(patterns, axis=1)
+
+    starts = np.ones((rows, cols), dtype=bool)
+    starts[:, 1:] = patterns[:, 1:] != patterns[:, :-1]
+    starts = np.flatnonzero(starts)
+
+    bucket_sizes = np.diff(np.append(starts, rows * cols)).astype(np.float64)
+    weighted = np.bincount(starts // cols, weights=bucket_sizes * np.log2(bucket_sizes), minlength=rows)
+    return np.log2(cols) - weighted / cols
+
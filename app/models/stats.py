@@ -0,0 +1,84 @@
+"""Per-user statistics and per-letter-count leaderboards, maintained incrementally as games end.
+
+A user's statistics are a flat dict of integer counters, so that every storage backend can add to them atomically:
+
+    played, won, lost, surrendered          games finished, by outcome
+    played_<n>, won_<n>, won_guesses_<n>    the same per letter count n, plus the guesses taken over the wins
+    distribution_<g>                        games won in g guesses
+    current_streak, max_streak              consecutive wins (maintained by the backend)
+
+A leaderboard is a short list of entries {"user_id", "won", "guesses"}, ranked by wins and then by fewest guesses per
+win. An entry is offered to the leaderboard whenever its user wins a game of that letter count."""
+
+OUTCOMES = ('won', 'lost', 'surrendered')
+
+
+def game_outcome(wordle):
+    """Return how a finished game ended: 'won', 'surrendered' or 'lost' (out of guesses)."""
+    if wordle.solved:
+        return 'won'
+    return 'surrendered' if wordle.surrendered else 'lost'
+
+
+def result_counters(outcome, letter_count, guess_count):
+    """Return the counter increments for a game that ended with `outcome` after `guess_count` guesses."""
+    counters = {'played': 1, outcome: 1, f'played_{letter_count}': 1}
+    if outcome == 'won':
+        counters[f'distribution_{guess_count}'] = 1
+        counters[f'won_{letter_count}'] = 1
+        counters[f'won_guesses_{letter_count}'] = guess_count
+    return counters
+
+
+def leaderboard_entry(user_id, stats, letter_count):
+    return {'user_id': user_id, 'won': stats.get(f'won_{letter_count}', 0), 'guesses': stats.get(f'won_guesses_{letter_count}', 0)}
+
+
+def _rank(entry):
+    return (-entry['won'], entry['guesses'] / entry['won'] if entry['won'] else 0.0, entry['user_id'])
+
+
+def leaderboard_insert(entries, entry, size):
+    """Return the leaderboard with the user's entry added or replaced and cut to `size` entries, or None if that
+    doesn't change it (the entry didn't make the cut, or is already there as it is)."""
+    others = [other for other in entries if other['user_id'] != entry['user_id']]
+    updated = sorted(others + [entry], key=_rank)[:size]
+    return None if updated == entries else updated
+
+
+def _suffixed(stats, prefix):
+    return {int(name[len(prefix):]): value for name, value in stats.items() if name.startswith(prefix) and name[len(prefix):].isdigit()}
+
+
+def format_stats(stats):
+    """Format a user's counters for GET /stats."""
+    played = stats.get('played', 0)
+    won = stats.get('won', 0)
+    won_by_length = _suffixed(stats, 'won_')
+    guesses_by_length = _suffixed(stats, 'won_guesses_')
+    return {
+        "played": played,
+        "won": won,
+        "lost": stats.get('lost', 0),
+        "surrendered": stats.get('surrendered', 0),
+        "win_rate": won / played if played else 0.0,
+        "current_streak": stats.get('current_streak', 0),
+        "max_streak": stats.get('max_streak', 0),
+        "guess_distribution": {str(guesses): count for guesses, count in sorted(_suffixed(stats, 'distribution_').items())},
+        "letter_counts": {
+            str(letter_count): {
+                "played": count,
+                "won": won_by_length.get(letter_count, 0),
+                "average_guesses": guesses_by_length.get(letter_count, 0) / won_by_length[letter_count] if won_by_length.get(letter_count) else None,
+            }
+            for letter_count, count in sorted(_suffixed(stats, 'played_').items())
+        },
+    }
+
+
+def format_leaderboard(entries):
+    """Format a leaderboard's entries for GET /leaderboard."""
+    return [
+        {"rank": rank, "user_id": entry['user_id'], "won": entry['won'], "average_guesses": entry['guesses'] / entry['won']}
+        for rank, entry in enumerate(entries, 1)
+    ]
@@ -1,6 +1,7 @@
 import uuid
 import bcrypt
 import base64
+from .views import UserView
 
 class User:
     """The User class enables creating a user with a username and password, and generating a user_id to associate a user with their Wordle games."""
@@ -22,6 +23,10 @@ class User:
             "user_id": self.user_id
         }
     
+    def view(self):
+        """The user as returned by the API, without the password hash."""
+        return UserView(self.user_id, self.username)
+
     def get_user_id(self):
         return self.user_id
     
@@ -36,19 +41,27 @@ class User:
         return User(user_dict['username'], user_dict['hashed_password'], user_dict['user_id'])
    
     @staticmethod
-    def hash_password(password):
-        """Returns a hashed password for storing."""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    def hash_password(password, rounds=12):
+        """Returns a hashed password for storing. `rounds` is the bcrypt work factor."""
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds))
 
     @classmethod
-    def create_new_user(cls, username, password):
+    def create_new_user(cls, username, password, rounds=12):
         """Hashes the password and returns a new User instance."""
-        hashed_password = cls.hash_password(password)
+        hashed_password = cls.hash_password(password, rounds)
         return cls(username, hashed_password)
 
     @staticmethod
     def verify_password(stored_hashed_password, provided_password):
         """Verifies if the provided password matches the stored hashed password."""
+        hashed_password_bytes = User.hashed_password_bytes(stored_hashed_password)
+
+        # Verify the provided password against the stored hash
+        return bcrypt.checkpw(provided_password.encode('utf-8'), hashed_password_bytes)
+
+    @staticmethod
+    def hashed_password_bytes(stored_hashed_password):
+        """Returns the stored hashed password as bytes, whichever form it was stored in."""
         # Check if stored_hashed_password is a Binary object or a base64 string
         if hasattr(stored_hashed_password, 'value'):
             # Assuming .value is the correct attribute for accessing the Binary content
@@ -60,7 +73,6 @@ class User:
             # If already in bytes, no action needed
             hashed_password_bytes = stored_hashed_password
 
-        # Verify the provided password against the stored hash
-        return bcrypt.checkpw(provided_password.encode('utf-8'), hashed_password_bytes)
+        return hashed_password_bytes
 
 
@@ -0,0 +1,87 @@
+"""Read-only response representations of games and users.
+
+The views are frozen dataclasses that a JSON provider serializes directly: orjson encodes dataclasses natively, and the
+stdlib provider in utils/json_provider.py encodes their attributes without copying them into dicts first. Fields are
+declared in alphabetical order so the output matches the sorted keys of the dict-based formats.
+
+The per-letter parts of a game repeat constantly (the same guess scored the same way, the same letter bank masks), so
+they are built once and shared. The views deliberately don't use __slots__: orjson's fast path for dataclasses reads the
+instance __dict__, and slotted instances encode several times slower."""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from .scoring import ABSENT, ALPHABET, CORRECT, decode_pattern
+
+
+@dataclass(frozen=True)
+class LetterFeedback:
+    correct_position: bool
+    in_solution: bool
+    letter: str
+
+
+@dataclass(frozen=True)
+class LetterState:
+    in_position: bool
+    in_solution: Optional[bool]
+    letter: str
+    used: bool
+
+
+@dataclass(frozen=True)
+class GameView:
+    """The same fields as Wordle.return_format()."""
+    created_at: Optional[str]
+    game_id: str
+    game_over: bool
+    guesses: Tuple[str, ...]
+    guesses_formatted: Tuple[Tuple[LetterFeedback, ...], ...]
+    guesses_remaining: int
+    letter_bank: Tuple[LetterState, ...]
+    letter_count: int
+    puzzle_id: Optional[str]
+    solution: Optional[str]
+    solved: bool
+    surrendered: bool
+    user_id: str
+
+
+@dataclass(frozen=True)
+class UserView:
+    """A user without their password hash."""
+    user_id: str
+    username: str
+
+
+@lru_cache(maxsize=65536)
+def letter_feedback(guess, code):
+    """The view equivalent of scoring.format_feedback."""
+    return tuple(
+        _letter_feedback(letter, mark)
+        for letter, mark in zip(guess, decode_pattern(code, len(guess)))
+    )
+
+
+@lru_cache(maxsize=None)
+def _letter_feedback(letter, mark):
+    return LetterFeedback(mark == CORRECT, mark != ABSENT, letter)
+
+
+@lru_cache(maxsize=4096)
+def _letter_states(used, present, in_position):
+    states = []
+    for i, letter in enumerate(ALPHABET):
+        letter_used = bool(used >> i & 1)
+        states.append(_letter_state(letter, letter_used, bool(in_position >> i & 1), bool(present >> i & 1) if letter_used else None))
+    return tuple(states)
+
+
+@lru_cache(maxsize=None)
+def _letter_state(letter, used, in_position, in_solution):
+    return LetterState(in_position, in_solution, letter, used)
+
+
+def letter_states(letter_bank):
+    """The view equivalent of LetterBank.format."""
+    return _letter_states(letter_bank.used, letter_bank.present, letter_bank.in_position)
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import mmap
+import random
+import struct
+
+from .scoring import encode_words
+
+# Layout of the prebuilt binary dictionary (resources/words.bin), all integers little endian:
+#   header:  magic b'WDIC', format version (u8), number of length buckets (u16), SHA-256 of the source word list
+#   buckets: one (length u16, count u32, offset u32, size u32) entry per bucket, ordered by length
+#   data:    each bucket's sorted words as a newline-separated UTF-8 block of `size` bytes at `offset`
+BINARY_MAGIC = b'WDIC'
+BINARY_VERSION = 2
+_HEADER = struct.Struct('<4sBH32s')
+_BUCKET = struct.Struct('<HIII')
+
+logger = logging.getLogger(__name__)
+
+
+def source_digest(path):
+    """Return the SHA-256 of a word list file, as recorded in the binary dictionary built from it."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+class WordDictionary:
+    """The WordDictionary indexes the word list once so that guesses can be validated and solutions picked in constant time.
+
+    Words are normalized to lowercase and bucketed by length. Each bucket keeps a hash set for membership checks and a
+    sorted tuple that doubles as the per-length word index (random picks, word <-> index lookups).
+
+    A dictionary loaded with from_binary memory-maps the prebuilt artifact and only decodes a bucket the first time a word
+    of that length is needed, which keeps cold starts cheap."""
+    def __init__(self, words=()):
+        buckets = {}
+        for word in words:
+            word = word.strip().lower()
+            if word:
+                buckets.setdefault(len(word), set()).add(word)
+
+        self._arrays = {length: tuple(sorted(bucket)) for length, bucket in buckets.items()}
+        self._counts = {length: len(bucket) for length, bucket in buckets.items()}
+        self._sets = {}
+        self._indexes = {}
+        self._encoded = {}
+        # (offset, size) of each bucket in the memory-mapped artifact, for dictionaries loaded with from_binary
+        self._blocks = {}
+        self._buffer = None
+
+    def __repr__(self):
+        return f"WordDictionary(words={len(self)}, lengths={self.lengths()})"
+
+    def __contains__(self, word):
+        if len(word) not in self._counts:
+            return False
+        bucket = self._sets.get(len(word))
+        if bucket is None:
+            bucket = frozenset(self.words_of_length(len(word)))
+            self._sets[len(word)] = bucket
+        return word.lower() in bucket
+
+    def __len__(self):
+        return sum(self._counts.values())
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a dictionary from a text file with one word per line."""
+        with open(path, 'r') as f:
+            return cls(f.read().splitlines())
+
+    @classmethod
+    def load(cls, words_path, binary_path):
+        """Load the word list, from the prebuilt binary dictionary if it was built from the current text file. A missing,
+        outdated or stale artifact (words.txt edited since the last `python -m app.build dictionary`) is ignored and the
+        text file parsed instead, so edits to the word list always take effect."""
+        if not binary_path.exists():
+            return cls.from_file(words_path)
+        if not words_path.exists():
+            return cls.from_binary(binary_path)
+        try:
+            return cls.from_binary(binary_path, source_digest(words_path))
+        except ValueError as e:
+            logger.warning("%s; loading %s instead", e, words_path)
+            return cls.from_file(words_path)
+
+    @classmethod
+    def from_binary(cls, path, expected_digest=None):
+        """Memory-map a dictionary written by to_binary. If expected_digest is given, the dictionary must have been built
+        from a word list with that SHA-256, else ValueError is raised."""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, bucket_count, digest = _HEADER.unpack_from(buffer, 0) if len(buffer) >= _HEADER.size else (None, None, 0, None)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            buffer.close()
+            raise ValueError(f"{path} is not a version {BINARY_VERSION} word dictionary")
+        if expected_digest is not None and digest != expected_digest:
+            buffer.close()
+            raise ValueError(f"{path} was built from a different word list")
+
+        dictionary = cls()
+        dictionary._buffer = buffer
+        for i in range(bucket_count):
+            length, count, offset, size = _BUCKET.unpack_from(buffer, _HEADER.size + i * _BUCKET.size)
+            dictionary._counts[length] = count
+            dictionary._blocks[length] = (offset, size)
+        return dictionary
+
+    def to_binary(self, path, digest=bytes(32)):
+        """Write the dictionary in the compact format read by from_binary, recording the SHA-256 of the word list it was
+        built from."""
+        lengths = self.lengths()
+        blocks = [b'\n'.join(word.encode('utf-8') for word in self.words_of_length(length)) for length in lengths]
+
+        offset = _HEADER.size + _BUCKET.size * len(lengths)
+        header = [_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(lengths), digest)]
+        for length, block in zip(lengths, blocks):
+            header.append(_BUCKET.pack(length, self._counts[length], offset, len(block)))
+            offset += len(block)
+
+        with open(path, 'wb') as f:
+            f.write(b''.join(header + blocks))
+
+    def lengths(self):
+        return sorted(self._counts)
+
+    def words_of_length(self, length):
+        """Return the sorted words of the given length. The position of a word in this tuple is its index."""
+        words = self._arrays.get(length)
+        if words is None:
+            if length not in self._blocks:
+                return ()
+            offset, size = self._blocks[length]
+            words = tuple(self._buffer[offset:offset + size].decode('utf-8').split('\n'))
+            self._arrays[length] = words
+        return words
+
+    def random_word(self, length):
+        return random.choice(self.words_of_length(length))
+
+    def index_of(self, word):
+        """Return the index of the word within its length bucket, or None if the word is unknown."""
+        word = word.lower()
+        index = self._indexes.get(len(word))
+        if index is None:
+            index = {w: i for i, w in enumerate(self.words_of_length(len(word)))}
+            self._indexes[len(word)] = index
+        return index.get(word)
+
+    def word_at(self, length, index):
+        return self.words_of_length(length)[index]
+
+    def encoded_words(self, length):
+        """Return the words of the given length as a (count, length) array of letter codes, in index order."""
+        encoded = self._encoded.get(length)
+        if encoded is None:
+            encoded = encode_words(self.words_of_length(length), length)
+            self._encoded[length] = encoded
+        return encoded
+
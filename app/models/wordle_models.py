@@ -1,8 +1,16 @@
-import random
+from datetime import datetime, timezone
+from .letter_bank import LetterBank
+from .constraints import GuessConstraints
+from .scoring import ALPHABET, feedback_code, feedback_codes, format_feedback, pattern_string
+from .views import GameView, letter_feedback, letter_states
 from ..errors import GameOverError, GuessAlreadyMadeError, HardModeViolationError, InvalidGuessError
 
+# created_at given to games stored before it was recorded (python -m app.migrate created-at, or their next write), so that
+# they sort as the oldest in a user's history
+LEGACY_CREATED_AT = '1970-01-01T00:00:00.000+00:00'
+
 class Wordle():
-    def __init__(self, game_id, user_id, solution, guesses, solved, surrendered, hard_mode=False):
+    def __init__(self, game_id, user_id, solution, guesses, solved, surrendered, hard_mode=False, letter_bank=None, created_at=None, version=0, puzzle_id=None):
         self.game_id = game_id
         self.user_id = user_id
         self.solution = solution
@@ -10,6 +18,17 @@ class Wordle():
         self.solved = solved
         self.surrendered = surrendered
         self.hard_mode = hard_mode
+        # games stored before the letter bank was persisted rebuild it from their guesses
+        if letter_bank is None:
+            letter_bank = LetterBank.from_guesses(guesses, feedback_codes(solution, guesses))
+        self.letter_bank = letter_bank
+        self._constraints = None
+        # ISO 8601 UTC timestamp, used to sort a user's game history
+        self.created_at = created_at
+        # incremented on every write so that stale copies of the game can be detected
+        self.version = int(version)
+        # daily games store the DailySchedule puzzle id instead of the solution, which is looked up when the game is read
+        self.puzzle_id = puzzle_id
 
     def __repr__(self):
         return f"Wordle(game_id={self.game_id}, user_id={self.user_id}, solution={self.solution}, guesses={self.guesses}, solved={self.solved}, surrendered={self.surrendered}, hard_mode={self.hard_mode})"
@@ -18,24 +37,34 @@ class Wordle():
         return f"Wordle(game_id={self.game_id}, user_id={self.user_id}, solution={self.solution}, guesses={self.guesses}, solved={self.solved}, surrendered={self.surrendered}, hard_mode={self.hard_mode})"
 
     def to_dict(self):
-        return {
+        wordle_dict = {
             "game_id": self.game_id,
             "user_id": self.user_id,
             "solution": self.solution,
             "guesses": self.guesses,
             "solved": self.solved,
             "surrendered": self.surrendered,
-            "hard_mode": self.hard_mode
+            "hard_mode": self.hard_mode,
+            "version": self.version,
+            **self.letter_bank.to_dict()
         }
+        # games stored before created_at was recorded don't have one
+        if self.created_at is not None:
+            wordle_dict["created_at"] = self.created_at
+        if self.puzzle_id is not None:
+            wordle_dict["puzzle_id"] = self.puzzle_id
+        return wordle_dict
     
     @staticmethod
     def from_dict(wordle_dict):
         if not wordle_dict:
             return None
-        
-        print(wordle_dict)
 
-        return Wordle(wordle_dict['game_id'], wordle_dict['user_id'], wordle_dict['solution'], wordle_dict['guesses'], wordle_dict['solved'], wordle_dict['surrendered'], wordle_dict['hard_mode'])
+        letter_bank = None
+        if 'letters_used' in wordle_dict:
+            letter_bank = LetterBank(wordle_dict['letters_used'], wordle_dict['letters_present'], wordle_dict['letters_in_position'])
+
+        return Wordle(wordle_dict['game_id'], wordle_dict['user_id'], wordle_dict['solution'], wordle_dict['guesses'], wordle_dict['solved'], wordle_dict['surrendered'], wordle_dict['hard_mode'], letter_bank, wordle_dict.get('created_at'), wordle_dict.get('version', 0), wordle_dict.get('puzzle_id'))
 
     def return_format(self):
         return {
@@ -50,9 +79,58 @@ class Wordle():
             "guesses_remaining": self.get_guesses_remaining(),
             "solved": self.solved,
             "surrendered": self.surrendered,
-            "game_over": self.is_game_over()
+            "game_over": self.is_game_over(),
+            "created_at": self.created_at,
+            "puzzle_id": self.puzzle_id
+        }
+
+    def view(self):
+        """return_format() as a GameView, which JSON providers serialize without building a dict per letter."""
+        game_over = self.is_game_over()
+        codes = feedback_codes(self.solution, self.guesses)
+        return GameView(
+            created_at=self.created_at,
+            game_id=self.game_id,
+            game_over=game_over,
+            guesses=tuple(self.guesses),
+            guesses_formatted=tuple(letter_feedback(guess, code) for guess, code in zip(self.guesses, codes)),
+            guesses_remaining=self.get_guesses_remaining(),
+            letter_bank=letter_states(self.letter_bank),
+            letter_count=len(self.solution),
+            puzzle_id=self.puzzle_id,
+            solution=self.solution if game_over else None,
+            solved=self.solved,
+            surrendered=self.surrendered,
+            user_id=self.user_id
+        )
+
+    def compact_format(self):
+        """A smaller alternative to return_format for clients that decode feedback themselves: each guess's feedback is a
+        pattern string (one digit per letter: 0 absent, 1 present, 2 correct) and the letter bank is its three 26-bit
+        masks (bit 0 is 'a')."""
+        length = len(self.solution)
+        return {
+            "game_id": self.game_id,
+            "user_id": self.user_id,
+            "solution": self.solution if self.is_game_over() else None,
+            "guesses": self.guesses,
+            "feedback": [pattern_string(code, length) for code in feedback_codes(self.solution, self.guesses)],
+            "letter_bank": self.letter_bank.to_dict(),
+            "letter_count": length,
+            "guesses_remaining": self.get_guesses_remaining(),
+            "solved": self.solved,
+            "surrendered": self.surrendered,
+            "game_over": self.is_game_over(),
+            "created_at": self.created_at,
+            "puzzle_id": self.puzzle_id
         }
 
+    @staticmethod
+    def etag(wordle_dict):
+        """Return an entity tag for a stored game, computed from the item without building the Wordle. Every write bumps
+        the version, and games written before versioning still change their guess count or surrendered flag."""
+        return f"{wordle_dict.get('version', 0)}-{len(wordle_dict['guesses'])}-{int(bool(wordle_dict['surrendered']))}"
+
     def is_game_over(self):
         return self.solved or self.surrendered or (len(self.solution) + 1 - len(self.guesses) == 0)
 
@@ -62,30 +140,8 @@ class Wordle():
         return len(self.solution) + 1 - len(self.guesses)
 
     def get_formatted_guesses(self):
-        formatted_guesses = []
-        for guess in self.guesses:
-            formatted_guess = []
-            solution_letters = list(self.solution)  # Create a mutable list of solution letters
-            
-            # First pass: Mark correct positions
-            for i, letter in enumerate(guess):
-                if letter == solution_letters[i]:
-                    formatted_guess.append({"letter": letter, "in_solution": True, "correct_position": True})
-                    solution_letters[i] = None  # Remove from consideration for 'present' marking
-                else:
-                    formatted_guess.append({"letter": letter, "in_solution": False, "correct_position": False})
-
-            # Second pass: Mark present but in wrong position, avoiding double-counting
-            for i, entry in enumerate(formatted_guess):
-                letter = guess[i]
-                if not entry['correct_position'] and letter in solution_letters:
-                    formatted_guess[i]["in_solution"] = True
-                    formatted_guess[i]["correct_position"] = False  # Redundant but clarifies logic
-                    solution_letters[solution_letters.index(letter)] = None  # Mark as used
-            
-            formatted_guesses.append(formatted_guess)
-        return formatted_guesses
-
+        codes = feedback_codes(self.solution, self.guesses)
+        return [format_feedback(guess, code) for guess, code in zip(self.guesses, codes)]
 
     def get_formatted_alphabet(self):
         """Return the alphabet as a list of objects with the following format:
@@ -93,48 +149,55 @@ class Wordle():
             "letter": "a",
             "used": True | False,
             "in_solution": True | False | None,
-            "in_position": True | False | None
+            "in_position": True | False
         }
-        If the letter is used and in the solution, it's marked as True. If it's used and not in the solution, it's marked as False. If it's not used, it's marked as None. Any letters ."""
-        alphabet = []
-        for letter in "abcdefghijklmnopqrstuvwxyz":
-            alphabet.append({"letter": letter, "used": letter in self.get_used_letters(), "in_position": letter in self.get_correct_positions()})
-
-        for letter in alphabet:
-            if letter["used"]:
-                if letter["letter"] in self.solution:
-                    letter["in_solution"] = True
-                else:
-                    letter["in_solution"] = False
-            else:
-                letter["in_solution"] = None
-
-        return alphabet
+        If the letter is used and in the solution, it's marked as True. If it's used and not in the solution, it's marked as False. If it's not used, it's marked as None.
+        The values are read from the game's letter bank, which is kept up to date as guesses are made."""
+        return self.letter_bank.format()
+
+    @property
+    def constraints(self):
+        """The GuessConstraints implied by the guesses so far, built on first use and then kept up to date by add_guess."""
+        if self._constraints is None:
+            self._constraints = GuessConstraints.from_guesses(len(self.solution), self.guesses, feedback_codes(self.solution, self.guesses))
+        return self._constraints
+
+    def add_guess(self, guess):
+        """Record a validated guess, updating the letter bank, the constraints and the solved flag."""
+        code = feedback_code(self.solution, guess)
+        self.guesses.append(guess)
+        self.letter_bank.update(guess, code)
+        if self._constraints is not None:
+            self._constraints.update(guess, code)
+        if guess == self.solution:
+            self.solved = True
 
     def get_used_letters(self):
-        return sorted(list(set(''.join(self.guesses))))
+        return [letter for i, letter in enumerate(ALPHABET) if self.letter_bank.used >> i & 1]
     
-    # create a method to see what letters are in the solution and in the right position in any of the guesses
+    # letters that are in the solution and in the right position in any of the guesses
     def get_correct_positions(self):
-        # correct positions will be a set of letters that are in the solution and in the correct position in any of the guesses
-        correct_positions = set()
-
-        for guess in self.guesses:
-            for i, letter in enumerate(guess):
-                if letter == self.solution[i]:
-                    correct_positions.add(letter)
-
-        return sorted(list(correct_positions))
+        return [letter for i, letter in enumerate(ALPHABET) if self.letter_bank.in_position >> i & 1]
     
 
 class WordleHelper:
     @staticmethod
     def generate_wordle(game_id, user_id, words, letter_count, hard_mode):
-        # make a random choice from the list of words where the length of the word is equal to the letter_count
-        solution = random.choice([word for word in words if len(word) == letter_count])
+        # pick a random word from the dictionary's bucket of words with the requested letter_count
+        solution = words.random_word(letter_count)
+
+        created_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
 
-        return Wordle(game_id, user_id, solution, [], False, False, hard_mode)
+        return Wordle(game_id, user_id, solution, [], False, False, hard_mode, created_at=created_at)
     
+    @staticmethod
+    def generate_daily_wordle(game_id, user_id, schedule, puzzle_id, hard_mode):
+        solution = schedule.solution(puzzle_id)
+
+        created_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+
+        return Wordle(game_id, user_id, solution, [], False, False, hard_mode, created_at=created_at, puzzle_id=puzzle_id)
+
     @staticmethod
     def surrender_game(wordle):
         if wordle.is_game_over():
@@ -156,17 +219,13 @@ class WordleHelper:
         if len(guess) != len(wordle.solution):
             raise InvalidGuessError("Invalid guess")
         
-        if wordle.hard_mode and len(wordle.guesses) > 0:
-            last_guess = wordle.get_formatted_guesses()[-1]
-            for i, letter in enumerate(guess):
-                if last_guess[i]['correct_position'] and letter != last_guess[i]['letter']:
-                    raise HardModeViolationError("Hard mode violation")
+        # in hard mode every guess must be consistent with all of the feedback given so far
+        if wordle.hard_mode and len(wordle.guesses) > 0 and not wordle.constraints.allows(guess):
+            raise HardModeViolationError("Hard mode violation")
 
         if guess not in words:
             raise InvalidGuessError("Invalid guess")
         
-        wordle.guesses.append(guess)
-        if guess == wordle.solution:
-            wordle.solved = True
+        wordle.add_guess(guess)
 
         return wordle
@@ -0,0 +1,63 @@
+"""Builds the game and user repositories for the storage backend selected by Config.STORAGE_BACKEND."""
+from .cached_wordle_repository import CachedWordleRepository
+
+STORAGE_BACKENDS = ('dynamodb', 'memory', 'sqlite')
+
+
+def create_repositories(config, metrics=None):
+    """Return (wordle_repository, user_repository, stats_repository, extensions), where `extensions` holds the backend's shared handle
+    (the DynamoDB resource or the SQLite database) under its name, for app.extensions. DynamoDB calls are reported to
+    `metrics` if given."""
+    backend = config['STORAGE_BACKEND']
+    if backend == 'dynamodb':
+        wordle_repository, user_repository, stats_repository, extensions = _dynamodb_repositories(config, metrics)
+    elif backend == 'memory':
+        from .memory_repository import MemoryStatsRepository, MemoryUserRepository, MemoryWordleRepository, SimulatedLatency
+        wordle_repository, user_repository, stats_repository, extensions = MemoryWordleRepository(), MemoryUserRepository(), MemoryStatsRepository(), {}
+        if config['MEMORY_LATENCY']:
+            wordle_repository, user_repository, stats_repository = (
+                SimulatedLatency(repository, config['MEMORY_LATENCY']) for repository in (wordle_repository, user_repository, stats_repository)
+            )
+    elif backend == 'sqlite':
+        from .sqlite_repository import SQLiteDatabase, SQLiteStatsRepository, SQLiteUserRepository, SQLiteWordleRepository
+        database = SQLiteDatabase(config['SQLITE_PATH'])
+        wordle_repository, user_repository, stats_repository = SQLiteWordleRepository(database), SQLiteUserRepository(database), SQLiteStatsRepository(database)
+        extensions = {'sqlite': database}
+    else:
+        raise ValueError(f"Unknown STORAGE_BACKEND {backend!r}, expected one of {', '.join(STORAGE_BACKENDS)}")
+
+    if config['GAME_CACHE_ENABLED']:
+        wordle_repository = CachedWordleRepository(wordle_repository, config['GAME_CACHE_SIZE'], config['GAME_CACHE_TTL'])
+    return wordle_repository, user_repository, stats_repository, extensions
+
+
+def _dynamodb_repositories(config, metrics):
+    from .dynamodb import InstrumentedDynamoDB, LazyDynamoDBClient, LazyDynamoDBResource, botocore_config_options
+    from .stats_repository import StatsRepository
+    from .user_repository import UserRepository
+    from .wordle_client_repository import WordleClientRepository
+    from .wordle_repository import WordleRepository
+
+    # In lazy mode boto3 is only imported on the first DynamoDB call
+    config_options = botocore_config_options(config)
+    dynamodb = LazyDynamoDBResource(config['DYNAMODB_REGION'], config_options)
+    dynamodb_client = LazyDynamoDBClient(config['DYNAMODB_REGION'], config_options) if config['DYNAMODB_WORDLE_BACKEND'] == 'client' else None
+    if not config['LAZY_STARTUP']:
+        dynamodb.get()
+        if dynamodb_client:
+            dynamodb_client.get()
+
+    def instrumented(target, table_name=None):
+        return InstrumentedDynamoDB(target, metrics, table_name) if metrics and metrics.enabled else target
+
+    if dynamodb_client:
+        wordle_repository = WordleClientRepository(instrumented(dynamodb_client), config['DYNAMODB_WORDLE_TABLE'], config['DYNAMODB_WORDLE_USER_INDEX'])
+    else:
+        wordle_table = instrumented(dynamodb.Table(config['DYNAMODB_WORDLE_TABLE']), config['DYNAMODB_WORDLE_TABLE'])
+        wordle_repository = WordleRepository(wordle_table, config['DYNAMODB_WORDLE_USER_INDEX'], instrumented(dynamodb))
+    user_table = instrumented(dynamodb.Table(config['DYNAMODB_USER_TABLE']), config['DYNAMODB_USER_TABLE'])
+    user_repository = UserRepository(user_table, config['DYNAMODB_USER_ID_INDEX'], config['USER_CACHE_SIZE'], config['USER_CACHE_TTL'])
+    stats_table = config['DYNAMODB_STATS_TABLE']
+    stats_client = dynamodb_client or LazyDynamoDBClient(config['DYNAMODB_REGION'], config_options)
+    stats_repository = StatsRepository(instrumented(dynamodb.Table(stats_table), stats_table), instrumented(stats_client, stats_table), stats_table)
+    return wordle_repository, user_repository, stats_repository, {'dynamodb': dynamodb}
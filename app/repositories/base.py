@@ -0,0 +1,185 @@
+from abc import ABC, abstractmethod
+
+from ..errors import GuessConflictError
+from ..models.game_codec import LEGACY_FIELDS
+from ..models.stats import leaderboard_insert
+
+# conditional leaderboard writes retried before the update is dropped (the player's next win offers their entry again)
+LEADERBOARD_ATTEMPTS = 5
+
+class BaseWordleRepository(ABC):
+    """The interface every game storage backend implements. Games are passed in and returned as plain item dicts
+    (Wordle.to_dict()), except for the commit methods, which take the Wordle itself."""
+    @abstractmethod
+    def create_wordle(self, wordle):
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_wordle_if_absent(self, wordle):
+        """Store a new game unless a game with its game_id already exists, atomically. Returns whether it was stored."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_wordle(self, game_id, user_id):
+        """Return the game's item, or None if it doesn't exist or belongs to another user."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_wordles_page(self, user_id, limit=None, cursor=None):
+        """Return one page of the user's games, newest first, and the cursor for the next page (None on the last page)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_wordle(self, game_id, updates):
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit_guess(self, wordle):
+        """Store the game's latest guess if the stored game is still the one it was read from, else raise GuessConflictError."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit_surrender(self, wordle):
+        """Store the surrender if the stored game is still the one it was read from, else raise GuessConflictError."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear_stats_pending(self, game_id):
+        """Remove the stats_pending flag that the commit ending a game sets, once its result has been recorded."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit_compact(self, wordle, game):
+        """Replace the stored game's state with `game` (models/game_codec.py) if the stored game is still the version it
+        was read from, else raise GuessConflictError. Per-field attributes are removed, migrating the item."""
+        raise NotImplementedError
+
+    def create_wordles(self, wordles):
+        """Store several new games. Backends with a bulk write override this."""
+        for wordle in wordles:
+            self.create_wordle(wordle)
+
+    def get_wordles(self, game_ids, user_id):
+        """Return the user's games among `game_ids`, in the order given, skipping games that don't exist or belong to
+        another user. Backends with a bulk read override this."""
+        items = (self.get_wordle(game_id, user_id) for game_id in dict.fromkeys(game_ids))
+        return [item for item in items if item]
+
+    def get_all_wordles(self, user_id):
+        return list(self.iter_wordles(user_id))
+
+    def iter_wordles(self, user_id, page_size=None):
+        """Yield all of the user's games, newest first, fetching one page at a time."""
+        cursor = None
+        while True:
+            items, cursor = self.get_wordles_page(user_id, page_size, cursor)
+            yield from items
+            if not cursor:
+                return
+
+
+class BaseUserRepository(ABC):
+    """The interface every user storage backend implements."""
+    @abstractmethod
+    def create_user(self, user):
+        """Store a new user. Raises ValueError if the username is taken."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_password_hash(self, user, hashed_password):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_user_by_username(self, username):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_user_by_user_id(self, user_id):
+        raise NotImplementedError
+
+
+class BaseStatsRepository(ABC):
+    """The interface every statistics backend implements. A user's statistics are a dict of counters and each letter
+    count's leaderboard is a list of entries, stored as one versioned item (see models/stats.py)."""
+    @abstractmethod
+    def record_result(self, user_id, counters, won, game_id):
+        """Atomically add `counters` to the user's statistics, extend the streak if `won` or else reset it, and raise
+        max_streak to match, unless the game `game_id` was already recorded: a recording can be retried without being
+        counted twice. Returns all of the user's counters after the update."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_stats(self, user_id):
+        """Return the user's counters ({} if they haven't finished a game)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_leaderboard(self, letter_count):
+        """Return the leaderboard's (entries, version), or ([], 0) if it doesn't exist yet."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_leaderboard(self, letter_count, entries, version):
+        """Store the leaderboard's entries if it is still at `version`, and return whether it was."""
+        raise NotImplementedError
+
+    def update_leaderboard(self, letter_count, entry, size):
+        """Add or replace the user's entry in the leaderboard, keeping the best `size` entries."""
+        for _ in range(LEADERBOARD_ATTEMPTS):
+            entries, version = self.get_leaderboard(letter_count)
+            updated = leaderboard_insert(entries, entry, size)
+            if updated is None or self.put_leaderboard(letter_count, updated, version):
+                return
+
+
+def check_commit(item, wordle, guess_count):
+    """Apply the conditions of a guess or surrender commit to a stored item, for backends that check them in Python.
+
+    The stored game must belong to the user, still be in progress, have `guess_count` guesses and the version the caller
+    read (DynamoDB's conditional writes enforce the same rules). A game stored compactly since it was read has changed
+    too."""
+    if (item is None or item['user_id'] != wordle.user_id or 'game' in item or len(item['guesses']) != guess_count
+            or item['solved'] or item['surrendered'] or item.get('version', 0) != wordle.version):
+        raise GuessConflictError("Game was updated by another request")
+
+
+def check_version(item, wordle):
+    """The condition of a compact commit: the stored game must belong to the user and still have the version the caller
+    read. Every write bumps the version, so that also rules out a concurrent guess or surrender."""
+    if item is None or item['user_id'] != wordle.user_id or item.get('version', 0) != wordle.version:
+        raise GuessConflictError("Game was updated by another request")
+
+
+def apply_compact(item, wordle, game):
+    for field in LEGACY_FIELDS:
+        item.pop(field, None)
+    item['game'] = game
+    item['version'] = wordle.version + 1
+    _mark_if_over(item, wordle)
+
+
+def apply_guess(item, wordle):
+    """Update a stored item with the game's latest guess."""
+    item['guesses'] = item['guesses'] + [wordle.guesses[-1]]
+    item['solved'] = wordle.solved
+    item['version'] = wordle.version + 1
+    item.update(wordle.letter_bank.to_dict())
+    _mark_if_over(item, wordle)
+
+
+def apply_surrender(item, wordle):
+    item['surrendered'] = True
+    item['version'] = wordle.version + 1
+    _mark_if_over(item, wordle)
+
+
+def _mark_if_over(item, wordle):
+    # the commit that ends a game flags it until its result is in the player's statistics (WordleService)
+    if wordle.is_game_over():
+        item['stats_pending'] = True
+
+
+def in_request_order(items, game_ids, user_id):
+    """Order items fetched in bulk like `game_ids`, dropping duplicates and other users' games."""
+    by_id = {item['game_id']: item for item in items if item['user_id'] == user_id}
+    return [by_id[game_id] for game_id in dict.fromkeys(game_ids) if game_id in by_id]
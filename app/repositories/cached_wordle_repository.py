@@ -0,0 +1,87 @@
+from ..models.game_codec import compact_item
+from ..utils.cache import TTLCache
+
+class CachedWordleRepository:
+    """A write-through cache of game items in front of a WordleRepository.
+
+    Games are cached by game_id when they are created, read or successfully updated, so an active game is served from
+    memory for the read half of every guess. Every write is still conditional on the cached version: if another process
+    updated the game in the meantime the write fails, the stale entry is evicted and GuessConflictError is raised so the
+    caller can retry against fresh state. Anything not cached is delegated to the wrapped repository."""
+    def __init__(self, repository, maxsize=1024, ttl=300):
+        self.repository = repository
+        self.cache = TTLCache(maxsize, ttl)
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def create_wordle(self, wordle):
+        self.repository.create_wordle(wordle)
+        self.cache.set(wordle['game_id'], _copy(wordle))
+
+    def create_wordle_if_absent(self, wordle):
+        created = self.repository.create_wordle_if_absent(wordle)
+        if created:
+            self.cache.set(wordle['game_id'], _copy(wordle))
+        return created
+
+    def create_wordles(self, wordles):
+        self.repository.create_wordles(wordles)
+        for wordle in wordles:
+            self.cache.set(wordle['game_id'], _copy(wordle))
+
+    def get_wordles(self, game_ids, user_id):
+        cached = {game_id: self.cache.get(game_id) for game_id in dict.fromkeys(game_ids)}
+        misses = [game_id for game_id, wordle in cached.items() if wordle is None]
+        if misses:
+            for wordle in self.repository.get_wordles(misses, user_id):
+                self.cache.set(wordle['game_id'], _copy(wordle))
+                cached[wordle['game_id']] = wordle
+        return [_copy(wordle) for wordle in cached.values() if wordle is not None and wordle['user_id'] == user_id]
+
+    def get_wordle(self, game_id, user_id):
+        wordle = self.cache.get(game_id)
+        if wordle is not None:
+            return _copy(wordle) if wordle['user_id'] == user_id else None
+
+        wordle = self.repository.get_wordle(game_id, user_id)
+        if wordle:
+            self.cache.set(game_id, _copy(wordle))
+        return wordle
+
+    def update_wordle(self, game_id, updates):
+        self.cache.pop(game_id)
+        return self.repository.update_wordle(game_id, updates)
+
+    def commit_guess(self, wordle):
+        self._write_through(self.repository.commit_guess, wordle)
+
+    def commit_surrender(self, wordle):
+        self._write_through(self.repository.commit_surrender, wordle)
+
+    def commit_compact(self, wordle, game):
+        self._write_through(lambda wordle: self.repository.commit_compact(wordle, game), wordle, lambda wordle: compact_item(wordle, game))
+
+    def clear_stats_pending(self, game_id):
+        self.repository.clear_stats_pending(game_id)
+        self.cache.pop(game_id)
+
+    def _write_through(self, commit, wordle, cached_item=None):
+        try:
+            commit(wordle)
+        except Exception:
+            # either our copy was stale (GuessConflictError) or we can't tell whether the write was applied
+            self.cache.pop(wordle.game_id)
+            raise
+        item = cached_item(wordle) if cached_item else _copy(wordle.to_dict())
+        if wordle.is_game_over():
+            # as the commit that ends a game sets it in the store
+            item['stats_pending'] = True
+        self.cache.set(wordle.game_id, item)
+
+
+def _copy(wordle):
+    # callers append to the guesses list, so it must not be shared with the cached item (compact items have none)
+    if 'guesses' not in wordle:
+        return dict(wordle)
+    return {**wordle, 'guesses': list(wordle['guesses'])}
@@ -0,0 +1,191 @@
+import random
+import threading
+import time
+
+from ..errors import ServiceUnavailableError
+
+# DynamoDB's per-call limits
+BATCH_WRITE_SIZE = 25
+BATCH_GET_SIZE = 100
+
+def botocore_config_options(config):
+    """Return the botocore.config.Config options for DynamoDB from the app config."""
+    return {
+        'max_pool_connections': config['DYNAMODB_MAX_POOL_CONNECTIONS'],
+        'tcp_keepalive': config['DYNAMODB_TCP_KEEPALIVE'],
+        'connect_timeout': config['DYNAMODB_CONNECT_TIMEOUT'],
+        'read_timeout': config['DYNAMODB_READ_TIMEOUT'],
+        'retries': {'mode': config['DYNAMODB_RETRY_MODE'], 'max_attempts': config['DYNAMODB_MAX_ATTEMPTS']}
+    }
+
+
+def _botocore_config(config_options):
+    if not config_options:
+        return None
+    from botocore.config import Config
+    return Config(**config_options)
+
+
+class LazyDynamoDBResource:
+    """Stands in for boto3.resource('dynamodb'), importing boto3 and creating the resource on first use.
+
+    Tables handed out by Table() are lazy too, so an app that never touches DynamoDB during a request (or a cold start)
+    never pays for it. `config_options` are passed to botocore.config.Config."""
+    def __init__(self, region_name, config_options=None, **resource_kwargs):
+        self.region_name = region_name
+        self.config_options = config_options
+        self.resource_kwargs = resource_kwargs
+        self._resource = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self):
+        return self._resource is not None
+
+    def get(self):
+        if self._resource is None:
+            with self._lock:
+                if self._resource is None:
+                    import boto3
+                    self._resource = boto3.resource('dynamodb', region_name=self.region_name, config=_botocore_config(self.config_options), **self.resource_kwargs)
+        return self._resource
+
+    def Table(self, name):
+        return LazyTable(self, name)
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+class LazyTable:
+    """Stands in for a boto3 Table until it is first used."""
+    def __init__(self, resource, name):
+        self.name = name
+        self._resource = resource
+        self._table = None
+
+    def get(self):
+        if self._table is None:
+            self._table = self._resource.get().Table(self.name)
+        return self._table
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+class LazyDynamoDBClient:
+    """Stands in for boto3.client('dynamodb'), importing boto3 and creating the client on first use."""
+    def __init__(self, region_name, config_options=None, **client_kwargs):
+        self.region_name = region_name
+        self.config_options = config_options
+        self.client_kwargs = client_kwargs
+        self._client = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+                    self._client = boto3.client('dynamodb', region_name=self.region_name, config=_botocore_config(self.config_options), **self.client_kwargs)
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def is_conditional_check_failure(error):
+    """Return True if a DynamoDB call failed because its ConditionExpression wasn't met."""
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+
+def is_transaction_condition_failure(error, index):
+    """Return True if a transact_write_items call was cancelled because the condition of its `index`th item wasn't met."""
+    response = getattr(error, 'response', None) or {}
+    if response.get('Error', {}).get('Code') != 'TransactionCanceledException':
+        return False
+    reasons = response.get('CancellationReasons') or []
+    return len(reasons) > index and reasons[index].get('Code') == 'ConditionalCheckFailed'
+
+
+DYNAMODB_OPERATIONS = frozenset({
+    'get_item', 'put_item', 'update_item', 'delete_item', 'query', 'scan',
+    'batch_get_item', 'batch_write_item', 'transact_get_items', 'transact_write_items',
+})
+
+
+class InstrumentedDynamoDB:
+    """Wraps a boto3 Table or DynamoDB client (or their lazy stand-ins) and reports the latency and consumed capacity of
+    every data operation to the app's Metrics. Operations ask for ReturnConsumedCapacity=TOTAL unless the caller chose
+    otherwise; everything else is passed through untouched."""
+    def __init__(self, target, metrics, table_name=None):
+        self._target = target
+        self._metrics = metrics
+        self._table_name = table_name
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if name not in DYNAMODB_OPERATIONS:
+            return attribute
+
+        def call(**kwargs):
+            kwargs.setdefault('ReturnConsumedCapacity', 'TOTAL')
+            start = time.perf_counter()
+            response = None
+            try:
+                response = attribute(**kwargs)
+                return response
+            finally:
+                table = self._table_name or kwargs.get('TableName') or ','.join(kwargs.get('RequestItems', ()))
+                self._metrics.record_dynamodb_call(name, table, time.perf_counter() - start, consumed_capacity(response))
+        return call
+
+
+def consumed_capacity(response):
+    """Return the total capacity units reported in a DynamoDB response (0 if none were reported)."""
+    consumed = (response or {}).get('ConsumedCapacity')
+    if not consumed:
+        return 0.0
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(entry.get('CapacityUnits', 0) for entry in consumed))
+
+
+def batch_write(batch_write_item, table_name, requests, attempts=5, backoff=0.05):
+    """Send write requests ({'PutRequest': ...} / {'DeleteRequest': ...}) to one table with batch_write_item,
+    BATCH_WRITE_SIZE at a time.
+
+    Works with the resource's batch_write_item (plain values) and the client's (attribute value dicts) alike. Unprocessed
+    items are retried with exponential backoff and full jitter; raises ServiceUnavailableError if some are still
+    unprocessed after `attempts` calls."""
+    for start in range(0, len(requests), BATCH_WRITE_SIZE):
+        request_items = {table_name: requests[start:start + BATCH_WRITE_SIZE]}
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(random.uniform(0, backoff * 2 ** attempt))
+            request_items = batch_write_item(RequestItems=request_items).get('UnprocessedItems')
+            if not request_items:
+                break
+        else:
+            raise ServiceUnavailableError("DynamoDB did not process every item of the batch write")
+
+
+def batch_get(batch_get_item, table_name, keys, attempts=5, backoff=0.05, **options):
+    """Fetch items from one table by key with batch_get_item, BATCH_GET_SIZE keys at a time, and return them in no
+    particular order. `options` (e.g. ConsistentRead) are added to the table's request. Unprocessed keys are retried
+    like batch_write's unprocessed items."""
+    items = []
+    for start in range(0, len(keys), BATCH_GET_SIZE):
+        request_items = {table_name: {'Keys': keys[start:start + BATCH_GET_SIZE], **options}}
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(random.uniform(0, backoff * 2 ** attempt))
+            response = batch_get_item(RequestItems=request_items)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            request_items = response.get('UnprocessedKeys')
+            if not request_items:
+                break
+        else:
+            raise ServiceUnavailableError("DynamoDB did not return every item of the batch get")
+    return items
@@ -0,0 +1,195 @@
+import bisect
+import threading
+import time
+
+from ..models.user import User
+from ..utils.pagination import decode_cursor, encode_cursor
+from .base import BaseStatsRepository, BaseUserRepository, BaseWordleRepository, apply_compact, apply_guess, apply_surrender, check_commit, check_version
+
+class MemoryWordleRepository(BaseWordleRepository):
+    """Keeps games in a dict in process memory, for local development and load testing without DynamoDB.
+
+    Each user's games are also kept in a list sorted by (created_at, game_id), which plays the part of the user_id /
+    created_at index for history pages. Items are copied on the way in and out, so callers can't mutate stored state.
+    All access is serialized by one lock."""
+    def __init__(self):
+        self.items = {}
+        self.user_games = {}
+        self._lock = threading.Lock()
+
+    def create_wordle(self, wordle):
+        self.create_wordles([wordle])
+
+    def create_wordles(self, wordles):
+        with self._lock:
+            for wordle in wordles:
+                self._insert(wordle)
+
+    def create_wordle_if_absent(self, wordle):
+        with self._lock:
+            if wordle['game_id'] in self.items:
+                return False
+            self._insert(wordle)
+        return True
+
+    def _insert(self, wordle):
+        self.items[wordle['game_id']] = _copy(wordle)
+        bisect.insort(self.user_games.setdefault(wordle['user_id'], []), _sort_key(wordle))
+
+    def get_wordle(self, game_id, user_id):
+        with self._lock:
+            item = self.items.get(game_id)
+            if item and item['user_id'] == user_id:
+                return _copy(item)
+        return None
+
+    def get_wordles(self, game_ids, user_id):
+        with self._lock:
+            items = (self.items.get(game_id) for game_id in dict.fromkeys(game_ids))
+            return [_copy(item) for item in items if item and item['user_id'] == user_id]
+
+    def get_wordles_page(self, user_id, limit=None, cursor=None):
+        start = _cursor_key(cursor)
+        with self._lock:
+            keys = self.user_games.get(user_id, [])
+            end = bisect.bisect_left(keys, start) if start else len(keys)
+            first = max(end - limit, 0) if limit else 0
+            page = [_copy(self.items[game_id]) for _, game_id in reversed(keys[first:end])]
+
+        next_cursor = None
+        if first > 0:
+            next_cursor = encode_cursor({'created_at': page[-1].get('created_at', ''), 'game_id': page[-1]['game_id'], 'user_id': user_id})
+        return page, next_cursor
+
+    def update_wordle(self, game_id, updates):
+        with self._lock:
+            item = self.items[game_id]
+            item.update({key: value for key, value in updates.items() if key != 'game_id'})
+            return {'Attributes': _copy(item)}
+
+    def commit_guess(self, wordle):
+        self._commit(wordle, len(wordle.guesses) - 1, apply_guess)
+
+    def commit_surrender(self, wordle):
+        self._commit(wordle, len(wordle.guesses), apply_surrender)
+
+    def commit_compact(self, wordle, game):
+        with self._lock:
+            item = self.items.get(wordle.game_id)
+            check_version(item, wordle)
+            apply_compact(item, wordle, game)
+        wordle.version += 1
+
+    def clear_stats_pending(self, game_id):
+        with self._lock:
+            item = self.items.get(game_id)
+            if item:
+                item.pop('stats_pending', None)
+
+    def _commit(self, wordle, guess_count, apply):
+        with self._lock:
+            item = self.items.get(wordle.game_id)
+            check_commit(item, wordle, guess_count)
+            apply(item, wordle)
+        wordle.version += 1
+
+
+class MemoryUserRepository(BaseUserRepository):
+    """Keeps users in process memory, indexed by both username and user_id."""
+    def __init__(self):
+        self.users = {}
+        self.user_ids = {}
+        self._lock = threading.Lock()
+
+    def create_user(self, user):
+        with self._lock:
+            if user.username in self.users:
+                raise ValueError(f"User with username {user.username} already exists")
+            self.users[user.username] = user.to_dict()
+            self.user_ids[user.user_id] = user.username
+
+    def update_password_hash(self, user, hashed_password):
+        with self._lock:
+            self.users[user.username]['hashed_password'] = hashed_password
+        user.hashed_password = hashed_password
+
+    def get_user_by_username(self, username):
+        item = self.users.get(username)
+        return User.from_dict(item) if item else None
+
+    def get_user_by_user_id(self, user_id):
+        username = self.user_ids.get(user_id)
+        return self.get_user_by_username(username) if username else None
+
+
+class MemoryStatsRepository(BaseStatsRepository):
+    """Keeps statistics and leaderboards in process memory, updated under one lock."""
+    def __init__(self):
+        self.stats = {}
+        self.leaderboards = {}
+        self.recorded_games = set()
+        self._lock = threading.Lock()
+
+    def record_result(self, user_id, counters, won, game_id):
+        with self._lock:
+            stats = self.stats.setdefault(user_id, {})
+            if game_id in self.recorded_games:
+                return dict(stats)
+            self.recorded_games.add(game_id)
+            for name, value in counters.items():
+                stats[name] = stats.get(name, 0) + value
+            stats['current_streak'] = stats.get('current_streak', 0) + 1 if won else 0
+            stats['max_streak'] = max(stats.get('max_streak', 0), stats['current_streak'])
+            return dict(stats)
+
+    def get_stats(self, user_id):
+        with self._lock:
+            return dict(self.stats.get(user_id, {}))
+
+    def get_leaderboard(self, letter_count):
+        with self._lock:
+            entries, version = self.leaderboards.get(letter_count, ([], 0))
+            return list(entries), version
+
+    def put_leaderboard(self, letter_count, entries, version):
+        with self._lock:
+            if self.leaderboards.get(letter_count, ([], 0))[1] != version:
+                return False
+            self.leaderboards[letter_count] = (list(entries), version + 1)
+            return True
+
+
+class SimulatedLatency:
+    """Wraps an in-memory repository so that every call first sleeps for `latency` seconds, to load test as if the
+    store were remote (Config.MEMORY_LATENCY)."""
+    def __init__(self, repository, latency):
+        self.repository = repository
+        self.latency = latency
+
+    def __getattr__(self, name):
+        method = getattr(self.repository, name)
+
+        def call(*args, **kwargs):
+            time.sleep(self.latency)
+            return method(*args, **kwargs)
+        return call
+
+
+def _copy(item):
+    # compact items have no guesses list
+    if 'guesses' not in item:
+        return dict(item)
+    return {**item, 'guesses': list(item['guesses'])}
+
+
+def _sort_key(item):
+    return (item.get('created_at', ''), item['game_id'])
+
+
+def _cursor_key(cursor):
+    key = decode_cursor(cursor)
+    if key is None:
+        return None
+    if not isinstance(key.get('created_at'), str) or not isinstance(key.get('game_id'), str):
+        raise ValueError("Invalid cursor")
+    return (key['created_at'], key['game_id'])
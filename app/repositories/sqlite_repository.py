@@ -0,0 +1,273 @@
+import base64
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from ..errors import GuessConflictError
+from ..models.user import User
+from ..utils.pagination import decode_cursor, encode_cursor
+from .base import BaseStatsRepository, BaseUserRepository, BaseWordleRepository, apply_guess, apply_surrender, apply_compact, check_commit, check_version, in_request_order
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wordles (
+    game_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 0,
+    item TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS wordles_user_id_created_at ON wordles (user_id, created_at, game_id);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    hashed_password BLOB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_user_id ON users (user_id);
+CREATE TABLE IF NOT EXISTS stats (
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (user_id, name)
+);
+CREATE TABLE IF NOT EXISTS recorded_games (
+    game_id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS leaderboards (
+    letter_count INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL,
+    entries TEXT NOT NULL
+);
+"""
+
+ADD_COUNTER = 'INSERT INTO stats (user_id, name, value) VALUES (?, ?, ?) ON CONFLICT (user_id, name) DO UPDATE SET value = value + excluded.value'
+SET_COUNTER = 'INSERT INTO stats (user_id, name, value) VALUES (?, ?, ?) ON CONFLICT (user_id, name) DO UPDATE SET value = excluded.value'
+RAISE_MAX_STREAK = """
+INSERT INTO stats (user_id, name, value) SELECT user_id, 'max_streak', value FROM stats WHERE user_id = ? AND name = 'current_streak'
+ON CONFLICT (user_id, name) DO UPDATE SET value = max(value, excluded.value)
+"""
+
+
+class SQLiteDatabase:
+    """One SQLite connection shared by the game and user repositories, with the schema created on open.
+
+    The connection is in autocommit mode and used by one thread at a time. A file database uses write-ahead logging so
+    several worker processes can share it; ':memory:' gives a private database for a single process."""
+    def __init__(self, path=':memory:'):
+        self.path = str(path)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+        if self.path != ':memory:':
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def execute(self, sql, parameters=()):
+        """Run a statement and return (rows, rowcount)."""
+        with self.lock:
+            cursor = self.connection.execute(sql, parameters)
+            return cursor.fetchall(), cursor.rowcount
+
+    def executemany(self, sql, rows):
+        """Run a statement once per row, in a single transaction."""
+        with self.transaction() as connection:
+            connection.executemany(sql, rows)
+
+    @contextmanager
+    def transaction(self):
+        """Hold the connection for a transaction, committed when the block exits and rolled back if it raises."""
+        with self.lock:
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+
+
+def _dumps(item):
+    # JSON has no bytes; a compact game is stored base64-encoded
+    if 'game' in item:
+        item = {**item, 'game': base64.b64encode(item['game']).decode('ascii')}
+    return json.dumps(item)
+
+
+def _loads(text):
+    item = json.loads(text)
+    if 'game' in item:
+        item['game'] = base64.b64decode(item['game'])
+    return item
+
+
+class SQLiteWordleRepository(BaseWordleRepository):
+    """Stores each game as a JSON item, with the key and index columns (game_id, user_id, created_at, version) alongside.
+
+    History pages use the (user_id, created_at, game_id) index. Commits check their conditions against the stored item and
+    then update it only if its version is unchanged, so a commit racing one from another process still fails cleanly."""
+    def __init__(self, database):
+        self.database = database
+
+    def create_wordle(self, wordle):
+        self.database.execute(
+            'INSERT INTO wordles (game_id, user_id, created_at, version, item) VALUES (?, ?, ?, ?, ?)',
+            (wordle['game_id'], wordle['user_id'], wordle.get('created_at', ''), wordle.get('version', 0), _dumps(wordle))
+        )
+
+    def create_wordle_if_absent(self, wordle):
+        _, inserted = self.database.execute(
+            'INSERT INTO wordles (game_id, user_id, created_at, version, item) VALUES (?, ?, ?, ?, ?) ON CONFLICT (game_id) DO NOTHING',
+            (wordle['game_id'], wordle['user_id'], wordle.get('created_at', ''), wordle.get('version', 0), _dumps(wordle))
+        )
+        return inserted == 1
+
+    def create_wordles(self, wordles):
+        self.database.executemany(
+            'INSERT INTO wordles (game_id, user_id, created_at, version, item) VALUES (?, ?, ?, ?, ?)',
+            [(wordle['game_id'], wordle['user_id'], wordle.get('created_at', ''), wordle.get('version', 0), _dumps(wordle)) for wordle in wordles]
+        )
+
+    def get_wordles(self, game_ids, user_id):
+        game_ids = list(dict.fromkeys(game_ids))
+        if not game_ids:
+            return []
+        placeholders = ', '.join('?' * len(game_ids))
+        rows, _ = self.database.execute(f'SELECT item FROM wordles WHERE user_id = ? AND game_id IN ({placeholders})', [user_id, *game_ids])
+        return in_request_order([_loads(row[0]) for row in rows], game_ids, user_id)
+
+    def get_wordle(self, game_id, user_id):
+        rows, _ = self.database.execute('SELECT item FROM wordles WHERE game_id = ? AND user_id = ?', (game_id, user_id))
+        return _loads(rows[0][0]) if rows else None
+
+    def get_wordles_page(self, user_id, limit=None, cursor=None):
+        sql = 'SELECT item FROM wordles WHERE user_id = ?'
+        parameters = [user_id]
+        start = decode_cursor(cursor)
+        if start:
+            if not isinstance(start.get('created_at'), str) or not isinstance(start.get('game_id'), str):
+                raise ValueError("Invalid cursor")
+            sql += ' AND (created_at, game_id) < (?, ?)'
+            parameters += [start['created_at'], start['game_id']]
+        sql += ' ORDER BY created_at DESC, game_id DESC'
+        if limit:
+            # one extra row tells us whether there is another page
+            sql += ' LIMIT ?'
+            parameters.append(limit + 1)
+
+        rows, _ = self.database.execute(sql, parameters)
+        items = [_loads(row[0]) for row in rows[:limit or None]]
+        next_cursor = None
+        if limit and len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor({'created_at': last.get('created_at', ''), 'game_id': last['game_id'], 'user_id': user_id})
+        return items, next_cursor
+
+    def update_wordle(self, game_id, updates):
+        rows, _ = self.database.execute('SELECT item FROM wordles WHERE game_id = ?', (game_id,))
+        item = _loads(rows[0][0])
+        item.update({key: value for key, value in updates.items() if key != 'game_id'})
+        self.database.execute(
+            'UPDATE wordles SET version = ?, item = ? WHERE game_id = ?',
+            (item.get('version', 0), _dumps(item), game_id)
+        )
+        return {'Attributes': item}
+
+    def commit_guess(self, wordle):
+        self._commit(wordle, len(wordle.guesses) - 1, apply_guess)
+
+    def commit_surrender(self, wordle):
+        self._commit(wordle, len(wordle.guesses), apply_surrender)
+
+    def commit_compact(self, wordle, game):
+        rows, _ = self.database.execute('SELECT item FROM wordles WHERE game_id = ?', (wordle.game_id,))
+        item = _loads(rows[0][0]) if rows else None
+        check_version(item, wordle)
+        apply_compact(item, wordle, game)
+        self._update(item, wordle)
+
+    def clear_stats_pending(self, game_id):
+        self.database.execute("UPDATE wordles SET item = json_remove(item, '$.stats_pending') WHERE game_id = ?", (game_id,))
+
+    def _commit(self, wordle, guess_count, apply):
+        rows, _ = self.database.execute('SELECT item FROM wordles WHERE game_id = ?', (wordle.game_id,))
+        item = _loads(rows[0][0]) if rows else None
+        check_commit(item, wordle, guess_count)
+        apply(item, wordle)
+        self._update(item, wordle)
+
+    def _update(self, item, wordle):
+        _, updated = self.database.execute(
+            'UPDATE wordles SET version = ?, item = ? WHERE game_id = ? AND version = ?',
+            (item['version'], _dumps(item), wordle.game_id, wordle.version)
+        )
+        if not updated:
+            raise GuessConflictError("Game was updated by another request")
+        wordle.version += 1
+
+
+class SQLiteStatsRepository(BaseStatsRepository):
+    """Statistics are stored one counter per row and updated with upserts in a single transaction, together with a row
+    in recorded_games that makes recording a game again a no-op. Each leaderboard is a row holding its entries as JSON,
+    replaced only if its version is unchanged."""
+    def __init__(self, database):
+        self.database = database
+
+    def record_result(self, user_id, counters, won, game_id):
+        with self.database.transaction() as connection:
+            recorded = connection.execute('INSERT INTO recorded_games (game_id) VALUES (?) ON CONFLICT (game_id) DO NOTHING', (game_id,)).rowcount
+            if recorded:
+                connection.executemany(ADD_COUNTER, [(user_id, name, value) for name, value in counters.items()])
+                connection.execute(ADD_COUNTER if won else SET_COUNTER, (user_id, 'current_streak', 1 if won else 0))
+                connection.execute(RAISE_MAX_STREAK, (user_id,))
+            rows = connection.execute('SELECT name, value FROM stats WHERE user_id = ?', (user_id,)).fetchall()
+        return dict(rows)
+
+    def get_stats(self, user_id):
+        rows, _ = self.database.execute('SELECT name, value FROM stats WHERE user_id = ?', (user_id,))
+        return dict(rows)
+
+    def get_leaderboard(self, letter_count):
+        rows, _ = self.database.execute('SELECT entries, version FROM leaderboards WHERE letter_count = ?', (letter_count,))
+        return (json.loads(rows[0][0]), rows[0][1]) if rows else ([], 0)
+
+    def put_leaderboard(self, letter_count, entries, version):
+        if version == 0:
+            _, updated = self.database.execute(
+                'INSERT INTO leaderboards (letter_count, version, entries) VALUES (?, 1, ?) ON CONFLICT (letter_count) DO NOTHING',
+                (letter_count, json.dumps(entries))
+            )
+        else:
+            _, updated = self.database.execute(
+                'UPDATE leaderboards SET version = ?, entries = ? WHERE letter_count = ? AND version = ?',
+                (version + 1, json.dumps(entries), letter_count, version)
+            )
+        return bool(updated)
+
+
+class SQLiteUserRepository(BaseUserRepository):
+    """Users keyed by username, with a unique index on user_id."""
+    def __init__(self, database):
+        self.database = database
+
+    def create_user(self, user):
+        try:
+            self.database.execute(
+                'INSERT INTO users (username, user_id, hashed_password) VALUES (?, ?, ?)',
+                (user.username, user.user_id, User.hashed_password_bytes(user.hashed_password))
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"User with username {user.username} already exists")
+
+    def update_password_hash(self, user, hashed_password):
+        self.database.execute('UPDATE users SET hashed_password = ? WHERE username = ?', (User.hashed_password_bytes(hashed_password), user.username))
+        user.hashed_password = hashed_password
+
+    def get_user_by_username(self, username):
+        return self._get_user('SELECT username, hashed_password, user_id FROM users WHERE username = ?', username)
+
+    def get_user_by_user_id(self, user_id):
+        return self._get_user('SELECT username, hashed_password, user_id FROM users WHERE user_id = ?', user_id)
+
+    def _get_user(self, sql, key):
+        rows, _ = self.database.execute(sql, (key,))
+        return User(*rows[0]) if rows else None
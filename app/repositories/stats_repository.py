@@ -0,0 +1,99 @@
+from .base import BaseStatsRepository
+from .dynamodb import is_conditional_check_failure, is_transaction_condition_failure
+from .wordle_marshaller import marshal_values
+
+class StatsRepository(BaseStatsRepository):
+    """Statistics and leaderboards share one table keyed by stats_id.
+
+    'user#<user_id>' items hold a user's counters as top-level number attributes, updated with a single ADD expression
+    so that concurrent game endings never lose an update. The update is a transaction with a put of a 'game#<game_id>'
+    marker conditional on the marker not existing, so each game is counted once however often its recording is retried.
+    'leaderboard#<letter_count>' items hold a leaderboard's entries, replaced with a put that is conditional on the
+    version read.
+
+    Transactions need the low-level DynamoDB `client`; everything else goes through the Table resource."""
+    def __init__(self, table, client, table_name):
+        self.table = table
+        self.client = client
+        self.table_name = table_name
+
+    def record_result(self, user_id, counters, won, game_id):
+        names = {f'#c{i}': name for i, name in enumerate(counters)}
+        values = {f':c{i}': value for i, value in enumerate(counters.values())}
+        expression = 'ADD ' + ', '.join(f'{name} :{name[1:]}' for name in names)
+        if won:
+            expression += ', current_streak :one'
+            values[':one'] = 1
+        else:
+            expression += ' SET current_streak = :zero'
+            values[':zero'] = 0
+
+        try:
+            self.client.transact_write_items(TransactItems=[
+                {'Put': {
+                    'TableName': self.table_name,
+                    'Item': {'stats_id': {'S': f'game#{game_id}'}},
+                    'ConditionExpression': 'attribute_not_exists(stats_id)',
+                }},
+                {'Update': {
+                    'TableName': self.table_name,
+                    'Key': {'stats_id': {'S': f'user#{user_id}'}},
+                    'UpdateExpression': expression,
+                    'ExpressionAttributeNames': names,
+                    'ExpressionAttributeValues': marshal_values(values),
+                }},
+            ])
+        except Exception as e:
+            if is_transaction_condition_failure(e, 0):
+                # already recorded
+                return self._get_stats(user_id, consistent=True)
+            raise
+        stats = self._get_stats(user_id, consistent=True)
+
+        # ADD can't take a maximum, so a new best streak is a second write, skipped if a concurrent one already went higher
+        streak = stats['current_streak']
+        if streak > stats.get('max_streak', 0):
+            try:
+                self.table.update_item(
+                    Key={'stats_id': f'user#{user_id}'},
+                    UpdateExpression='SET max_streak = :streak',
+                    ConditionExpression='attribute_not_exists(max_streak) OR max_streak < :streak',
+                    ExpressionAttributeValues={':streak': streak}
+                )
+            except Exception as e:
+                if not is_conditional_check_failure(e):
+                    raise
+            stats['max_streak'] = streak
+        return stats
+
+    def get_stats(self, user_id):
+        return self._get_stats(user_id)
+
+    def _get_stats(self, user_id, consistent=False):
+        response = self.table.get_item(Key={'stats_id': f'user#{user_id}'}, ConsistentRead=consistent)
+        return _counters(response['Item']) if response.get('Item') else {}
+
+    def get_leaderboard(self, letter_count):
+        response = self.table.get_item(Key={'stats_id': f'leaderboard#{letter_count}'})
+        item = response.get('Item')
+        if not item:
+            return [], 0
+        entries = [{'user_id': entry['user_id'], 'won': int(entry['won']), 'guesses': int(entry['guesses'])} for entry in item['entries']]
+        return entries, int(item['version'])
+
+    def put_leaderboard(self, letter_count, entries, version):
+        options = {'ConditionExpression': 'attribute_not_exists(stats_id)'}
+        if version:
+            options = {'ConditionExpression': 'version = :version', 'ExpressionAttributeValues': {':version': version}}
+        try:
+            self.table.put_item(Item={'stats_id': f'leaderboard#{letter_count}', 'version': version + 1, 'entries': entries}, **options)
+        except Exception as e:
+            if is_conditional_check_failure(e):
+                return False
+            raise
+        return True
+
+
+def _counters(item):
+    # numbers come back from DynamoDB as Decimals
+    return {name: int(value) for name, value in item.items() if name != 'stats_id'}
@@ -1,31 +1,55 @@
 from ..models.user import User
-from boto3.dynamodb.conditions import Attr
+from ..utils.cache import TTLCache
+from .base import BaseUserRepository
+from .dynamodb import is_conditional_check_failure
 
-class UserRepository:
-    def __init__(self, table):
+class UserRepository(BaseUserRepository):
+    """Users are keyed by username, so username lookups and the uniqueness check on register are single-item operations.
+    Lookups by user_id go through a global secondary index on user_id, with a small TTL cache in front of them."""
+    def __init__(self, table, user_id_index='user_id-index', cache_size=1024, cache_ttl=300):
         self.table = table
+        self.user_id_index = user_id_index
+        self.user_id_cache = TTLCache(cache_size, cache_ttl)
 
     def create_user(self, user):
-        # check if user already exists (username must be unique)
-        if self.get_user_by_username(user.username):
-            raise ValueError(f"User with username {user.username} already exists")
-        self.table.put_item(Item=user.to_dict())
-
-    def login_user(self, username, password):
-        user: dict = self.get_user_by_username(username)
-        if user and User.verify_password(user.hashed_password, password):
-            return user
-        return None
-        
+        # usernames must be unique, so the write only succeeds if no user already has this key
+        try:
+            self.table.put_item(Item=user.to_dict(), ConditionExpression='attribute_not_exists(username)')
+        except Exception as e:
+            if is_conditional_check_failure(e):
+                raise ValueError(f"User with username {user.username} already exists")
+            raise
+
+    def update_password_hash(self, user, hashed_password):
+        self.table.update_item(
+            Key={'username': user.username},
+            UpdateExpression='SET hashed_password = :hashed_password',
+            ExpressionAttributeValues={':hashed_password': hashed_password}
+        )
+        user.hashed_password = hashed_password
+        self.user_id_cache.pop(user.user_id)
+
     def get_user_by_username(self, username):
-        """Username is not a primary key, so we need to scan the table to find the user."""
-        response = self.table.scan(FilterExpression=Attr('username').eq(username))
+        response = self.table.get_item(Key={'username': username})
 
-        # There will only be one user with the given username, so return the first item
-        if response.get('Items'):
-            return User.from_dict(response.get('Items')[0])
+        if response.get('Item'):
+            return User.from_dict(response['Item'])
         return None
-    
+
     def get_user_by_user_id(self, user_id):
-        response = self.table.scan(FilterExpression=Attr('user_id').eq(user_id))
-        return response.get('Items')
\ No newline at end of file
+        user = self.user_id_cache.get(user_id)
+        if user:
+            return user
+
+        response = self.table.query(
+            IndexName=self.user_id_index,
+            KeyConditionExpression='user_id = :user_id',
+            ExpressionAttributeValues={':user_id': user_id},
+            Limit=1
+        )
+
+        if response.get('Items'):
+            user = User.from_dict(response['Items'][0])
+            self.user_id_cache.set(user_id, user)
+            return user
+        return None
@@ -0,0 +1,78 @@
+from .base import in_request_order
+from .dynamodb import batch_get, batch_write
+from .wordle_marshaller import marshal_values, marshal_value, marshal_wordle, unmarshal_wordle
+from .wordle_repository import WordleRepository
+from ..utils.pagination import decode_cursor, encode_cursor
+
+class WordleClientRepository(WordleRepository):
+    """A WordleRepository on the low-level DynamoDB client instead of the boto3 Table resource.
+
+    Items are converted with the precompiled marshaller for the fixed game shape rather than boto3's generic type
+    serializer, and the client can be given a tuned botocore config (connection pool, keep-alive, retries, timeouts).
+    Expressions, conditions and results are the same as WordleRepository's."""
+    def __init__(self, client, table_name, user_index='user_id-created_at-index'):
+        super().__init__(None, user_index)
+        self.client = client
+        self.table_name = table_name
+
+    def create_wordle(self, wordle):
+        self.client.put_item(TableName=self.table_name, Item=marshal_wordle(wordle))
+
+    def _put_item_if_absent(self, wordle):
+        self.client.put_item(TableName=self.table_name, Item=marshal_wordle(wordle), ConditionExpression='attribute_not_exists(game_id)')
+
+    def get_wordle(self, game_id, user_id):
+        response = self.client.get_item(TableName=self.table_name, Key={'game_id': {'S': game_id}})
+
+        item = response.get('Item')
+        if item and item['user_id']['S'] == user_id:
+            return unmarshal_wordle(item)
+
+        return None
+
+    def create_wordles(self, wordles):
+        batch_write(self.client.batch_write_item, self.table_name, [{'PutRequest': {'Item': marshal_wordle(wordle)}} for wordle in wordles])
+
+    def get_wordles(self, game_ids, user_id):
+        keys = [{'game_id': {'S': game_id}} for game_id in dict.fromkeys(game_ids)]
+        items = batch_get(self.client.batch_get_item, self.table_name, keys)
+        return in_request_order([unmarshal_wordle(item) for item in items], game_ids, user_id)
+
+    def get_wordles_page(self, user_id, limit=None, cursor=None):
+        query = {
+            'TableName': self.table_name,
+            'IndexName': self.user_index,
+            'KeyConditionExpression': 'user_id = :user_id',
+            'ExpressionAttributeValues': {':user_id': {'S': user_id}},
+            'ScanIndexForward': False
+        }
+        if limit:
+            query['Limit'] = limit
+        if cursor:
+            query['ExclusiveStartKey'] = {name: marshal_value(value) for name, value in decode_cursor(cursor).items()}
+
+        response = self.client.query(**query)
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if last_evaluated_key:
+            last_evaluated_key = unmarshal_wordle(last_evaluated_key)
+        return [unmarshal_wordle(item) for item in response.get('Items', [])], encode_cursor(last_evaluated_key)
+
+    def update_wordle(self, game_id, updates):
+        updates = {key: value for key, value in updates.items() if key != 'game_id'}
+        return self.client.update_item(
+            TableName=self.table_name,
+            Key={'game_id': {'S': game_id}},
+            UpdateExpression='SET ' + ', '.join([f'{key} = :{key}' for key in updates]),
+            ExpressionAttributeValues=marshal_values({f':{key}': value for key, value in updates.items()}),
+            ReturnValues='UPDATED_NEW'
+        )
+
+    def _update_item(self, game_id, update_expression, condition_expression, expression_attribute_values):
+        self.client.update_item(
+            TableName=self.table_name,
+            Key={'game_id': {'S': game_id}},
+            UpdateExpression=update_expression,
+            ConditionExpression=condition_expression,
+            ExpressionAttributeValues=marshal_values(expression_attribute_values),
+            ReturnValues='NONE'
+        )
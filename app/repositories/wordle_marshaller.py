@@ -0,0 +1,118 @@
+"""Converts Wordle items to and from DynamoDB's wire format (attribute value dicts) without boto3's generic serializer.
+
+Every game item has the same shape, so each attribute gets a dedicated converter chosen once, at import time. Attributes
+outside the known shape fall back to the generic per-type conversion in marshal_value / unmarshal_value."""
+from decimal import Decimal
+
+
+def _string(value):
+    return {'S': value}
+
+
+def _bool(value):
+    return {'BOOL': bool(value)}
+
+
+def _number(value):
+    return {'N': str(value)}
+
+
+def _binary(value):
+    return {'B': bytes(value)}
+
+
+def _string_list(value):
+    return {'L': [{'S': item} for item in value]}
+
+
+def _from_string(attr):
+    return attr['S']
+
+
+def _from_bool(attr):
+    return attr['BOOL']
+
+
+def _from_int(attr):
+    return int(attr['N'])
+
+
+def _from_binary(attr):
+    return attr['B']
+
+
+def _from_string_list(attr):
+    return [item['S'] for item in attr['L']]
+
+
+WORDLE_FIELDS = {
+    'game_id': (_string, _from_string),
+    'user_id': (_string, _from_string),
+    'solution': (_string, _from_string),
+    'guesses': (_string_list, _from_string_list),
+    'solved': (_bool, _from_bool),
+    'surrendered': (_bool, _from_bool),
+    'hard_mode': (_bool, _from_bool),
+    'version': (_number, _from_int),
+    'letters_used': (_number, _from_int),
+    'letters_present': (_number, _from_int),
+    'letters_in_position': (_number, _from_int),
+    'created_at': (_string, _from_string),
+    'puzzle_id': (_string, _from_string),
+    'game': (_binary, _from_binary),
+}
+
+_MARSHALLERS = {name: converters[0] for name, converters in WORDLE_FIELDS.items()}
+_UNMARSHALLERS = {name: converters[1] for name, converters in WORDLE_FIELDS.items()}
+
+
+def marshal_value(value):
+    """Convert a plain Python value into a DynamoDB attribute value."""
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, (int, float, Decimal)):
+        return {'N': str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {'B': bytes(value)}
+    if isinstance(value, (list, tuple)):
+        return {'L': [marshal_value(item) for item in value]}
+    if isinstance(value, dict):
+        return {'M': {key: marshal_value(item) for key, item in value.items()}}
+    raise TypeError(f"Unsupported type for DynamoDB: {type(value).__name__}")
+
+
+def unmarshal_value(attr):
+    """Convert a DynamoDB attribute value into a plain Python value."""
+    (kind, value), = attr.items()
+    if kind in ('S', 'BOOL', 'B'):
+        return value
+    if kind == 'N':
+        return Decimal(value)
+    if kind == 'NULL':
+        return None
+    if kind == 'L':
+        return [unmarshal_value(item) for item in value]
+    if kind == 'M':
+        return {key: unmarshal_value(item) for key, item in value.items()}
+    if kind == 'SS':
+        return set(value)
+    if kind == 'NS':
+        return {Decimal(item) for item in value}
+    raise TypeError(f"Unsupported DynamoDB type: {kind}")
+
+
+def marshal_wordle(item):
+    return {name: _MARSHALLERS.get(name, marshal_value)(value) for name, value in item.items()}
+
+
+def unmarshal_wordle(attrs):
+    return {name: _UNMARSHALLERS.get(name, unmarshal_value)(attr) for name, attr in attrs.items()}
+
+
+def marshal_values(values):
+    """Convert an ExpressionAttributeValues dict of plain values."""
+    return {name: marshal_value(value) for name, value in values.items()}
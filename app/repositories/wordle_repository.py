@@ -1,12 +1,33 @@
-from boto3.dynamodb.conditions import Attr
+from .base import BaseWordleRepository, in_request_order
+from ..models.game_codec import LEGACY_FIELDS
+from ..models.wordle_models import LEGACY_CREATED_AT
+from .dynamodb import batch_get, batch_write, is_conditional_check_failure
+from ..errors import GuessConflictError
+from ..utils.pagination import decode_cursor, encode_cursor
 
-class WordleRepository:
-    def __init__(self, table):
+class WordleRepository(BaseWordleRepository):
+    def __init__(self, table, user_index='user_id-created_at-index', resource=None):
         self.table = table
+        # global secondary index with user_id as the partition key and created_at as the sort key
+        self.user_index = user_index
+        # the DynamoDB resource, for the batch operations (without it they fall back to one call per game)
+        self.resource = resource
 
     def create_wordle(self, wordle):
         self.table.put_item(Item=wordle)
 
+    def create_wordle_if_absent(self, wordle):
+        try:
+            self._put_item_if_absent(wordle)
+        except Exception as e:
+            if is_conditional_check_failure(e):
+                return False
+            raise
+        return True
+
+    def _put_item_if_absent(self, wordle):
+        self.table.put_item(Item=wordle, ConditionExpression='attribute_not_exists(game_id)')
+
     def get_wordle(self, game_id, user_id):
         response = self.table.get_item(Key={'game_id': game_id})
 
@@ -15,9 +36,32 @@ class WordleRepository:
 
         return None
     
-    def get_all_wordles(self, user_id):
-        response = self.table.scan(FilterExpression=Attr('user_id').eq(user_id))
-        return response.get('Items')
+    def create_wordles(self, wordles):
+        if self.resource is None:
+            return super().create_wordles(wordles)
+        batch_write(self.resource.batch_write_item, self.table.name, [{'PutRequest': {'Item': wordle}} for wordle in wordles])
+
+    def get_wordles(self, game_ids, user_id):
+        if self.resource is None:
+            return super().get_wordles(game_ids, user_id)
+        keys = [{'game_id': game_id} for game_id in dict.fromkeys(game_ids)]
+        return in_request_order(batch_get(self.resource.batch_get_item, self.table.name, keys), game_ids, user_id)
+
+    def get_wordles_page(self, user_id, limit=None, cursor=None):
+        """Return one page of the user's games, newest first, and the cursor for the next page (None on the last page)."""
+        query = {
+            'IndexName': self.user_index,
+            'KeyConditionExpression': 'user_id = :user_id',
+            'ExpressionAttributeValues': {':user_id': user_id},
+            'ScanIndexForward': False
+        }
+        if limit:
+            query['Limit'] = limit
+        if cursor:
+            query['ExclusiveStartKey'] = decode_cursor(cursor)
+
+        response = self.table.query(**query)
+        return response.get('Items', []), encode_cursor(response.get('LastEvaluatedKey'))
 
     def update_wordle(self, game_id, updates):
         update_expression = 'SET ' + ', '.join([f'{key} = :{key}' for key in updates.keys() if key != 'game_id'])
@@ -31,3 +75,96 @@ class WordleRepository:
         )
 
         return response
+
+    def commit_guess(self, wordle):
+        """Append the game's latest guess with a single conditional write.
+
+        The write only succeeds if the stored game still belongs to the user, is not over and has exactly the guesses
+        and version that preceded this one, so two concurrent guesses can't both be committed and a stale copy of the game
+        can't overwrite a newer one. Raises GuessConflictError otherwise."""
+        update_expression = 'SET guesses = list_append(guesses, :guess), version = :version, letters_used = :letters_used, letters_present = :letters_present, letters_in_position = :letters_in_position'
+        expression_attribute_values = {
+            ':guess': [wordle.guesses[-1]],
+            ':user_id': wordle.user_id,
+            ':previous_guess_count': len(wordle.guesses) - 1,
+            ':false': False,
+            **{f':{key}': value for key, value in wordle.letter_bank.to_dict().items()}
+        }
+        if wordle.solved:
+            update_expression += ', solved = :true'
+            expression_attribute_values[':true'] = True
+        if wordle.is_game_over():
+            # flags the game until its result is in the player's statistics (WordleService)
+            update_expression += ', stats_pending = :true'
+            expression_attribute_values[':true'] = True
+
+        self._conditional_update(
+            wordle,
+            update_expression,
+            'user_id = :user_id AND size(guesses) = :previous_guess_count AND solved = :false AND surrendered = :false',
+            expression_attribute_values
+        )
+
+    def commit_surrender(self, wordle):
+        """Mark the game as surrendered, provided it is still in progress with the guesses the caller saw."""
+        self._conditional_update(
+            wordle,
+            'SET surrendered = :true, version = :version, stats_pending = :true',
+            'user_id = :user_id AND size(guesses) = :guess_count AND solved = :false AND surrendered = :false',
+            {':true': True, ':false': False, ':user_id': wordle.user_id, ':guess_count': len(wordle.guesses)}
+        )
+
+    def commit_compact(self, wordle, game):
+        """Write the game's encoded state and remove its per-field attributes, conditional on the version read only:
+        every write bumps it, so a matching version means no guess or surrender was committed in between."""
+        update_expression = 'SET game = :game, version = :version'
+        expression_attribute_values = {':game': game, ':user_id': wordle.user_id}
+        if wordle.is_game_over():
+            update_expression += ', stats_pending = :true'
+            expression_attribute_values[':true'] = True
+
+        self._conditional_update(
+            wordle,
+            update_expression + ' REMOVE ' + ', '.join(LEGACY_FIELDS),
+            'user_id = :user_id',
+            expression_attribute_values
+        )
+
+    def clear_stats_pending(self, game_id):
+        try:
+            self._update_item(game_id, 'REMOVE stats_pending', 'stats_pending = :true', {':true': True})
+        except Exception as e:
+            if not is_conditional_check_failure(e):
+                raise
+
+    def _conditional_update(self, wordle, update_expression, condition_expression, expression_attribute_values):
+        # games written before versioning have no version attribute, which reads back as version 0
+        condition_expression += ' AND (attribute_not_exists(version) OR version = :expected_version)'
+        # games written before created_at was recorded get one, so that the user index (sparse on created_at) lists them
+        created_at = wordle.created_at or LEGACY_CREATED_AT
+        update_expression = update_expression.replace('SET ', 'SET created_at = if_not_exists(created_at, :created_at), ', 1)
+        expression_attribute_values = {
+            **expression_attribute_values,
+            ':expected_version': wordle.version,
+            ':version': wordle.version + 1,
+            ':created_at': created_at
+        }
+
+        try:
+            self._update_item(wordle.game_id, update_expression, condition_expression, expression_attribute_values)
+        except Exception as e:
+            if is_conditional_check_failure(e):
+                raise GuessConflictError("Game was updated by another request")
+            raise
+
+        wordle.version += 1
+        wordle.created_at = created_at
+
+    def _update_item(self, game_id, update_expression, condition_expression, expression_attribute_values):
+        self.table.update_item(
+            Key={'game_id': game_id},
+            UpdateExpression=update_expression,
+            ConditionExpression=condition_expression,
+            ExpressionAttributeValues=expression_attribute_values,
+            ReturnValues='NONE'
+        )
@@ -0,0 +1,12 @@
+from flask import Response, jsonify, request
+from ..utils.middleware import token_matches
+
+def create_metrics_routes(app):
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Expose the app's metrics in the Prometheus text format, to scrapers with the metrics token."""
+        if not token_matches(request.headers.get('Authorization'), f"Bearer {app.config['METRICS_TOKEN']}"):
+            return jsonify({"message": "Invalid or missing metrics token"}), 401
+        return Response(app.extensions['metrics'].render(), mimetype='text/plain; version=0.0.4')
+
+    return app
@@ -0,0 +1,20 @@
+from flask import g, jsonify, request
+from ..utils.middleware import jwt_required
+
+def create_stats_routes(app):
+    @app.route('/stats', methods=['GET'])
+    @jwt_required
+    def get_stats():
+        """Return the user's statistics, maintained as their games end rather than computed from their history."""
+        return jsonify(app.config['stats_service'].get_stats(g.user_id))
+
+    @app.route('/leaderboard', methods=['GET'])
+    @jwt_required
+    def get_leaderboard():
+        """Return the top players for ?letter_count=N, ranked by wins and then by fewest guesses per win."""
+        letter_count = request.args.get('letter_count', type=int)
+        if letter_count not in app.config['wordle_service'].word_dictionary.lengths():
+            return jsonify({"message": "letter_count must be a word length in the dictionary"}), 400
+        return jsonify({"letter_count": letter_count, "entries": app.config['stats_service'].get_leaderboard(letter_count)})
+
+    return app
@@ -1,4 +1,6 @@
 from flask import jsonify, request
+from ..errors import ServiceUnavailableError
+from ..utils.middleware import service_unavailable
 
 def create_user_routes(app):
     @app.route('/register', methods=['POST'])
@@ -10,14 +12,18 @@ def create_user_routes(app):
             return jsonify({"user_id": user.get('user_id'), "token": user.get('token')})
         except ValueError as e:
             return jsonify({"message": str(e)}), 400
+        except ServiceUnavailableError:
+            return service_unavailable()
         
     @app.route('/login', methods=['POST'])
     def login_user():
         username = request.json['username']
         password = request.json['password']
-        user = app.config['user_service'].login_user(username, password)
+        try:
+            user = app.config['user_service'].login_user(username, password)
+        except ServiceUnavailableError:
+            return service_unavailable()
 
-        print(user)
         if user:
             return jsonify({"user_id": user.get('user_id'), "token": user.get('token')})
         return jsonify({"message": "Invalid username or password"}), 400
@@ -26,7 +32,7 @@ def create_user_routes(app):
     def get_user(user_id):
         user = app.config['user_service'].get_user_by_user_id(user_id)
         if user:
-            return jsonify(user.to_dict())
+            return jsonify(user.view())
         return jsonify({"message": "User not found"}), 404
     
     return app
\ No newline at end of file
@@ -1,41 +1,135 @@
-from flask import jsonify, request
+from flask import Response, g, jsonify, request, stream_with_context
 from ..models.wordle_models import Wordle, WordleHelper
 from ..repositories.wordle_repository import WordleRepository
 from ..services.wordle_service import WordleService
 # import the errors from resources/errors.py
-from ..errors import GameOverError, GuessAlreadyMadeError, HardModeViolationError, InvalidGuessError
-from ..utils.middleware import jwt_required
+from ..errors import GameOverError, GuessAlreadyMadeError, GuessConflictError, HardModeViolationError, InvalidGuessError, ServiceUnavailableError, UnreadableGameError
+from ..utils.middleware import jwt_required, service_unavailable
 
 def create_routes(app):
+    metrics = app.extensions['metrics']
+
+    def game_response(wordle):
+        with metrics.section('serialization'):
+            return jsonify(wordle.view())
+
+    @app.errorhandler(UnreadableGameError)
+    def unreadable_game(e):
+        app.logger.warning("Could not read a game: %s", e)
+        return jsonify({"message": "Game was stored with a word list that is no longer available"}), 410
+
     @app.route('/wordle', methods=['POST'])
     @jwt_required
     def create_game():
-        user_id = getattr(request, 'user_id', None)
+        user_id = g.user_id
         letter_count = request.json['letter_count']
         hard_mode = request.json.get('hard_mode', False)
+        lengths = app.config['wordle_service'].word_dictionary.lengths()
+        if letter_count not in lengths:
+            return jsonify({"message": f"letter_count must be one of {lengths}"}), 400
         wordle = app.config['wordle_service'].generate_wordle(user_id, letter_count, hard_mode)
         return jsonify({"game_id": wordle.game_id})
 
+    @app.route('/wordle/daily', methods=['POST'])
+    @jwt_required
+    def create_daily_game():
+        """Start (or resume) today's puzzle: {"letter_count": 5, "hard_mode": false}, both optional. Every player gets the
+        same word for a given day and letter count, and the same game back on repeated calls."""
+        user_id = g.user_id
+        body = request.get_json(silent=True) or {}
+        letter_count = body.get('letter_count', app.config['DAILY_LETTER_COUNT'])
+        hard_mode = body.get('hard_mode', False)
+        lengths = app.config['wordle_service'].word_dictionary.lengths()
+        if letter_count not in lengths:
+            return jsonify({"message": f"letter_count must be one of {lengths}"}), 400
+        try:
+            wordle = app.config['wordle_service'].generate_daily_wordle(user_id, letter_count, hard_mode)
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+        return jsonify({"game_id": wordle.game_id, "puzzle_id": wordle.puzzle_id})
+
+    @app.route('/wordle/batch', methods=['POST'])
+    @jwt_required
+    def create_games():
+        """Create several games in one call: {"games": [{"letter_count": 5, "hard_mode": false}, ...]}."""
+        user_id = g.user_id
+        wordle_service = app.config['wordle_service']
+        games = (request.json or {}).get('games')
+        if not isinstance(games, list) or not 1 <= len(games) <= app.config['BATCH_CREATE_MAX']:
+            return jsonify({"message": f"games must be a list of 1 to {app.config['BATCH_CREATE_MAX']} games"}), 400
+
+        lengths = wordle_service.word_dictionary.lengths()
+        if not all(isinstance(game, dict) and game.get('letter_count') in lengths for game in games):
+            return jsonify({"message": f"letter_count must be one of {lengths}"}), 400
+
+        try:
+            wordles = wordle_service.generate_wordles(user_id, [(game['letter_count'], game.get('hard_mode', False)) for game in games])
+        except ServiceUnavailableError:
+            return service_unavailable()
+        return jsonify({"game_ids": [wordle.game_id for wordle in wordles]})
+
+    @app.route('/wordle/batch-get', methods=['POST'])
+    @jwt_required
+    def get_games():
+        """Fetch several games in one call: {"game_ids": [...]}. Returns {"items": [...], "missing": [...]}, with items in
+        the order requested; ?format=compact returns compact_format() items."""
+        user_id = g.user_id
+        game_ids = (request.json or {}).get('game_ids')
+        if (not isinstance(game_ids, list) or not 1 <= len(game_ids) <= app.config['BATCH_GET_MAX']
+                or not all(isinstance(game_id, str) for game_id in game_ids)):
+            return jsonify({"message": f"game_ids must be a list of 1 to {app.config['BATCH_GET_MAX']} game ids"}), 400
+
+        try:
+            wordles = app.config['wordle_service'].get_wordles(game_ids, user_id)
+        except ServiceUnavailableError:
+            return service_unavailable()
+
+        found = {wordle.game_id for wordle in wordles}
+        compact = request.args.get('format') == 'compact'
+        with metrics.section('serialization'):
+            return jsonify({
+                "items": [wordle.compact_format() if compact else wordle.view() for wordle in wordles],
+                "missing": [game_id for game_id in dict.fromkeys(game_ids) if game_id not in found]
+            })
+
     @app.route('/wordle/<game_id>', methods=['GET'])
     @jwt_required
     def get_game(game_id):
-        user_id = getattr(request, "user_id", None)
-        wordle: dict = app.config['wordle_service'].wordle_repository.get_wordle(game_id, user_id)
-        wordle_obj = Wordle.from_dict(wordle)
-        if not wordle_obj:
+        """Return the game. ?format=compact returns compact_format() instead of return_format().
+
+        Responses carry an ETag; a request whose If-None-Match matches the stored game gets 304 without the game being
+        rebuilt or serialized."""
+        user_id = g.user_id
+        compact = request.args.get('format') == 'compact'
+        wordle: dict = app.config['wordle_service'].get_wordle_item(game_id, user_id)
+        if not wordle:
             return jsonify({"message": "Game not found"}), 404
 
-        return jsonify(wordle_obj.return_format())
+        # the two formats are different representations, so they get different tags
+        etag = Wordle.etag(wordle) + ('-compact' if compact else '')
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        else:
+            wordle_obj = Wordle.from_dict(wordle)
+            if compact:
+                with metrics.section('serialization'):
+                    response = jsonify(wordle_obj.compact_format())
+            else:
+                response = game_response(wordle_obj)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
 
     @app.route('/wordle/<game_id>/guess', methods=['POST'])
     @jwt_required
     def make_guess(game_id):
-        user_id = getattr(request, "user_id", None)
+        user_id = g.user_id
         guess = request.json['guess']
         try:
             wordle = app.config['wordle_service'].make_guess(game_id, user_id, guess)
-            print(wordle)
-            return jsonify(wordle.return_format())
+            if not wordle:
+                return jsonify({"message": "Game not found"}), 404
+            return game_response(wordle)
         except GameOverError:
             return jsonify({"message": "Game is over"}), 400
         except GuessAlreadyMadeError:
@@ -44,23 +138,78 @@ def create_routes(app):
             return jsonify({"message": "Hard mode violation"}), 400
         except InvalidGuessError:
             return jsonify({"message": "Invalid guess"}), 400
-        except Exception as e:  # Catch-all for any other unexpected errors
-            print(e)
+        except GuessConflictError:
+            return jsonify({"message": "Game was updated by another request"}), 409
+        except UnreadableGameError as e:
+            return unreadable_game(e)
+        except Exception:  # Catch-all for any other unexpected errors
+            app.logger.exception("Unexpected error making a guess in game %s", game_id)
             return jsonify({"message": "An unexpected error occurred"}), 500
 
+    @app.route('/wordle/<game_id>/hint', methods=['GET'])
+    @jwt_required
+    def get_hint(game_id):
+        user_id = g.user_id
+        try:
+            hint = app.config['wordle_service'].get_hint(game_id, user_id)
+        except GameOverError:
+            return jsonify({"message": "Game is over"}), 400
+
+        if not hint:
+            return jsonify({"message": "Game not found"}), 404
+
+        return jsonify(hint)
+
     @app.route('/wordle/<game_id>/surrender', methods=['POST'])
     @jwt_required
     def surrender_game(game_id):
-        user_id = getattr(request, "user_id", None)
-        wordle = app.config['wordle_service'].surrender_game(game_id, user_id)
-        return jsonify(wordle.return_format())
+        user_id = g.user_id
+        try:
+            wordle = app.config['wordle_service'].surrender_game(game_id, user_id)
+        except GameOverError:
+            return jsonify({"message": "Game is over"}), 400
+        except GuessConflictError:
+            return jsonify({"message": "Game was updated by another request"}), 409
+
+        if not wordle:
+            return jsonify({"message": "Game not found"}), 404
+
+        return game_response(wordle)
     
     @app.route('/wordle', methods=['GET'])
     @jwt_required
     def get_user_wordles():
-        user_id = getattr(request, "user_id", None)
-        wordles = app.config['wordle_service'].get_user_wordles(user_id)
-        return jsonify([Wordle.from_dict(wordle).return_format() for wordle in wordles])
+        """Return the user's games, newest first.
+
+        ?stream=ndjson streams every game as newline-delimited JSON, loading one page at a time.
+        ?limit=&cursor= returns a single page: {"items": [...], "next_cursor": "..." | null}.
+        Without either, all games are returned as a list."""
+        user_id = g.user_id
+        wordle_service = app.config['wordle_service']
+
+        # get(type=int) would silently drop a limit that isn't a number, so it is parsed here
+        limit = request.args.get('limit')
+        if limit is not None:
+            if not limit.isdigit() or not 1 <= int(limit) <= app.config['HISTORY_MAX_PAGE_SIZE']:
+                return jsonify({"message": f"limit must be between 1 and {app.config['HISTORY_MAX_PAGE_SIZE']}"}), 400
+            limit = int(limit)
+
+        if request.args.get('stream') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson':
+            wordles = wordle_service.iter_user_wordles(user_id, limit or app.config['HISTORY_PAGE_SIZE'])
+            lines = (app.json.dumps(wordle.view()) + '\n' for wordle in wordles)
+            return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+        if limit is not None or 'cursor' in request.args:
+            try:
+                wordles, next_cursor = wordle_service.get_user_wordles_page(user_id, limit or app.config['HISTORY_PAGE_SIZE'], request.args.get('cursor'))
+            except ValueError as e:
+                return jsonify({"message": str(e)}), 400
+            with metrics.section('serialization'):
+                return jsonify({"items": [wordle.view() for wordle in wordles], "next_cursor": next_cursor})
+
+        wordles = wordle_service.get_user_wordles(user_id)
+        with metrics.section('serialization'):
+            return jsonify([wordle.view() for wordle in wordles])
 
 
     return app
@@ -0,0 +1,25 @@
+from ..models.stats import format_leaderboard, format_stats, game_outcome, leaderboard_entry, result_counters
+
+class StatsService:
+    def __init__(self, stats_repository, leaderboard_size=10):
+        self.stats_repository = stats_repository
+        self.leaderboard_size = leaderboard_size
+
+    def record_game(self, wordle):
+        """Count a finished game in its player's statistics and, if it was won, offer the player's record to the
+        leaderboard for its letter count. Safe to retry: the repository counts each game once, and offering the same
+        record again leaves the leaderboard as it is."""
+        outcome = game_outcome(wordle)
+        letter_count = len(wordle.solution)
+        counters = result_counters(outcome, letter_count, len(wordle.guesses))
+        stats = self.stats_repository.record_result(wordle.user_id, counters, outcome == 'won', wordle.game_id)
+        if outcome == 'won':
+            self.stats_repository.update_leaderboard(letter_count, leaderboard_entry(wordle.user_id, stats, letter_count), self.leaderboard_size)
+        return stats
+
+    def get_stats(self, user_id):
+        return format_stats(self.stats_repository.get_stats(user_id))
+
+    def get_leaderboard(self, letter_count):
+        entries, _ = self.stats_repository.get_leaderboard(letter_count)
+        return format_leaderboard(entries)
@@ -1,28 +1,45 @@
 from ..models.user import User
 import jwt
+import logging
+from datetime import datetime, timedelta, timezone
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class UserService:
-    def __init__(self, user_repository):
+    def __init__(self, user_repository, password_hasher, secret_key, token_ttl=None):
         self.user_repository = user_repository
+        self.password_hasher = password_hasher
+        self.secret_key = secret_key
+        self.token_ttl = token_ttl
 
     def create_user(self, username, password):
         """Create a new user with a unique username and a password (to be hashed by the application)."""
         try:
-            user = User.create_new_user(username, password)
+            user = User(username, self.password_hasher.hash(password))
             self.user_repository.create_user(user)
             return {"user_id": user.get_user_id(), "token": self.create_jwt(user.get_user_id())}
         except ValueError as e:
             raise ValueError(f"Error creating user: {e}")
         
     def login_user(self, username, password):
-        """Login a user with a username and password. Returns the User object if successful, otherwise None."""
-        user = self.user_repository.login_user(username, password)
-        if user:
+        """Login a user with a username and password. Returns the User object if successful, otherwise None.
+        Passwords hashed with an outdated work factor are transparently rehashed."""
+        user = self.user_repository.get_user_by_username(username)
+        if user and self.password_hasher.verify(user.hashed_password, password):
+            if self.password_hasher.needs_rehash(user.hashed_password):
+                self._rehash_password(user, password)
             token = self.create_jwt(user.user_id)
             return {"user_id": user.user_id, "token": token}
         return None
     
+    def _rehash_password(self, user, password):
+        try:
+            self.user_repository.update_password_hash(user, self.password_hasher.hash(password))
+        except Exception:
+            # the old hash still works; try again on a later login
+            logger.warning("Could not rehash the password of user %s", user.user_id, exc_info=True)
+
     def get_user_by_username(self, username):
         """Retrieve a user by their username."""
         return self.user_repository.get_user_by_username(username)
@@ -32,5 +49,10 @@ class UserService:
         return self.user_repository.get_user_by_user_id(user_id)
 
     def create_jwt(self, user_id):
-        """Create a JSON Web Token (JWT) for the user."""
-        return jwt.encode({'user_id': user_id}, 'secret', algorithm='HS256')
\ No newline at end of file
+        """Create a JSON Web Token (JWT) for the user, expiring after token_ttl seconds if set."""
+        claims = {'user_id': user_id}
+        if self.token_ttl:
+            now = datetime.now(timezone.utc)
+            claims['iat'] = now
+            claims['exp'] = now + timedelta(seconds=self.token_ttl)
+        return jwt.encode(claims, self.secret_key, algorithm='HS256')
\ No newline at end of file
@@ -1,54 +1,113 @@
+from ..models.game_codec import GameCodec
 from ..models.wordle_models import WordleHelper, Wordle
+from ..errors import GameOverError, GuessConflictError, UnreadableGameError
+from ..utils.metrics import Metrics
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
+COMMIT_ATTEMPTS = 2
+# daily game ids are derived from the user and puzzle, so each player has one game per daily puzzle
+DAILY_NAMESPACE = uuid.UUID('5c0a4d3e-8a55-4b4e-9f0e-3d2b7c6a1f90')
+
 class WordleService:
-    def __init__(self, wordle_repository, word_list):
+    def __init__(self, wordle_repository, word_dictionary, solver=None, metrics=None, daily_schedule=None, stats_service=None, compact_storage=False, word_archive_dir=None):
         self.wordle_repository = wordle_repository
-        self.word_list = word_list
+        self.word_dictionary = word_dictionary
+        self.solver = solver
+        self.metrics = metrics or Metrics(enabled=False)
+        self.daily_schedule = daily_schedule
+        self.stats_service = stats_service
+        # compact items are always read; COMPACT_STORAGE decides whether games are written that way
+        self.codec = GameCodec(word_dictionary, word_archive_dir)
+        self.compact_storage = compact_storage
 
     def generate_wordle(self, user_id, letter_count, hard_mode):
         game_id = str(uuid.uuid4())
-        wordle = WordleHelper.generate_wordle(game_id, user_id, self.word_list, letter_count, hard_mode)
-
-        wordle_dict = {
-            "game_id": game_id,
-            "user_id": wordle.user_id,
-            'solution': wordle.solution,
-            'guesses': wordle.guesses,
-            'solved': wordle.solved,
-            'surrendered': wordle.surrendered,
-            'hard_mode': wordle.hard_mode
-        }
+        wordle = WordleHelper.generate_wordle(game_id, user_id, self.word_dictionary, letter_count, hard_mode)
+
+        wordle_dict = self.to_item(wordle)
 
         self.wordle_repository.create_wordle(wordle_dict)
         return wordle
 
-    def make_guess(self, game_id, user_id, guess):
-        wordle_dict = self.wordle_repository.get_wordle(game_id, user_id)
-        wordle = Wordle.from_dict(wordle_dict)
-
-        print(wordle)
+    def generate_wordles(self, user_id, games):
+        """Create several games in one batch write. `games` is a list of (letter_count, hard_mode) pairs."""
+        wordles = [
+            WordleHelper.generate_wordle(str(uuid.uuid4()), user_id, self.word_dictionary, letter_count, hard_mode)
+            for letter_count, hard_mode in games
+        ]
+        self.wordle_repository.create_wordles([self.to_item(wordle) for wordle in wordles])
+        return wordles
 
-        if not wordle:
-            return None
+    def generate_daily_wordle(self, user_id, letter_count, hard_mode, day=None):
+        """Return the user's game for the day's puzzle (today by default), creating it on their first request.
 
-        wordle = WordleHelper.make_guess(self.word_list, wordle, guess)
+        Raises ValueError if no puzzle is scheduled for the day or letter count."""
+        schedule = self.daily_schedule
+        puzzle_id = schedule.puzzle_id(day or schedule.today(), letter_count)
+        game_id = str(uuid.uuid5(DAILY_NAMESPACE, f'{user_id}/{puzzle_id}'))
 
-        print(wordle)
-        print(wordle.to_dict())
+        wordle = self.get_wordle(game_id, user_id)
+        if wordle:
+            return wordle
 
-        self.wordle_repository.update_wordle(game_id, wordle.to_dict())
+        wordle = WordleHelper.generate_daily_wordle(game_id, user_id, schedule, puzzle_id, hard_mode)
+        if not self.wordle_repository.create_wordle_if_absent(self.to_item(wordle)):
+            # a concurrent request created the game first; it may already have guesses
+            return self.get_wordle(game_id, user_id)
         return wordle
+
+    def make_guess(self, game_id, user_id, guess):
+        # a conflict can mean the cached copy of the game was stale (the entry is evicted), so retry once on fresh state
+        for attempt in range(COMMIT_ATTEMPTS):
+            wordle_dict = self.get_wordle_item(game_id, user_id)
+            wordle = Wordle.from_dict(wordle_dict)
+
+            if not wordle:
+                return None
+
+            with self.metrics.section('scoring'):
+                wordle = WordleHelper.make_guess(self.word_dictionary, wordle, guess)
+
+            try:
+                self._commit(wordle, wordle_dict, self.wordle_repository.commit_guess)
+            except GuessConflictError:
+                if attempt == COMMIT_ATTEMPTS - 1:
+                    raise
+                continue
+            self._record_if_over(wordle)
+            return wordle
     
     def surrender_game(self, game_id, user_id):
-        wordle_dict = self.wordle_repository.get_wordle(game_id, user_id)
-        wordle = Wordle.from_dict(wordle_dict)
-        wordle = WordleHelper.surrender_game(wordle)
-        self.wordle_repository.update_wordle(game_id, wordle.to_dict())
-        return wordle
+        for attempt in range(COMMIT_ATTEMPTS):
+            wordle_dict = self.get_wordle_item(game_id, user_id)
+            wordle = Wordle.from_dict(wordle_dict)
+
+            if not wordle:
+                return None
+
+            wordle = WordleHelper.surrender_game(wordle)
+            try:
+                self._commit(wordle, wordle_dict, self.wordle_repository.commit_surrender)
+            except GuessConflictError:
+                if attempt == COMMIT_ATTEMPTS - 1:
+                    raise
+                continue
+            self._record_if_over(wordle)
+            return wordle
     
+    def get_wordle_item(self, game_id, user_id):
+        """Return the stored game item, with the solution of a daily game filled in. Returns None if it doesn't exist.
+        A finished game whose result didn't make it into the player's statistics is recorded now."""
+        wordle_dict = self.hydrate(self.wordle_repository.get_wordle(game_id, user_id))
+        if wordle_dict and wordle_dict.get('stats_pending'):
+            self._record(Wordle.from_dict(wordle_dict))
+        return wordle_dict
+
     def get_wordle(self, game_id, user_id):
-        wordle_dict = self.wordle_repository.get_wordle(game_id, user_id)
+        wordle_dict = self.get_wordle_item(game_id, user_id)
 
         if not wordle_dict:
             return None
@@ -56,6 +115,88 @@ class WordleService:
         wordle = Wordle.from_dict(wordle_dict)
         return wordle
     
+    def get_wordles(self, game_ids, user_id):
+        """Return the user's games among `game_ids` in one batch read, in the order given. Missing and unreadable games
+        are skipped."""
+        return list(self._readable(self.wordle_repository.get_wordles(game_ids, user_id)))
+
+    def get_hint(self, game_id, user_id):
+        """Suggest the next guess with the highest expected information gain. Returns None if the game doesn't exist."""
+        wordle = self.get_wordle(game_id, user_id)
+
+        if not wordle:
+            return None
+
+        if wordle.is_game_over():
+            raise GameOverError("Game is over")
+
+        with self.metrics.section('hint'):
+            suggestion = self.solver.suggest(wordle.constraints, wordle.hard_mode)
+        if suggestion is None:
+            return {"hint": None, "expected_information": 0.0, "candidates_remaining": 0}
+
+        hint, expected_information, candidates_remaining = suggestion
+        return {"hint": hint, "expected_information": expected_information, "candidates_remaining": candidates_remaining}
+
     def get_user_wordles(self, user_id):
-        wordles = self.wordle_repository.get_all_wordles(user_id)
-        return wordles
+        """Return all of the user's games (newest first) as Wordle objects."""
+        return list(self._readable(self.wordle_repository.get_all_wordles(user_id)))
+
+    def get_user_wordles_page(self, user_id, limit, cursor=None):
+        """Return a page of the user's games (newest first) as Wordle objects, along with the cursor for the next page."""
+        wordles, next_cursor = self.wordle_repository.get_wordles_page(user_id, limit, cursor)
+        return list(self._readable(wordles)), next_cursor
+
+    def iter_user_wordles(self, user_id, page_size):
+        """Yield all of the user's games (newest first) as Wordle objects, loading one page at a time."""
+        return self._readable(self.wordle_repository.iter_wordles(user_id, page_size))
+
+    def _readable(self, wordle_dicts):
+        # a game that can't be decoded (see UnreadableGameError) is left out rather than failing the whole listing
+        for wordle_dict in wordle_dicts:
+            try:
+                yield Wordle.from_dict(self.hydrate(wordle_dict))
+            except UnreadableGameError:
+                logger.warning("Leaving out game %s", wordle_dict.get('game_id'), exc_info=True)
+
+    def to_item(self, wordle):
+        """Return the item to store for a new game, in the compact binary format if COMPACT_STORAGE is set."""
+        return self.codec.encode_item(wordle) if self.compact_storage else wordle.to_dict()
+
+    def encoded_state(self, wordle, wordle_dict):
+        """Return the game's state to commit in the compact format, or None to commit it field by field. Games already
+        stored compactly stay compact; with COMPACT_STORAGE set, per-field games are migrated by their next commit."""
+        if self.compact_storage or 'game' in wordle_dict:
+            return self.codec.encode(wordle)
+        return None
+
+    def _commit(self, wordle, wordle_dict, commit):
+        game = self.encoded_state(wordle, wordle_dict)
+        if game is None:
+            commit(wordle)
+        else:
+            self.wordle_repository.commit_compact(wordle, game)
+
+    def _record_if_over(self, wordle):
+        if wordle.is_game_over():
+            self._record(wordle)
+
+    def _record(self, wordle):
+        """Record a finished game in its player's statistics and clear the game's stats_pending flag. The move that ended
+        the game is already committed, so a failure here is only logged: the flag stays set and the next read of the
+        game retries, which the statistics repository counts only once."""
+        if not self.stats_service:
+            return
+        try:
+            self.stats_service.record_game(wordle)
+            self.wordle_repository.clear_stats_pending(wordle.game_id)
+        except Exception:
+            logger.exception("Could not record the result of game %s; it will be retried", wordle.game_id)
+
+    def hydrate(self, wordle_dict):
+        """Return a stored item in the per-field format: compact items are decoded, and daily games stored before their
+        solution was kept on the item get it from the schedule. Raises UnreadableGameError if the item can't be decoded."""
+        wordle_dict = self.codec.decode_item(wordle_dict)
+        if wordle_dict and 'solution' not in wordle_dict and wordle_dict.get('puzzle_id'):
+            wordle_dict['solution'] = self.daily_schedule.solution(wordle_dict['puzzle_id'])
+        return wordle_dict
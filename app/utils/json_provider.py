@@ -0,0 +1,66 @@
+import dataclasses
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib provider is used instead
+    orjson = None
+
+JSON_PROVIDERS = ('auto', 'orjson', 'stdlib')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask's DefaultJSONProvider on orjson.
+
+    Dataclasses (such as the response views in models/views.py) are serialized natively, without dataclasses.asdict
+    building an intermediate dict tree, and responses are built from the encoded bytes directly. Anything orjson doesn't
+    handle goes through Flask's `default` hook, so Decimals, dates and UUIDs come out as they do with the stdlib
+    provider. Output is always UTF-8 rather than ASCII-escaped."""
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj, bool(kwargs.get('indent'))).decode('utf-8')
+
+    def dumps_bytes(self, obj):
+        """Encode a response body as compact UTF-8 JSON, for responses built outside Flask (app/asgi)."""
+        return self._encode(obj)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, indent) + b'\n', mimetype=self.mimetype)
+
+    def _encode(self, obj, indent=False):
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's DefaultJSONProvider, except that dataclasses are encoded from their attributes as they are, instead of
+    through dataclasses.asdict, which deep-copies every nested value first."""
+    def dumps_bytes(self, obj):
+        """Encode a response body as compact UTF-8 JSON, for responses built outside Flask (app/asgi)."""
+        return self.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def default(o):
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            return vars(o)
+        return DefaultJSONProvider.default(o)
+
+
+def json_provider_class(name='auto'):
+    """Return the JSON provider class for Config.JSON_PROVIDER: 'orjson', 'stdlib', or 'auto' (orjson if installed)."""
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown JSON_PROVIDER {name!r}, expected one of {', '.join(JSON_PROVIDERS)}")
+    if name == 'stdlib' or (name == 'auto' and orjson is None):
+        return StdlibJSONProvider
+    if orjson is None:
+        raise ValueError("JSON_PROVIDER is 'orjson' but orjson is not installed")
+    return OrjsonProvider
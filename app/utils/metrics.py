@@ -0,0 +1,166 @@
+import bisect
+import contextvars
+import threading
+import time
+
+# latency buckets in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21)
+CAPACITY_BUCKETS = (0, 0.5, 1, 2, 5, 10, 25, 50)
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def expose(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        with self._lock:
+            values = sorted(self._values.items())
+        for labelvalues, value in values:
+            yield f'{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}'
+
+
+class Histogram:
+    """A Prometheus-style histogram: per label set, a count of observations at or below each bucket bound, plus their
+    sum and total count."""
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # per-bucket counts (the last one is +Inf), sum
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def expose(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        with self._lock:
+            series = sorted((labelvalues, (list(counts), total)) for labelvalues, (counts, total) in self._series.items())
+        for labelvalues, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                labels = _labels(self.labelnames + ('le',), labelvalues + (_number(bound),))
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            yield f'{self.name}_sum{_labels(self.labelnames, labelvalues)} {_number(total)}'
+            yield f'{self.name}_count{_labels(self.labelnames, labelvalues)} {cumulative}'
+
+
+class _RequestStats:
+    __slots__ = ('calls', 'seconds', 'capacity')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.capacity = 0.0
+
+
+_request_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+class Metrics:
+    """The app's metrics, exposed in the Prometheus text format by render().
+
+    Records request latency per endpoint, every DynamoDB call (latency and consumed capacity, in total and per request)
+    and the time spent in named sections of request handling such as scoring and serialization. A disabled instance
+    records nothing, so callers can instrument unconditionally."""
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.request_duration = Histogram('http_request_duration_seconds', 'Request latency by endpoint.', ('endpoint', 'method', 'status'))
+        self.section_duration = Histogram('wordle_section_duration_seconds', 'Time spent in a section of request handling.', ('section',))
+        self.dynamodb_duration = Histogram('dynamodb_call_duration_seconds', 'DynamoDB call latency by operation.', ('operation', 'table'))
+        self.dynamodb_capacity = Counter('dynamodb_consumed_capacity_units_total', 'DynamoDB capacity units consumed.', ('operation', 'table'))
+        self.dynamodb_request_calls = Histogram('dynamodb_calls_per_request', 'DynamoDB calls made while handling one request.', ('endpoint',), COUNT_BUCKETS)
+        self.dynamodb_request_duration = Histogram('dynamodb_duration_per_request_seconds', 'Time spent in DynamoDB calls while handling one request.', ('endpoint',))
+        self.dynamodb_request_capacity = Histogram('dynamodb_capacity_per_request_units', 'DynamoDB capacity units consumed while handling one request.', ('endpoint',), CAPACITY_BUCKETS)
+        self._metrics = (
+            self.request_duration, self.section_duration, self.dynamodb_duration, self.dynamodb_capacity,
+            self.dynamodb_request_calls, self.dynamodb_request_duration, self.dynamodb_request_capacity,
+        )
+
+    def begin_request(self):
+        """Start collecting the current request's DynamoDB usage. Returns the stats to pass to end_request."""
+        if not self.enabled:
+            return None
+        stats = _RequestStats()
+        _request_stats.set(stats)
+        return stats
+
+    def end_request(self, stats, endpoint, method, status, seconds):
+        if stats is None:
+            return
+        _request_stats.set(None)
+        self.request_duration.observe(seconds, endpoint, method, str(status))
+        self.dynamodb_request_calls.observe(stats.calls, endpoint)
+        self.dynamodb_request_duration.observe(stats.seconds, endpoint)
+        self.dynamodb_request_capacity.observe(stats.capacity, endpoint)
+
+    def record_dynamodb_call(self, operation, table, seconds, capacity):
+        if not self.enabled:
+            return
+        self.dynamodb_duration.observe(seconds, operation, table)
+        if capacity:
+            self.dynamodb_capacity.inc(capacity, operation, table)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.capacity += capacity
+
+    def section(self, name):
+        """Time the body of a with-block as the named section."""
+        return _Section(self, name)
+
+    def render(self):
+        return '\n'.join(line for metric in self._metrics for line in metric.expose()) + '\n'
+
+
+class _Section:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        if self.metrics.enabled:
+            self.metrics.section_duration.observe(time.perf_counter() - self.start, self.name)
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    if isinstance(value, str):
+        return value
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -1,31 +1,73 @@
 from functools import wraps
-from flask import request, jsonify
+from flask import g, jsonify
+import hashlib
+import hmac
+import time
 import jwt
+from .cache import TTLCache
 
-def validate_and_decode_jwt(token, secret_key):
+def decode_jwt(token, secret_key):
+    """Return the token's claims, or None if the token is invalid or expired."""
     try:
-        decoded = jwt.decode(token, secret_key, algorithms=['HS256'])
-        return decoded['user_id']
+        return jwt.decode(token, secret_key, algorithms=['HS256'])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+def validate_and_decode_jwt(token, secret_key):
+    claims = decode_jwt(token, secret_key)
+    return claims.get('user_id') if claims else None
+
+class TokenAuthenticator:
+    """Verifies the JWTs issued by UserService.
+
+    Verified tokens are cached by their SHA-256 digest as (user_id, exp), so a client that reuses its token skips the HMAC
+    check and JSON parsing on later requests. An entry never outlives the token's own `exp` claim."""
+    def __init__(self, secret_key, cache_size=4096, cache_ttl=300, clock=time.time):
+        self.secret_key = secret_key
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self.clock = clock
+
+    def authenticate(self, token):
+        """Return the user_id the token was issued for, or None if it is invalid or expired."""
+        key = hashlib.sha256(token.encode('utf-8')).digest()
+
+        cached = self.cache.get(key)
+        if cached:
+            user_id, expires_at = cached
+            if expires_at is None or expires_at > self.clock():
+                return user_id
+            self.cache.pop(key)
+            return None
+
+        claims = decode_jwt(token, self.secret_key)
+        if not claims or not claims.get('user_id'):
+            return None
+
+        expires_at = claims.get('exp')
+        ttl = None if expires_at is None else min(self.cache.ttl, expires_at - self.clock())
+        self.cache.set(key, (claims['user_id'], expires_at), ttl)
+        return claims['user_id']
+
+def token_matches(value, token):
+    """Return whether a request header's value is the configured secret `token`, compared in constant time. Always
+    False when no token is configured."""
+    return bool(token) and value is not None and hmac.compare_digest(value.encode('utf-8'), token.encode('utf-8'))
+
+def service_unavailable():
+    """The response for a request turned away because the server is overloaded (ServiceUnavailableError)."""
+    response = jsonify({"message": "Server is busy, please try again"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 def jwt_required(f):
+    """Require the request to have been authenticated. Tokens are verified once per request, before routing, and the
+    identity is stored on flask.g."""
     @wraps(f)
     def wrap(*args, **kwargs):
-        bearer = 'Bearer '
-
-        token = request.headers.get('Authorization', None)
-        if token and token.startswith(bearer):
-            token = token.replace(bearer, '', 1)
-            user_id = validate_and_decode_jwt(token, 'secret')
-            if user_id:
-                request.user_id = user_id
-                return f(*args, **kwargs)
-            else:
-                return jsonify({"message": "Invalid or expired token"}), 401
-        else:
-            return jsonify({"message": "Missing authentication token"}), 401
+        if g.get('user_id'):
+            return f(*args, **kwargs)
+        return jsonify({"message": "Missing authentication token"}), 401
     wrap.__name__ = f.__name__
-    return wrap
\ No newline at end of file
+    return wrap
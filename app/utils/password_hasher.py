@@ -0,0 +1,47 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from ..errors import ServiceUnavailableError
+from ..models.user import User
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL while it works, so a login burst keeps at most `pool_size` cores busy and leaves request
+    threads free for other endpoints. At most `queue_size` further jobs may wait for a worker; beyond that (or if a job
+    doesn't finish within `timeout` seconds) ServiceUnavailableError is raised so the caller can fail fast."""
+    def __init__(self, rounds=12, pool_size=4, queue_size=16, timeout=10):
+        self.rounds = rounds
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(pool_size + queue_size)
+
+    def hash(self, password):
+        return self._run(User.hash_password, password, self.rounds)
+
+    def verify(self, stored_hashed_password, password):
+        return self._run(User.verify_password, stored_hashed_password, password)
+
+    def needs_rehash(self, stored_hashed_password):
+        """Return True if the hash was made with a different work factor than the configured one."""
+        hashed_password_bytes = User.hashed_password_bytes(stored_hashed_password)
+        # bcrypt hashes look like $2b$12$<salt+hash>, where 12 is the work factor
+        try:
+            return int(hashed_password_bytes.split(b'$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableError("Too many password operations in progress")
+
+        try:
+            future = self.executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise ServiceUnavailableError("Password operation timed out")
@@ -0,0 +1,49 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import time
+
+from .middleware import token_matches
+
+class RequestProfiler:
+    """Runs a sample of requests under cProfile.
+
+    A request is profiled when it is picked by `sample_rate` (a fraction of all requests) or, if `header` and `token` are
+    set, when it carries that header with the token as its value. Each profile is written to `output_dir` as a .prof file for pstats/snakeviz, or logged as the
+    top `limit` functions by cumulative time when no directory is configured."""
+    def __init__(self, sample_rate=0.0, header=None, token=None, output_dir=None, logger=None, limit=25):
+        self.sample_rate = sample_rate
+        self.header = header
+        self.token = token
+        self.output_dir = output_dir
+        self.logger = logger
+        self.limit = limit
+
+    @property
+    def enabled(self):
+        return bool(self.sample_rate or (self.header and self.token))
+
+    def start(self, headers):
+        """Start profiling if this request should be profiled; returns the profile, or None."""
+        if not ((self.header and token_matches(headers.get(self.header), self.token)) or (self.sample_rate and random.random() < self.sample_rate)):
+            return None
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(self, profile, label):
+        profile.disable()
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{id(profile):x}-{_safe(label)}.prof"
+            profile.dump_stats(os.path.join(self.output_dir, name))
+        elif self.logger:
+            output = io.StringIO()
+            pstats.Stats(profile, stream=output).sort_stats('cumulative').print_stats(self.limit)
+            self.logger.info("profile for %s:\n%s", label, output.getvalue())
+
+
+def _safe(label):
+    return ''.join(c if c.isalnum() else '_' for c in label).strip('_')
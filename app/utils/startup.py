@@ -0,0 +1,16 @@
+import time
+
+class StartupTimer:
+    """Records how long each phase of application startup took, in milliseconds."""
+    def __init__(self, started=None):
+        self.phases = {}
+        self._last = time.perf_counter() if started is None else started
+
+    def mark(self, phase):
+        """End the current phase, naming it `phase`, and start the next one."""
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 3)
+        self._last = now
+
+    def total(self):
+        return round(sum(self.phases.values()), 3)
@@ -0,0 +1,130 @@
+import struct
+
+import pytest
+
+from app.errors import UnreadableGameError
+from app.models.game_codec import NO_SOLUTION, WORDS, GameCodec, _HEADER, _HEADER_V1, archive_word_lists
+from app.models.word_dictionary import WordDictionary
+from app.models.wordle_models import Wordle, WordleHelper
+
+WORDS_V1 = ['cigar', 'crane', 'rebut', 'sissy', 'slate', 'trace']
+WORDS_V2 = ['cigar', 'crane', 'humph', 'rebut', 'sissy', 'slate', 'trace']
+
+
+@pytest.fixture
+def dictionary():
+    return WordDictionary(WORDS_V1)
+
+
+def play(dictionary, solution, guesses, hard_mode=False):
+    wordle = Wordle('game', 'user', solution, [], False, False, hard_mode, created_at='2024-01-01T00:00:00.000+00:00')
+    for guess in guesses:
+        wordle = WordleHelper.make_guess(dictionary, wordle, guess)
+    return wordle
+
+
+def decoded(codec, wordle):
+    return Wordle.from_dict(codec.decode_item(codec.encode_item(wordle)))
+
+
+def assert_same_game(actual, expected):
+    assert actual.solution == expected.solution
+    assert actual.guesses == expected.guesses
+    assert (actual.solved, actual.surrendered, actual.hard_mode) == (expected.solved, expected.surrendered, expected.hard_mode)
+    assert actual.letter_bank == expected.letter_bank
+    assert (actual.game_id, actual.user_id, actual.created_at, actual.version) == (expected.game_id, expected.user_id, expected.created_at, expected.version)
+
+
+@pytest.mark.parametrize('guesses', [[], ['slate'], ['slate', 'trace'], ['slate', 'crane']])
+def test_round_trip(dictionary, guesses):
+    codec = GameCodec(dictionary)
+    wordle = play(dictionary, 'crane', guesses, hard_mode=len(guesses) == 1)
+    assert_same_game(decoded(codec, wordle), wordle)
+
+
+def test_round_trip_surrendered(dictionary):
+    codec = GameCodec(dictionary)
+    wordle = WordleHelper.surrender_game(play(dictionary, 'rebut', ['cigar']))
+    assert_same_game(decoded(codec, wordle), wordle)
+
+
+def test_item_without_game_is_returned_as_is(dictionary):
+    wordle = play(dictionary, 'crane', ['slate'])
+    assert GameCodec(dictionary).decode_item(wordle.to_dict()) == wordle.to_dict()
+
+
+def test_word_missing_from_dictionary_is_stored_as_letters(dictionary):
+    codec = GameCodec(dictionary)
+    wordle = play(dictionary, 'zesty', ['slate'])
+    game = codec.encode(wordle)
+    assert game[1] & WORDS
+    assert_same_game(decoded(codec, wordle), wordle)
+
+
+def test_no_solution_leaves_the_solution_to_the_schedule(dictionary):
+    codec = GameCodec(dictionary)
+    wordle = play(dictionary, 'crane', ['slate', 'trace'])
+    version, flags, length, guess_count, fingerprint, used, present, in_position = _HEADER.unpack_from(codec.encode(wordle))
+    # daily games written before they kept their solution store only the guesses
+    indices = [dictionary.index_of(guess) for guess in wordle.guesses]
+    game = _HEADER.pack(version, flags | NO_SOLUTION, length, guess_count, fingerprint, used, present, in_position) + struct.pack('<2H', *indices)
+
+    fields = codec.decode_item({'game_id': 'game', 'user_id': 'user', 'puzzle_id': '2024-01-01-5', 'game': game})
+    assert 'solution' not in fields
+    assert fields['guesses'] == ['slate', 'trace']
+    assert fields['puzzle_id'] == '2024-01-01-5'
+
+
+def test_archived_word_list_decodes_after_the_list_changes(tmp_path, dictionary):
+    archive_word_lists(dictionary, tmp_path)
+    wordle = play(dictionary, 'trace', ['slate'])
+    item = GameCodec(dictionary).encode_item(wordle)
+
+    codec = GameCodec(WordDictionary(WORDS_V2), tmp_path)
+    assert_same_game(Wordle.from_dict(codec.decode_item(item)), wordle)
+
+
+def test_unarchived_word_list_is_unreadable(tmp_path, dictionary):
+    item = GameCodec(dictionary).encode_item(play(dictionary, 'trace', ['slate']))
+
+    with pytest.raises(UnreadableGameError):
+        GameCodec(WordDictionary(WORDS_V2), tmp_path).decode_item(item)
+
+
+def test_unknown_format_version_is_unreadable(dictionary):
+    with pytest.raises(UnreadableGameError):
+        GameCodec(dictionary).decode_item({'game_id': 'game', 'game': b'\xff' + bytes(_HEADER.size)})
+
+
+def version_1(game):
+    """Rewrite a game in format version 1, which stored the low 16 bits of the fingerprint."""
+    _, flags, length, guess_count, fingerprint, used, present, in_position = _HEADER.unpack_from(game)
+    return _HEADER_V1.pack(1, flags, length, guess_count, fingerprint & 0xFFFF, used, present, in_position) + game[_HEADER.size:]
+
+
+def test_version_1_decodes_against_the_current_list(dictionary):
+    codec = GameCodec(dictionary)
+    wordle = play(dictionary, 'crane', ['slate'])
+    item = {**codec.encode_item(wordle), 'game': version_1(codec.encode(wordle))}
+    assert_same_game(Wordle.from_dict(codec.decode_item(item)), wordle)
+
+
+def test_version_1_decodes_against_an_archived_list(tmp_path, dictionary):
+    archive_word_lists(dictionary, tmp_path)
+    wordle = play(dictionary, 'crane', ['slate'])
+    item = {**GameCodec(dictionary).encode_item(wordle), 'game': version_1(GameCodec(dictionary).encode(wordle))}
+
+    codec = GameCodec(WordDictionary(WORDS_V2), tmp_path)
+    assert_same_game(Wordle.from_dict(codec.decode_item(item)), wordle)
+
+
+def test_version_1_matching_several_lists_is_unreadable(tmp_path, dictionary):
+    [path] = archive_word_lists(dictionary, tmp_path)
+    # another archived list whose fingerprint has the same low 16 bits
+    length, fingerprint = path.stem.split('-')
+    (tmp_path / f'{length}-{int(fingerprint, 16) ^ 0x10000:08x}.txt').write_text('other\n')
+    wordle = play(dictionary, 'crane', ['slate'])
+    item = {**GameCodec(dictionary).encode_item(wordle), 'game': version_1(GameCodec(dictionary).encode(wordle))}
+
+    with pytest.raises(UnreadableGameError):
+        GameCodec(WordDictionary(WORDS_V2), tmp_path).decode_item(item)
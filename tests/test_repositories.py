@@ -0,0 +1,110 @@
+import pytest
+
+from app.errors import GuessConflictError
+from app.models.word_dictionary import WordDictionary
+from app.models.wordle_models import Wordle, WordleHelper
+from app.repositories.memory_repository import MemoryWordleRepository
+from app.repositories.sqlite_repository import SQLiteDatabase, SQLiteWordleRepository
+
+WORDS = WordDictionary(['cigar', 'crane', 'rebut', 'slate', 'trace'])
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def repository(request):
+    if request.param == 'memory':
+        return MemoryWordleRepository()
+    return SQLiteWordleRepository(SQLiteDatabase(':memory:'))
+
+
+@pytest.fixture
+def game_id(repository):
+    wordle = Wordle('game', 'user', 'crane', [], False, False, created_at='2024-01-01T00:00:00.000+00:00')
+    repository.create_wordle(wordle.to_dict())
+    return wordle.game_id
+
+
+def read(repository, game_id, user_id='user'):
+    return Wordle.from_dict(repository.get_wordle(game_id, user_id))
+
+
+def stored_guesses(repository, game_id):
+    return repository.get_wordle(game_id, 'user')['guesses']
+
+
+def test_guess_is_committed(repository, game_id):
+    wordle = WordleHelper.make_guess(WORDS, read(repository, game_id), 'slate')
+    repository.commit_guess(wordle)
+
+    assert wordle.version == 1
+    assert stored_guesses(repository, game_id) == ['slate']
+    assert read(repository, game_id).version == 1
+
+
+def test_concurrent_guesses_commit_once(repository, game_id):
+    first = WordleHelper.make_guess(WORDS, read(repository, game_id), 'slate')
+    second = WordleHelper.make_guess(WORDS, read(repository, game_id), 'trace')
+    repository.commit_guess(first)
+
+    with pytest.raises(GuessConflictError):
+        repository.commit_guess(second)
+    assert stored_guesses(repository, game_id) == ['slate']
+
+
+def test_guess_in_a_game_surrendered_since_it_was_read(repository, game_id):
+    guess = WordleHelper.make_guess(WORDS, read(repository, game_id), 'slate')
+    repository.commit_surrender(WordleHelper.surrender_game(read(repository, game_id)))
+
+    with pytest.raises(GuessConflictError):
+        repository.commit_guess(guess)
+    assert stored_guesses(repository, game_id) == []
+
+
+def test_surrender_of_a_game_guessed_in_since_it_was_read(repository, game_id):
+    surrender = WordleHelper.surrender_game(read(repository, game_id))
+    repository.commit_guess(WordleHelper.make_guess(WORDS, read(repository, game_id), 'slate'))
+
+    with pytest.raises(GuessConflictError):
+        repository.commit_surrender(surrender)
+    assert not repository.get_wordle(game_id, 'user')['surrendered']
+
+
+def test_guess_by_another_user(repository, game_id):
+    wordle = WordleHelper.make_guess(WORDS, read(repository, game_id), 'slate')
+    wordle.user_id = 'intruder'
+
+    with pytest.raises(GuessConflictError):
+        repository.commit_guess(wordle)
+    assert stored_guesses(repository, game_id) == []
+
+
+def test_guess_in_a_missing_game(repository):
+    wordle = WordleHelper.make_guess(WORDS, Wordle('missing', 'user', 'crane', [], False, False), 'slate')
+
+    with pytest.raises(GuessConflictError):
+        repository.commit_guess(wordle)
+
+
+def test_guess_with_a_stale_version(repository, game_id):
+    wordle = WordleHelper.make_guess(WORDS, read(repository, game_id), 'slate')
+    wordle.version = 5
+
+    with pytest.raises(GuessConflictError):
+        repository.commit_guess(wordle)
+    assert stored_guesses(repository, game_id) == []
+
+
+def test_guess_in_a_game_stored_compactly_since_it_was_read(repository, game_id):
+    guess = WordleHelper.make_guess(WORDS, read(repository, game_id), 'slate')
+    repository.commit_compact(read(repository, game_id), b'\x02')
+
+    with pytest.raises(GuessConflictError):
+        repository.commit_guess(guess)
+
+
+def test_compact_commit_with_a_stale_version(repository, game_id):
+    stale = read(repository, game_id)
+    repository.commit_guess(WordleHelper.make_guess(WORDS, read(repository, game_id), 'slate'))
+
+    with pytest.raises(GuessConflictError):
+        repository.commit_compact(WordleHelper.make_guess(WORDS, stale, 'trace'), b'\x02')
+    assert stored_guesses(repository, game_id) == ['slate']
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from app.config import Config
+from app.models.scoring import feedback_code, feedback_codes, format_feedback, pattern_matrix, score_patterns
+from app.models.word_dictionary import WordDictionary
+from app.models.wordle_models import Wordle
+
+
+def baseline_feedback(solution, guess):
+    """The per-letter scoring the vectorized engine replaced: exact matches first, then present letters, each letter of
+    the solution used at most once."""
+    feedback = []
+    solution_letters = list(solution)
+    for i, letter in enumerate(guess):
+        if letter == solution_letters[i]:
+            feedback.append({"letter": letter, "in_solution": True, "correct_position": True})
+            solution_letters[i] = None
+        else:
+            feedback.append({"letter": letter, "in_solution": False, "correct_position": False})
+
+    for i, entry in enumerate(feedback):
+        letter = guess[i]
+        if not entry['correct_position'] and letter in solution_letters:
+            feedback[i]["in_solution"] = True
+            solution_letters[solution_letters.index(letter)] = None
+    return feedback
+
+
+def baseline_alphabet(solution, guesses):
+    used = set(''.join(guesses))
+    in_position = {letter for guess in guesses for i, letter in enumerate(guess) if letter == solution[i]}
+    return [
+        {
+            "letter": letter,
+            "used": letter in used,
+            "in_position": letter in in_position,
+            "in_solution": (letter in solution) if letter in used else None
+        }
+        for letter in 'abcdefghijklmnopqrstuvwxyz'
+    ]
+
+
+@pytest.fixture(scope='module')
+def dictionary():
+    return WordDictionary.from_file(Config.WORDS_PATH)
+
+
+@pytest.mark.parametrize('solution, guess', [
+    ('crane', 'crane'),
+    ('crane', 'slate'),
+    ('abbey', 'babes'),
+    ('abbey', 'kebab'),
+    ('speed', 'eerie'),
+    ('eerie', 'speed'),
+    ('llama', 'ladle'),
+    ('sissy', 'xxsss'),
+    ('aaaaa', 'abaca'),
+])
+def test_repeated_letters(solution, guess):
+    assert format_feedback(guess, feedback_code(solution, guess)) == baseline_feedback(solution, guess)
+
+
+def test_dictionary_pairs_of_every_length(dictionary):
+    rng = random.Random(2024)
+    for length in dictionary.lengths():
+        words = dictionary.words_of_length(length)
+        solutions = rng.sample(words, min(len(words), 20))
+        guesses = rng.sample(words, min(len(words), 50))
+        for solution in solutions:
+            codes = feedback_codes(solution, guesses)
+            assert [format_feedback(guess, code) for guess, code in zip(guesses, codes)] == [baseline_feedback(solution, guess) for guess in guesses]
+
+
+def test_pattern_matrix_matches_single_scores(dictionary):
+    words = dictionary.words_of_length(5)[:200]
+    matrix = pattern_matrix(words, words[:40])
+    for j, solution in enumerate(words[:40]):
+        assert list(matrix[:, j]) == list(score_patterns(solution, words))
+
+
+def test_formatted_game_matches_baseline():
+    wordle = Wordle('game', 'user', 'abbey', ['kebab', 'babes', 'abyss'], False, False)
+    assert wordle.get_formatted_guesses() == [baseline_feedback('abbey', guess) for guess in wordle.guesses]
+    assert wordle.get_formatted_alphabet() == baseline_alphabet('abbey', wordle.guesses)
@@ -0,0 +1,88 @@
+import pytest
+
+from app.models.word_dictionary import WordDictionary
+from app.models.wordle_models import Wordle
+from app.repositories.memory_repository import MemoryStatsRepository, MemoryWordleRepository
+from app.repositories.sqlite_repository import SQLiteDatabase, SQLiteStatsRepository
+from app.services.stats_service import StatsService
+from app.services.wordle_service import WordleService
+
+WON = {'played': 1, 'won': 1}
+LOST = {'played': 1, 'lost': 1}
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def repository(request):
+    if request.param == 'memory':
+        return MemoryStatsRepository()
+    return SQLiteStatsRepository(SQLiteDatabase(':memory:'))
+
+
+def test_recording_a_game_again_counts_it_once(repository):
+    first = repository.record_result('user', WON, True, 'game')
+    again = repository.record_result('user', WON, True, 'game')
+
+    assert first == again
+    assert repository.get_stats('user') == {'played': 1, 'won': 1, 'current_streak': 1, 'max_streak': 1}
+
+
+def test_recording_a_loss_again_doesnt_reset_a_later_streak(repository):
+    repository.record_result('user', LOST, False, 'lost')
+    repository.record_result('user', WON, True, 'won')
+    repository.record_result('user', LOST, False, 'lost')
+
+    stats = repository.get_stats('user')
+    assert (stats['played'], stats['won'], stats['lost']) == (2, 1, 1)
+    assert (stats['current_streak'], stats['max_streak']) == (1, 1)
+
+
+def test_games_are_counted_per_game_id(repository):
+    for game_id in ('a', 'b', 'a', 'c', 'b'):
+        repository.record_result('user', WON, True, game_id)
+
+    stats = repository.get_stats('user')
+    assert (stats['played'], stats['current_streak'], stats['max_streak']) == (3, 3, 3)
+
+
+def won_game(game_id='game'):
+    return Wordle(game_id, 'user', 'crane', ['slate', 'crane'], True, False)
+
+
+def test_recording_a_won_game_again_keeps_one_leaderboard_entry(repository):
+    service = StatsService(repository, leaderboard_size=10)
+    service.record_game(won_game())
+    service.record_game(won_game())
+
+    assert service.get_stats('user')['played'] == 1
+    assert len(service.get_leaderboard(5)) == 1
+
+
+class FlakyStatsService(StatsService):
+    """Fails the first `failures` recordings, as a throttled statistics table would."""
+    def __init__(self, stats_repository, failures):
+        super().__init__(stats_repository)
+        self.failures = failures
+
+    def record_game(self, wordle):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("statistics unavailable")
+        return super().record_game(wordle)
+
+
+def test_failed_recording_is_retried_on_the_next_read():
+    wordle_repository = MemoryWordleRepository()
+    stats_service = FlakyStatsService(MemoryStatsRepository(), failures=1)
+    service = WordleService(wordle_repository, WordDictionary(['crane', 'slate']), stats_service=stats_service)
+    game = Wordle('game', 'user', 'crane', [], False, False, created_at='2024-01-01T00:00:00.000+00:00')
+    wordle_repository.create_wordle(game.to_dict())
+
+    # the winning guess is committed even though recording it fails
+    assert service.make_guess(game.game_id, 'user', 'crane').solved
+    assert wordle_repository.get_wordle(game.game_id, 'user').get('stats_pending')
+    assert stats_service.get_stats('user')['played'] == 0
+
+    service.get_wordle(game.game_id, 'user')
+    service.get_wordle(game.game_id, 'user')
+    assert not wordle_repository.get_wordle(game.game_id, 'user').get('stats_pending')
+    assert stats_service.get_stats('user')['played'] == 1